@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class CommonConfig(AppConfig):
     name = 'src.common'
+
+    def ready(self):
+        # register the signal receivers which keep the platform counters up to date
+        from src.common import counters  # noqa: F401
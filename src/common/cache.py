@@ -0,0 +1,152 @@
+import contextlib
+import functools
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.core.cache import cache, caches
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY = 'version:{}'
+RESPONSE_CACHE = 'tiered'
+'''str: alias of the cache holding the responses of `cache_response`'''
+
+
+class CacheUnavailable(Exception):
+    '''Raised by `add` of a cache backend which cannot reach its server, where answering False would
+    read as "the key already exists"'''
+
+
+def get_version(namespace):
+    """Return the current version of a cache namespace
+
+    A namespace version starts at the current time in milliseconds, so that a version lost to an eviction
+    never restarts at a number which was already handed out before.
+    """
+    key = VERSION_KEY.format(namespace)
+    version = cache.get(key)
+    if version is None:
+        try:
+            cache.add(key, int(time.time() * 1000), timeout=None)
+        except CacheUnavailable:
+            return None
+        version = cache.get(key)
+    return version
+
+
+def bump_version(namespace):
+    """Invalidate every key of a namespace at once by moving it to a new version"""
+    key = VERSION_KEY.format(namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        return get_version(namespace)
+
+
+def versioned_key(namespace, *parts):
+    """Build a cache key which is invalidated by `bump_version(namespace)`"""
+    return ':'.join([namespace, str(get_version(namespace))] + [str(part) for part in parts])
+
+
+def digest(value):
+    """Short stable digest for putting arbitrary strings (e.g. search terms) in a cache key"""
+    return hashlib.md5(value.encode('utf-8')).hexdigest()
+
+
+@contextlib.contextmanager
+def cache_lock(key, timeout=30, wait=5):
+    """Hold a lock shared by every process, taken with an atomic `cache.add`
+
+    Yields whether the lock was acquired within `wait` seconds. The lock expires after `timeout` seconds
+    in case its holder dies. When the cache is unavailable the lock is skipped instead of polled: True is
+    yielded at once and the caller runs unguarded.
+    """
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + wait
+    try:
+        acquired = cache.add(key, token, timeout)
+        while not acquired and time.monotonic() < deadline:
+            time.sleep(0.05)
+            acquired = cache.add(key, token, timeout)
+    except CacheUnavailable:
+        yield True
+        return
+    try:
+        yield acquired
+    finally:
+        if acquired and cache.get(key) == token:
+            cache.delete(key)
+
+
+class LocalCache:
+    """Process-local LRU cache whose entries expire after `timeout` seconds
+
+    Entries cannot be invalidated from other processes, so the timeout bounds how long a change made
+    elsewhere can go unnoticed.
+    """
+
+    def __init__(self, max_size=1000, timeout=5):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                return default
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.timeout)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_matching(self, predicate):
+        """Delete the entries whose key matches `predicate`"""
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def cache_response(namespace, timeout=60 * 5):
+    """Decorate a view method (e.g. `get`) to cache the data of its successful responses per URL
+
+    The responses are cached under a versioned key, so `bump_version(namespace)` drops them all. They are
+    shared by every user, so only decorate views whose response does not depend on who asks. Permission
+    checks still run, they happen before the view method is called. The `X-Cache` header tells whether
+    the response was a cache `hit` or `miss`.
+    """
+
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(view, request, *args, **kwargs):
+            key = versioned_key(namespace, 'response', digest(request.build_absolute_uri()))
+            data = caches[RESPONSE_CACHE].get(key)
+            if data is not None:
+                return Response(data, headers={'X-Cache': 'hit'})
+
+            response = view_method(view, request, *args, **kwargs)
+            if isinstance(response, Response) and response.status_code == status.HTTP_200_OK:
+                caches[RESPONSE_CACHE].set(key, response.data, timeout)
+                response['X-Cache'] = 'miss'
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,348 @@
+"""Cache backends: Redis as the cache shared by every worker, and a tiered cache with a small in-process
+LRU in front of it.
+
+`RedisCache` stores integers as plain Redis integers, so `incr` (which namespace versions rely on) is an
+atomic `INCRBY`, and pickles everything else. Its connection pools are shared by the threads of a process.
+
+`TieredCache` reads from a process-local `LocalCache` first and falls back to another configured cache
+(the shared tier). Writes and deletes go to both tiers, but the local entries of other processes are
+only dropped when they time out, so it is meant for values which may be `LOCAL_TIMEOUT` seconds stale,
+such as responses cached under a versioned key.
+
+`RedisCache` fails soft: a Redis error or timeout (see the socket timeouts of `OPTIONS`) is logged and
+answered like a miss (reads return the default, writes do nothing), and Redis is not asked again for
+`RETRY_AFTER` seconds, so a slow or down Redis costs cache misses instead of failed requests. Only `add`
+raises `CacheUnavailable` instead, since its False means "the key exists" to claims and locks.
+
+Both backends count their hits, misses, errors and the time spent per operation in `stats`, see
+`src.common.views.CacheStatistics`.
+"""
+import functools
+import logging
+import pickle
+import threading
+import time
+from collections import defaultdict
+
+import redis
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+from src.common.cache import CacheUnavailable, LocalCache
+
+logger = logging.getLogger(__name__)
+
+RETRY_AFTER = 5
+'''int: seconds a RedisCache answers every operation like a miss after a Redis error'''
+
+_pools = {}
+_pools_lock = threading.Lock()
+_unavailable_until = {}
+'''dict: redis URL -> `time.monotonic()` until which it is not asked after an error'''
+
+
+class CacheStats:
+    """Hit, miss and latency counters of a cache backend, per process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = defaultdict(int)
+            self.misses = 0
+            self.errors = 0
+            self.calls = defaultdict(int)
+            self.seconds = defaultdict(float)
+
+    def record(self, operation, started):
+        '''Count a call of `operation` which started at `started` (`time.perf_counter()`)'''
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.calls[operation] += 1
+            self.seconds[operation] += elapsed
+
+    def hit(self, tier, count=1):
+        with self._lock:
+            self.hits[tier] += count
+
+    def miss(self, count=1):
+        with self._lock:
+            self.misses += count
+
+    def error(self):
+        with self._lock:
+            self.errors += 1
+
+    def snapshot(self):
+        with self._lock:
+            hits = sum(self.hits.values())
+            lookups = hits + self.misses
+            return {
+                'hits': dict(self.hits),
+                'misses': self.misses,
+                'errors': self.errors,
+                'hit_rate': hits / lookups if lookups else None,
+                'operations': {
+                    operation: {'calls': calls, 'mean_ms': self.seconds[operation] / calls * 1000}
+                    for operation, calls in self.calls.items()
+                },
+            }
+
+
+def get_pool(url, **kwargs):
+    '''Return the connection pool of a redis URL and connection options, shared by the threads of the process'''
+    key = (url, tuple(sorted(kwargs.items())))
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = redis.ConnectionPool.from_url(url, **kwargs)
+        return _pools[key]
+
+
+def key_not_found(key, *args, **kwargs):
+    raise ValueError("Key '%s' not found." % key)
+
+
+def cache_unavailable(key, *args, **kwargs):
+    raise CacheUnavailable(f"Cannot add '{key}', the cache is unavailable.")
+
+
+def fail_soft(fallback):
+    '''Decorate a RedisCache method to answer with `fallback(*args, **kwargs)` when Redis fails, see the module docstring'''
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if time.monotonic() < _unavailable_until.get(self._server, 0):
+                return fallback(*args, **kwargs)
+            try:
+                return method(self, *args, **kwargs)
+            except redis.RedisError:
+                logger.warning('Cache %s is unavailable, answering like a miss for %ss', self._server, RETRY_AFTER, exc_info=True)
+                self.stats.error()
+                _unavailable_until[self._server] = time.monotonic() + RETRY_AFTER
+                return fallback(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class RedisCache(BaseCache):
+    """Django cache backend storing its entries in Redis
+
+    `LOCATION` is a redis URL, e.g. `redis://redis:6379/2`. `OPTIONS` are passed on to the connection pool,
+    give it a `socket_timeout` and `socket_connect_timeout` so that a slow Redis fails soft.
+    """
+
+    def __init__(self, server, params):
+        super().__init__(params)
+        self._server = server
+        self._client = redis.Redis(connection_pool=get_pool(server, **params.get('OPTIONS', {})))
+        self.stats = CacheStats()
+
+    def dumps(self, value):
+        # plain integers are stored as such so that INCRBY works on them
+        if type(value) is int:
+            return value
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, data):
+        try:
+            return int(data)
+        except ValueError:
+            return pickle.loads(data)
+
+    def get_backend_timeout(self, timeout=DEFAULT_TIMEOUT):
+        if timeout == DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        return None if timeout is None else max(0, int(timeout))
+
+    @fail_soft(cache_unavailable)
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        started = time.perf_counter()
+        timeout = self.get_backend_timeout(timeout)
+        added = bool(self._client.set(key, self.dumps(value), ex=timeout or None, nx=True))
+        if added and timeout == 0:
+            self._client.delete(key)
+        self.stats.record('add', started)
+        return added
+
+    @fail_soft(lambda key, default=None, version=None: default)
+    def get(self, key, default=None, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        started = time.perf_counter()
+        data = self._client.get(key)
+        self.stats.record('get', started)
+        if data is None:
+            self.stats.miss()
+            return default
+        self.stats.hit('redis')
+        return self.loads(data)
+
+    @fail_soft(lambda *args, **kwargs: None)
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        started = time.perf_counter()
+        timeout = self.get_backend_timeout(timeout)
+        if timeout == 0:
+            self._client.delete(key)
+        else:
+            self._client.set(key, self.dumps(value), ex=timeout)
+        self.stats.record('set', started)
+
+    @fail_soft(lambda *args, **kwargs: False)
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        timeout = self.get_backend_timeout(timeout)
+        if timeout is None:
+            return bool(self._client.persist(key))
+        return bool(self._client.expire(key, timeout))
+
+    @fail_soft(lambda *args, **kwargs: False)
+    def delete(self, key, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        started = time.perf_counter()
+        deleted = bool(self._client.delete(key))
+        self.stats.record('delete', started)
+        return deleted
+
+    @fail_soft(lambda *args, **kwargs: {})
+    def get_many(self, keys, version=None):
+        if not keys:
+            return {}
+        cache_keys = {self.make_key(key, version=version): key for key in keys}
+        for cache_key in cache_keys:
+            self.validate_key(cache_key)
+        started = time.perf_counter()
+        values = {cache_key: data for cache_key, data in zip(cache_keys, self._client.mget(cache_keys)) if data is not None}
+        self.stats.record('get_many', started)
+        self.stats.hit('redis', len(values))
+        self.stats.miss(len(cache_keys) - len(values))
+        return {cache_keys[cache_key]: self.loads(data) for cache_key, data in values.items()}
+
+    @fail_soft(lambda data, *args, **kwargs: list(data))
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout = self.get_backend_timeout(timeout)
+        started = time.perf_counter()
+        with self._client.pipeline() as pipeline:
+            for key, value in data.items():
+                key = self.make_key(key, version=version)
+                self.validate_key(key)
+                if timeout == 0:
+                    pipeline.delete(key)
+                else:
+                    pipeline.set(key, self.dumps(value), ex=timeout)
+            pipeline.execute()
+        self.stats.record('set_many', started)
+        return []
+
+    @fail_soft(lambda *args, **kwargs: None)
+    def delete_many(self, keys, version=None):
+        keys = [self.make_key(key, version=version) for key in keys]
+        if keys:
+            self._client.delete(*keys)
+
+    @fail_soft(lambda *args, **kwargs: False)
+    def has_key(self, key, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return bool(self._client.exists(key))
+
+    @fail_soft(key_not_found)
+    def incr(self, key, delta=1, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        if not self._client.exists(key):
+            raise ValueError("Key '%s' not found." % key)
+        return self._client.incr(key, delta)
+
+    @fail_soft(lambda: None)
+    def clear(self):
+        # the cache has a redis database of its own
+        self._client.flushdb()
+
+    @fail_soft(lambda: {})
+    def get_server_stats(self):
+        info = self._client.info('stats')
+        return {'keyspace_hits': info['keyspace_hits'], 'keyspace_misses': info['keyspace_misses']}
+
+
+class TieredCache(BaseCache):
+    """Django cache backend which keeps recently read entries of another cache in process memory
+
+    `OPTIONS`: `SHARED` is the alias of the shared tier (`default`), `LOCAL_TIMEOUT` the seconds an entry is
+    served from process memory (5, 0 disables the local tier) and `MAX_ENTRIES` the size of the local LRU.
+    """
+
+    def __init__(self, server, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._shared_alias = options.get('SHARED', 'default')
+        self.local_timeout = options.get('LOCAL_TIMEOUT', 5)
+        self._local = LocalCache(max_size=options.get('MAX_ENTRIES', 5000), timeout=self.local_timeout)
+        self.stats = CacheStats()
+
+    @property
+    def shared(self):
+        return caches[self._shared_alias]
+
+    def get(self, key, default=None, version=None):
+        started = time.perf_counter()
+        value = self._local.get((key, version), default=self) if self.local_timeout else self
+        if value is self:
+            value = self.shared.get(key, self, version=version)
+            if value is self:
+                self.stats.record('get', started)
+                self.stats.miss()
+                return default
+            if self.local_timeout:
+                self._local.set((key, version), value)
+            self.stats.hit('shared')
+        else:
+            self.stats.hit('local')
+        self.stats.record('get', started)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        started = time.perf_counter()
+        self.shared.set(key, value, timeout=self.get_shared_timeout(timeout), version=version)
+        if self.local_timeout:
+            self._local.set((key, version), value)
+        self.stats.record('set', started)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._local.delete((key, version))
+        return self.shared.add(key, value, timeout=self.get_shared_timeout(timeout), version=version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout=self.get_shared_timeout(timeout), version=version)
+
+    def delete(self, key, version=None):
+        self._local.delete((key, version))
+        return self.shared.delete(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self._local.delete((key, version))
+        return self.shared.incr(key, delta, version=version)
+
+    def has_key(self, key, version=None):
+        return self.get(key, self, version=version) is not self
+
+    def clear(self):
+        self._local.clear()
+        self.shared.clear()
+
+    def clear_local(self):
+        '''Drop the local tier of this process only'''
+        self._local.clear()
+
+    def get_shared_timeout(self, timeout):
+        return self.default_timeout if timeout == DEFAULT_TIMEOUT else timeout
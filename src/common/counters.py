@@ -0,0 +1,140 @@
+"""Incrementally maintained platform totals.
+
+Each counter is a row of the Counter table. Signal receivers apply +1/-1 deltas with a single
+`UPDATE ... SET value = value + n` once the writing transaction commits, so reading a total is a
+primary key lookup instead of a `COUNT(*)`. Every change moves `COUNTERS_NAMESPACE` to a new version, which
+drops the cached responses of the count endpoints. `ReconcileCountersTask` periodically recounts everything
+to correct any drift (e.g. from queryset updates or deletes which bypass the signals).
+"""
+import collections
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from src.common.cache import bump_version
+from src.common.models import Counter
+from src.employer.models import Employer
+from src.job.models import Job, Project
+from src.job.signals import job_status_changed, jobs_bulk_created, jobs_bulk_status_changed
+from src.job_seeker.models import Job_Seeker
+
+COUNTERS_NAMESPACE = 'counters'
+
+JOBS = 'jobs'
+OPEN_JOBS = 'open_jobs'
+DRAFT_JOBS = 'draft_jobs'
+EMPLOYERS = 'employers'
+JOB_SEEKERS = 'job_seekers'
+ACTIVE_PROJECTS = 'active_projects'
+
+COUNTERS = {
+    JOBS: lambda: Job.objects.all(),
+    OPEN_JOBS: lambda: Job.objects.filter(status=Job.Status.OPEN),
+    DRAFT_JOBS: lambda: Job.objects.filter(status=Job.Status.DRAFT),
+    EMPLOYERS: lambda: Employer.objects.all(),
+    JOB_SEEKERS: lambda: Job_Seeker.objects.all(),
+    ACTIVE_PROJECTS: lambda: Project.objects.filter(is_active=True, is_finished=False),
+}
+'''dict: counter name -> function returning the queryset the counter mirrors'''
+
+STATUS_COUNTERS = {Job.Status.OPEN: OPEN_JOBS, Job.Status.DRAFT: DRAFT_JOBS}
+
+
+def reconcile(names=None):
+    """Recount the given counters (all of them by default) from their querysets"""
+    for name in names or COUNTERS:
+        Counter.objects.update_or_create(name=name, defaults={'value': COUNTERS[name]().count()})
+    bump_version(COUNTERS_NAMESPACE)
+
+
+def get_counts(names):
+    """Read several counters at once, recounting the ones which do not exist yet
+
+    Returns:
+        dict: counter name -> value
+    """
+    counts = dict(Counter.objects.filter(name__in=names).values_list('name', 'value'))
+    missing = [name for name in names if name not in counts]
+    if missing:
+        reconcile(missing)
+        counts.update(Counter.objects.filter(name__in=missing).values_list('name', 'value'))
+    return counts
+
+
+def get_count(name):
+    return get_counts([name])[name]
+
+
+def apply_delta(name, delta):
+    if not Counter.objects.filter(name=name).update(value=F('value') + delta):
+        reconcile([name])
+    else:
+        bump_version(COUNTERS_NAMESPACE)
+
+
+def increment(name, delta=1):
+    """Add `delta` to a counter once the current transaction commits"""
+    if delta:
+        transaction.on_commit(lambda: apply_delta(name, delta))
+
+
+def decrement(name, delta=1):
+    increment(name, -delta)
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_save, sender=Employer)
+@receiver(post_save, sender=Job_Seeker)
+def count_created(sender, created, **kwargs):
+    if created:
+        increment({Job: JOBS, Employer: EMPLOYERS, Job_Seeker: JOB_SEEKERS}[sender])
+
+
+@receiver(post_delete, sender=Job)
+@receiver(post_delete, sender=Employer)
+@receiver(post_delete, sender=Job_Seeker)
+def count_deleted(sender, instance, **kwargs):
+    decrement({Job: JOBS, Employer: EMPLOYERS, Job_Seeker: JOB_SEEKERS}[sender])
+    if sender is Job and instance.get_loaded_value('status') in STATUS_COUNTERS:
+        decrement(STATUS_COUNTERS[instance.get_loaded_value('status')])
+
+
+@receiver(job_status_changed)
+def count_status_change(sender, old_status, new_status, **kwargs):
+    if old_status in STATUS_COUNTERS:
+        decrement(STATUS_COUNTERS[old_status])
+    if new_status in STATUS_COUNTERS:
+        increment(STATUS_COUNTERS[new_status])
+
+
+@receiver(jobs_bulk_status_changed)
+def count_bulk_status_change(sender, job_ids, old_status, new_status, **kwargs):
+    if old_status in STATUS_COUNTERS:
+        decrement(STATUS_COUNTERS[old_status], len(job_ids))
+    if new_status in STATUS_COUNTERS:
+        increment(STATUS_COUNTERS[new_status], len(job_ids))
+
+
+@receiver(jobs_bulk_created)
+def count_bulk_created_jobs(sender, jobs, **kwargs):
+    increment(JOBS, len(jobs))
+    for status, count in collections.Counter(job.status for job in jobs).items():
+        if status in STATUS_COUNTERS:
+            increment(STATUS_COUNTERS[status], count)
+
+
+def was_running(project):
+    return bool(project.get_loaded_value('is_active')) and not project.get_loaded_value('is_finished')
+
+
+@receiver(post_save, sender=Project)
+def count_running_projects(sender, instance, **kwargs):
+    increment(ACTIVE_PROJECTS, int(instance.is_running) - int(was_running(instance)))
+
+
+@receiver(post_delete, sender=Project)
+def count_deleted_running_project(sender, instance, **kwargs):
+    if was_running(instance):
+        decrement(ACTIVE_PROJECTS)
@@ -0,0 +1,144 @@
+"""Event streams served to clients by polling.
+
+Events are appended to named streams kept by a broker: Redis Streams in deployment, or an in-process
+broker for local development and tests, picked by the scheme of `settings.EVENTS_BROKER_URL`
+(`redis://...` or `memory://`). Every event gets an id of the form `<milliseconds>-<sequence>`, which
+increases along a stream, so a client resumes after a reconnect by passing the id of the last event it
+saw and is replayed only the events it missed. A stream
+keeps its latest `STREAM_MAXLEN` events for `STREAM_TIMEOUT` seconds after its last event.
+
+Publishing is best effort: an unreachable broker is logged and does not fail the writing request. Reads
+degrade the same way, the Redis broker answers a failed read with no events and a failed `get_last_id`
+with None, and gives up on a Redis which does not answer within `SOCKET_TIMEOUT` seconds.
+"""
+import collections
+import json
+import logging
+import re
+import threading
+import time
+
+import redis
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+logger = logging.getLogger(__name__)
+
+STREAM_MAXLEN = 1000
+STREAM_TIMEOUT = 60 * 60 * 24 * 7
+READ_COUNT = 100
+SOCKET_TIMEOUT = 0.5
+'''float: seconds the Redis broker waits to connect or for an answer, publishing runs in bid writes'''
+EVENT_ID_RE = re.compile(r'^\d+-\d+$')
+FIRST_ID = '0-0'
+
+
+def parse_event_id(event_id):
+    return tuple(int(part) for part in event_id.split('-'))
+
+
+def is_event_id(value):
+    return bool(value and EVENT_ID_RE.match(value))
+
+
+def dump_event(event):
+    return json.dumps(event, cls=DjangoJSONEncoder)
+
+
+class InMemoryBroker:
+    """Process-local broker with the semantics of Redis Streams, for development and tests.
+    Events only reach clients served by the same process."""
+
+    def __init__(self, maxlen=STREAM_MAXLEN):
+        self.maxlen = maxlen
+        self.streams = {}
+        self.last_id = (0, 0)
+        self._lock = threading.Lock()
+
+    def publish(self, stream, event):
+        with self._lock:
+            milliseconds = int(time.time() * 1000)
+            if milliseconds <= self.last_id[0]:
+                self.last_id = (self.last_id[0], self.last_id[1] + 1)
+            else:
+                self.last_id = (milliseconds, 0)
+            event_id = '{}-{}'.format(*self.last_id)
+            self.streams.setdefault(stream, collections.deque(maxlen=self.maxlen)).append(
+                (event_id, json.loads(dump_event(event)))
+            )
+        return event_id
+
+    def get_last_id(self, stream):
+        with self._lock:
+            entries = self.streams.get(stream)
+            return entries[-1][0] if entries else FIRST_ID
+
+    def read(self, stream, cursor, count=READ_COUNT):
+        """Return up to `count` (id, event) tuples after `cursor`"""
+        after = parse_event_id(cursor)
+        with self._lock:
+            return [entry for entry in self.streams.get(stream, ()) if parse_event_id(entry[0]) > after][:count]
+
+    def clear(self):
+        with self._lock:
+            self.streams.clear()
+
+
+class RedisStreamBroker:
+    """Broker keeping one Redis Stream per event stream, logging Redis errors instead of raising them"""
+
+    def __init__(self, url, maxlen=STREAM_MAXLEN, timeout=STREAM_TIMEOUT):
+        self.client = redis.Redis.from_url(
+            url, decode_responses=True, socket_timeout=SOCKET_TIMEOUT, socket_connect_timeout=SOCKET_TIMEOUT
+        )
+        self.maxlen = maxlen
+        self.timeout = timeout
+
+    def publish(self, stream, event):
+        try:
+            pipeline = self.client.pipeline()
+            pipeline.xadd(stream, {'event': dump_event(event)}, maxlen=self.maxlen, approximate=True)
+            pipeline.expire(stream, self.timeout)
+            return pipeline.execute()[0]
+        except redis.RedisError:
+            logger.warning('Could not publish %s to %s', event.get('type'), stream, exc_info=True)
+            return None
+
+    def get_last_id(self, stream):
+        try:
+            entries = self.client.xrevrange(stream, count=1)
+        except redis.RedisError:
+            logger.warning('Could not read the last event id of %s', stream, exc_info=True)
+            return None
+        return entries[0][0] if entries else FIRST_ID
+
+    def read(self, stream, cursor, count=READ_COUNT):
+        try:
+            response = self.client.xread({stream: cursor}, count=count)
+        except redis.RedisError:
+            logger.warning('Could not read %s', stream, exc_info=True)
+            return []
+        return [(event_id, json.loads(fields['event'])) for _, entries in response or () for event_id, fields in entries]
+
+
+_brokers = {}
+_brokers_lock = threading.Lock()
+
+
+def get_broker():
+    """Return the broker configured by `settings.EVENTS_BROKER_URL`, one instance per process"""
+    url = settings.EVENTS_BROKER_URL
+    with _brokers_lock:
+        if url not in _brokers:
+            _brokers[url] = InMemoryBroker() if url.startswith('memory://') else RedisStreamBroker(url)
+        return _brokers[url]
+
+
+def publish(streams, event):
+    """Append an event to each of the given streams, logging instead of raising when the broker is down"""
+    broker = get_broker()
+    for stream in streams:
+        try:
+            broker.publish(stream, event)
+        except Exception:
+            logger.warning('Could not publish %s to %s', event.get('type'), stream, exc_info=True)
@@ -0,0 +1,65 @@
+"""Streaming exports of querysets as NDJSON or CSV.
+
+The rows are read with a server-side cursor (`QuerySet.iterator(chunk_size=...)`) and serialized one at
+a time into a `StreamingHttpResponse`, so an export holds a single chunk of rows in memory however many
+rows there are, and the response starts before the last row is read.
+"""
+import csv
+import json
+
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.encoders import JSONEncoder
+
+NDJSON = 'ndjson'
+CSV = 'csv'
+CONTENT_TYPES = {NDJSON: 'application/x-ndjson', CSV: 'text/csv'}
+CHUNK_SIZE = 2000
+'''int: rows fetched from the server-side cursor at a time'''
+
+
+class Echo:
+    '''File-like object which hands back what the csv writer writes, to stream it line by line'''
+
+    def write(self, value):
+        return value
+
+
+def iter_rows(queryset, serializer_class, chunk_size):
+    serializer = serializer_class()
+    for instance in queryset.iterator(chunk_size=chunk_size):
+        yield serializer.to_representation(instance)
+
+
+def iter_ndjson(queryset, serializer_class, chunk_size):
+    encoder = JSONEncoder()
+    for row in iter_rows(queryset, serializer_class, chunk_size):
+        yield encoder.encode(row) + '\n'
+
+
+def iter_csv(queryset, serializer_class, chunk_size):
+    fields = [name for name, field in serializer_class().fields.items() if not field.write_only]
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in iter_rows(queryset, serializer_class, chunk_size):
+        yield writer.writerow(
+            [json.dumps(row[name], cls=JSONEncoder) if isinstance(row[name], (dict, list)) else row[name] for name in fields]
+        )
+
+
+def get_export_format(request):
+    """Return the export format asked for with `?export=ndjson|csv`, or None for a regular response"""
+    export = request.query_params.get('export')
+    if export is not None and export not in CONTENT_TYPES:
+        raise ValidationError({'export': f'Choose one of: {", ".join(CONTENT_TYPES)}.'})
+    return export
+
+
+def stream_export(queryset, serializer_class, export, filename, chunk_size=CHUNK_SIZE):
+    """Stream a queryset serialized with `serializer_class` in the `export` format as a file download"""
+    rows = iter_ndjson if export == NDJSON else iter_csv
+    response = StreamingHttpResponse(rows(queryset, serializer_class, chunk_size), content_type=CONTENT_TYPES[export])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export}"'
+    # keep nginx from buffering the download
+    response['X-Accel-Buffering'] = 'no'
+    return response
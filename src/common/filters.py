@@ -0,0 +1,19 @@
+"""Filter backends shared by the list views."""
+from rest_framework import filters
+
+
+class StableOrderingFilter(filters.OrderingFilter):
+    """OrderingFilter which appends the primary key to every ordering, the requested one included
+
+    Without a unique last field, rows with equal values (e.g. the same count) come back in any order and
+    paging through them with offsets can repeat or skip rows.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        pk = queryset.model._meta.pk
+        if {'pk', pk.name, pk.attname}.isdisjoint(field.lstrip('-') for field in ordering):
+            ordering = [*ordering, 'pk']
+        return ordering
@@ -0,0 +1,79 @@
+"""Replay of responses to retried requests carrying an `Idempotency-Key` header.
+
+The first request with a key claims it with an atomic `cache.add` and its response is stored under the
+key once the view returns, so a retry of the same request (a client timeout, a double click) gets the
+original response back without running the view again. A retry which arrives while the first request
+is still running gets a 409, and a key reused for a different request body gets a 422. Keys are scoped
+to the user, method and path, and responses with a 5xx status are not stored so they can be retried.
+When the cache is unavailable requests fail open: the view runs without the guard.
+"""
+import functools
+import json
+import logging
+
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from src.common.cache import CacheUnavailable, digest
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = 'HTTP_IDEMPOTENCY_KEY'
+IDEMPOTENCY_KEY = 'idempotency:{}'
+MAX_KEY_LENGTH = 255
+PENDING_TIMEOUT = 60
+'''int: seconds a claimed key blocks retries, in case its request dies without releasing it'''
+RESPONSE_TIMEOUT = 60 * 60 * 24
+'''int: seconds a response is replayed for'''
+PENDING = 'pending'
+
+
+def get_fingerprint(request):
+    return digest(json.dumps(request.data, sort_keys=True, default=str))
+
+
+def idempotent(view_method):
+    """Decorate a view method (e.g. `post`) to replay its response to requests retried with the same key"""
+
+    @functools.wraps(view_method)
+    def wrapper(view, request, *args, **kwargs):
+        key = request.META.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view_method(view, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response({'detail': 'Idempotency-Key is too long.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        cache_key = IDEMPOTENCY_KEY.format(digest(f'{request.user.pk}:{request.method}:{request.path}:{key}'))
+        fingerprint = get_fingerprint(request)
+        try:
+            claimed = cache.add(cache_key, PENDING, PENDING_TIMEOUT)
+        except CacheUnavailable:
+            logger.warning('Cache is unavailable, running %s %s without its Idempotency-Key', request.method, request.path)
+            return view_method(view, request, *args, **kwargs)
+        if not claimed:
+            stored = cache.get(cache_key)
+            if stored is None or stored == PENDING:
+                return Response(
+                    {'detail': 'A request with this Idempotency-Key is still being processed.'}, status=status.HTTP_409_CONFLICT
+                )
+            if stored['fingerprint'] != fingerprint:
+                return Response(
+                    {'detail': 'This Idempotency-Key was used for a different request.'},
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                )
+            return Response(stored['data'], status=stored['status'], headers={'Idempotent-Replayed': 'true'})
+
+        try:
+            response = view_method(view, request, *args, **kwargs)
+        except Exception:
+            cache.delete(cache_key)
+            raise
+        if response.status_code >= 500:
+            cache.delete(cache_key)
+        else:
+            stored = {'fingerprint': fingerprint, 'status': response.status_code, 'data': response.data}
+            cache.set(cache_key, stored, RESPONSE_TIMEOUT)
+        return response
+
+    return wrapper
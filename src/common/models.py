@@ -0,0 +1,40 @@
+from django.db import models
+
+from src.users.models import TimeStampAbstractModel
+
+
+class LoadedValuesMixin:
+    """Inherit from this class to remember the database values of `tracked_fields` on load and after
+    every save, so that signal receivers can tell which of those fields a save changed.
+    """
+
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_loaded_values()
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.remember_loaded_values()
+
+    def remember_loaded_values(self):
+        self._loaded_values = {field: self.__dict__.get(field) for field in self.tracked_fields}
+
+    def get_loaded_value(self, field):
+        """Return the value `field` had in the database, or None for a new instance"""
+        return getattr(self, '_loaded_values', {}).get(field)
+
+
+class Counter(TimeStampAbstractModel):
+    '''This class holds the incrementally maintained platform totals'''
+
+    name = models.CharField(max_length=50, primary_key=True)
+    '''CharField: name of the counter'''
+    value = models.BigIntegerField(default=0)
+    '''BigIntegerField: current total'''
+
+    def __str__(self) -> str:
+        return f'{self.name}: {self.value}'
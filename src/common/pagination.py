@@ -0,0 +1,216 @@
+import datetime
+import decimal
+import json
+import uuid
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from operator import attrgetter
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import BooleanField, F, Func, Value
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class PositionEncoder(json.JSONEncoder):
+    '''Encodes row positions, keeping the full microsecond precision of timestamps which an exact
+    keyset position needs (DjangoJSONEncoder truncates them to milliseconds)'''
+
+    def default(self, o):
+        if isinstance(o, (datetime.date, datetime.time)):
+            return o.isoformat()
+        if isinstance(o, (decimal.Decimal, uuid.UUID)):
+            return str(o)
+        return super().default(o)
+
+
+class RowComparison(Func):
+    """Row-wise comparison such as `(created_at, id) < (%s, %s)`.
+
+    Unlike the equivalent chain of `OR`ed column comparisons, postgres serves a row comparison
+    with a single range scan over a composite index on the same columns.
+    """
+
+    conditional = True
+    output_field = BooleanField()
+
+    def __init__(self, fields, values, operator):
+        self.operator = operator
+        self.width = len(fields)
+        super().__init__(*fields, *values, output_field=BooleanField())
+
+    def as_sql(self, compiler, connection, **extra_context):
+        parts, params = [], []
+        for expression in self.get_source_expressions():
+            sql, expression_params = compiler.compile(expression)
+            parts.append(sql)
+            params.extend(expression_params)
+        lhs = ', '.join(parts[: self.width])
+        rhs = ', '.join(parts[self.width :])
+        return f'({lhs}) {self.operator} ({rhs})', params
+
+
+class KeysetPagination(CursorPagination):
+    """Keyset (seek) pagination over `(created_at, id)`.
+
+    Every page is fetched with a row comparison against the last row of the previous page, so a deep
+    page costs the same index range scan as the first one. The next/previous tokens are opaque base64
+    strings holding that row position. No `COUNT(*)` is run unless the client asks for it with
+    `?count=true`, and views may serve that count from somewhere cheaper, see `get_count`.
+
+    A queryset which is already explicitly ordered in one direction (e.g. by search rank) keeps its
+    ordering, with the primary key appended as tie breaker. Otherwise the `ordering` below is used.
+    The ordering fields are expected to be non-null.
+    """
+
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        self.count = self.get_count(queryset, view) if self.should_count(request) else None
+
+        descending = self.ordering[0].startswith('-')
+        fields = [field.lstrip('-') for field in self.ordering]
+        reverse = self.cursor is not None and self.cursor['reverse']
+
+        if reverse:
+            queryset = queryset.order_by(*[field if descending else f'-{field}' for field in fields])
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if self.cursor is not None:
+            position = self.cast_position(queryset, fields, self.cursor['position'])
+            operator = '<' if descending != reverse else '>'
+            queryset = queryset.filter(
+                RowComparison([F(field) for field in fields], [Value(value) for value in position], operator)
+            )
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        return self.page
+
+    def should_count(self, request):
+        return request.query_params.get(self.count_query_param, '').lower() in ('1', 'true', 'yes')
+
+    def get_count(self, queryset, view):
+        '''Count the results, views with a cheaper source of the total (e.g. a rollup) can provide it
+        with a `get_count(queryset)` method'''
+        if hasattr(view, 'get_count'):
+            return view.get_count(queryset)
+        return queryset.count()
+
+    def get_ordering(self, request, queryset, view):
+        ordering = [field for field in queryset.query.order_by if isinstance(field, str)]
+        if not ordering or len(ordering) != len(queryset.query.order_by):
+            return self.ordering
+
+        descending = ordering[0].startswith('-')
+        if any(field.startswith('-') != descending for field in ordering):
+            return self.ordering
+
+        pk_names = {'pk', queryset.model._meta.pk.name}
+        if not pk_names.intersection(field.lstrip('-') for field in ordering):
+            ordering.append('-id' if descending else 'id')
+        return tuple(ordering)
+
+    def cast_position(self, queryset, fields, position):
+        '''Convert the values of a decoded cursor to the types of the model fields or annotations (e.g. a
+        search rank) they are compared with, a cursor which does not fit them is not found'''
+        if len(position) != len(fields):
+            raise NotFound(self.invalid_cursor_message)
+
+        values = []
+        for field, value in zip(fields, position):
+            try:
+                output_field = queryset.model._meta.get_field(field)
+            except FieldDoesNotExist:
+                annotation = queryset.query.annotations.get(field)
+                if annotation is None:
+                    raise NotFound(self.invalid_cursor_message)
+                output_field = annotation.output_field
+            if value is None or isinstance(value, (list, dict)):
+                raise NotFound(self.invalid_cursor_message)
+            try:
+                values.append(output_field.to_python(value))
+            except Exception:
+                raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def get_position(self, instance):
+        return [attrgetter(field.lstrip('-'))(instance) for field in self.ordering]
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            tokens = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            cursor = {'position': list(tokens['p']), 'reverse': bool(tokens.get('r'))}
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, instance, reverse=False):
+        tokens = {'p': self.get_position(instance)}
+        if reverse:
+            tokens['r'] = 1
+        encoded = urlsafe_b64encode(json.dumps(tokens, cls=PositionEncoder).encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        response = OrderedDict([('next', self.get_next_link()), ('previous', self.get_previous_link())])
+        if self.count is not None:
+            response['count'] = self.count
+        response['results'] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count'] = {'type': 'integer', 'example': 123}
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters[0]['schema']['type'] = 'string'
+        parameters.append(
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Include the total number of results.',
+                'schema': {'type': 'boolean'},
+            }
+        )
+        return parameters
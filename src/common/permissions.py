@@ -1,20 +1,13 @@
 from rest_framework import permissions
 
-from src.employer.models import Employer
-from src.job_seeker.models import Job_Seeker
+from src.common.roles import EMPLOYER, JOB_SEEKER, get_roles
 
 
 class IsEmployer(permissions.BasePermission):
     def has_permission(self, request, view):
-
-        if Employer.objects.filter(user=request.user).exists():
-            return True
-        return False
+        return EMPLOYER in get_roles(request)
 
 
 class IsJobSeeker(permissions.BasePermission):
     def has_permission(self, request, view):
-
-        if Job_Seeker.objects.filter(user=request.user).exists():
-            return True
-        return False
+        return JOB_SEEKER in get_roles(request)
@@ -0,0 +1,104 @@
+"""Resolution of the roles of a user (employer, job seeker) for permission checks.
+
+The roles of the requesting user are resolved at most once per request and memoized on `request.user`.
+They are read, in order, from:
+
+* the `roles` claim of the JWT access token, which `add_role_claims` sets when a token is issued along
+  with `roles_at`, the time the roles were read,
+* a shared cache entry per user,
+* the database, with one query joining the user to both profiles.
+
+Creating or deleting an employer or job seeker profile drops the cache entry and records the time of
+the change, so tokens whose roles were read before it fall back to the cache and database until they
+are reissued. The change marker lives as long as a refresh token, after which every older token has
+expired anyway.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.tokens import Token
+
+EMPLOYER = 'employer'
+JOB_SEEKER = 'job_seeker'
+
+ROLES_CLAIM = 'roles'
+ROLES_AT_CLAIM = 'roles_at'
+
+ROLES_KEY = 'roles:user:{}'
+ROLES_TIMEOUT = 60 * 60
+CHANGED_KEY = 'roles:changed:{}'
+CHANGED_TIMEOUT = int(settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds())
+
+
+def load_roles(user_id):
+    profiles = get_user_model().objects.filter(pk=user_id).values_list('employer__id', 'job_seeker__id').first()
+    if profiles is None:
+        return frozenset()
+    return frozenset(role for role, profile_id in zip((EMPLOYER, JOB_SEEKER), profiles) if profile_id is not None)
+
+
+def get_user_roles(user_id):
+    """Return the roles of a user from the cache, loading them on a miss"""
+    key = ROLES_KEY.format(user_id)
+    roles = cache.get(key)
+    if roles is None:
+        roles = load_roles(user_id)
+        cache.set(key, roles, ROLES_TIMEOUT)
+    return roles
+
+
+def get_token_roles(token, user_id):
+    """Return the roles carried by a token, or None when it has none or they changed since it was issued"""
+    if not isinstance(token, Token) or token.get(ROLES_CLAIM) is None:
+        return None
+    changed_at = cache.get(CHANGED_KEY.format(user_id))
+    if changed_at is not None and changed_at >= token.get(ROLES_AT_CLAIM, 0):
+        return None
+    return frozenset(token[ROLES_CLAIM])
+
+
+def get_roles(request):
+    """Return the roles of the requesting user, resolved once per request"""
+    user = request.user
+    if not user or not user.is_authenticated:
+        return frozenset()
+    roles = getattr(user, '_roles', None)
+    if roles is None:
+        roles = get_token_roles(request.auth, user.pk)
+        if roles is None:
+            roles = get_user_roles(user.pk)
+        user._roles = roles
+    return roles
+
+
+def add_role_claims(token, user):
+    """Set the roles claims of a token issued to a user, returns the token"""
+    token[ROLES_AT_CLAIM] = time.time()
+    token[ROLES_CLAIM] = sorted(get_user_roles(user.pk))
+    return token
+
+
+def forget_roles(user_id):
+    def forget():
+        cache.delete(ROLES_KEY.format(user_id))
+        cache.set(CHANGED_KEY.format(user_id), time.time(), CHANGED_TIMEOUT)
+
+    transaction.on_commit(forget)
+
+
+@receiver(post_save, sender='employer.Employer')
+@receiver(post_save, sender='job_seeker.Job_Seeker')
+def forget_created_profile_roles(sender, instance, created, **kwargs):
+    if created:
+        forget_roles(instance.user_id)
+
+
+@receiver(post_delete, sender='employer.Employer')
+@receiver(post_delete, sender='job_seeker.Job_Seeker')
+def forget_deleted_profile_roles(sender, instance, **kwargs):
+    forget_roles(instance.user_id)
@@ -1,4 +1,5 @@
 from django.conf import settings
+from rest_framework.serializers import BaseSerializer, ListSerializer
 from rest_framework.serializers import ImageField as ApiImageField
 from easy_thumbnails.files import get_thumbnailer
 
@@ -7,7 +8,9 @@ THUMBNAIL_ALIASES = getattr(settings, 'THUMBNAIL_ALIASES', {})
 
 def get_url(request, instance, alias_obj, alias=None):
     if alias is not None:
-        return request.build_absolute_uri(get_thumbnailer(instance).get_thumbnail(alias_obj[alias]).url)
+        # aliases are rendered in the background, serve the original until they exist
+        thumbnail = get_thumbnailer(instance).get_existing_thumbnail(alias_obj[alias])
+        return request.build_absolute_uri((thumbnail or instance).url)
     elif alias is None:
         return request.build_absolute_uri(instance.url)
     else:
@@ -28,3 +31,47 @@ class ThumbnailerJSONSerializer(ApiImageField):
         if instance:
             return image_sizes(self.context['request'], instance, self.alias_target)
         return None
+
+
+def get_eager_loading_plan(serializer_class):
+    """Collect the relations a serializer reads, so that they can be loaded up front
+
+    Nested serializers are followed recursively: a single nested serializer is joined with
+    `select_related`, a `many=True` one is loaded with `prefetch_related`, and everything below a
+    prefetched relation is prefetched too. Relations read some other way (e.g. by a dotted `source` or a
+    method field) are declared on the serializer with `select_related_fields` and `prefetch_related_fields`.
+
+    Args:
+        serializer_class (type): serializer to inspect
+
+    Returns:
+        tuple: (select_related lookups, prefetch_related lookups)
+    """
+    select = list(getattr(serializer_class, 'select_related_fields', ()))
+    prefetch = list(getattr(serializer_class, 'prefetch_related_fields', ()))
+    for name, field in serializer_class._declared_fields.items():
+        many = isinstance(field, ListSerializer)
+        nested = field.child if many else field
+        if not isinstance(nested, BaseSerializer) or field.source == '*':
+            continue
+
+        lookup = (field.source or name).replace('.', '__')
+        nested_select, nested_prefetch = get_eager_loading_plan(type(nested))
+        if many:
+            prefetch.append(lookup)
+            prefetch.extend(f'{lookup}__{related}' for related in nested_select + nested_prefetch)
+        else:
+            select.append(lookup)
+            select.extend(f'{lookup}__{related}' for related in nested_select)
+            prefetch.extend(f'{lookup}__{related}' for related in nested_prefetch)
+    return select, prefetch
+
+
+def setup_eager_loading(queryset, serializer_class):
+    """Apply the eager loading plan of a serializer to a queryset, see `get_eager_loading_plan`"""
+    select, prefetch = get_eager_loading_plan(serializer_class)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
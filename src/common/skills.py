@@ -0,0 +1,104 @@
+"""Batched resolution of skill names to skill rows.
+
+A `SkillResolver` maps submitted skill names to the ids of a skill model (`Required_Skill` of jobs,
+`Skill` of job seekers). All unknown names are looked up with one `IN` query and the missing ones are
+inserted with one conflict-safe bulk insert. Resolved names are kept in a small process-local cache,
+since the same skill vocabulary is submitted over and over. Cached ids are still checked by primary key
+in the same `IN` query, a skill deleted or renamed by another process is resolved again instead of
+linking a row which no longer exists.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+
+
+def normalize_skill_names(names):
+    """Strip the names and drop blanks and duplicates, keeping the submitted order"""
+    return list(dict.fromkeys(name.strip() for name in names if name and name.strip()))
+
+
+class SkillResolver:
+    """Resolves skill names to ids of a skill model whose name field is unique
+
+    Args:
+        model (type): skill model
+        field (str): name of the unique name field
+        max_size (int): number of names kept in the process-local cache
+        timeout (int): seconds a name is kept in the process-local cache
+    """
+
+    def __init__(self, model, field='skill', max_size=5000, timeout=60 * 10):
+        self.model = model
+        self.field = field
+        self.max_size = max_size
+        self.timeout = timeout
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        post_save.connect(self._forget_changed, sender=model, weak=False, dispatch_uid=f'skill_resolver_{model._meta.label}')
+        post_delete.connect(self._forget_changed, sender=model, weak=False, dispatch_uid=f'skill_resolver_{model._meta.label}')
+
+    def _forget_changed(self, sender, created=False, **kwargs):
+        if not created:
+            self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _get_cached(self, names):
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for name in names:
+                entry = self._cache.get(name)
+                if entry is not None and entry[1] > now:
+                    self._cache.move_to_end(name)
+                    found[name] = entry[0]
+        return found
+
+    def _remember(self, ids):
+        expires = time.monotonic() + self.timeout
+        with self._lock:
+            for name, pk in ids.items():
+                self._cache[name] = (pk, expires)
+                self._cache.move_to_end(name)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def _lookup(self, names, cached_ids=()):
+        condition = Q(**{f'{self.field}__in': names}) | Q(pk__in=cached_ids)
+        return dict(self.model.objects.filter(condition).values_list(self.field, 'pk'))
+
+    def resolve(self, names):
+        """Return the ids of the given skill names, creating the skills which do not exist yet
+
+        Costs one lookup (of the uncached names and the cached ids) plus, when some skills are missing,
+        one bulk insert and one more lookup.
+
+        Returns:
+            dict: normalized name -> id
+        """
+        names = normalize_skill_names(names)
+        if not names:
+            return {}
+        cached = self._get_cached(names)
+        found = self._lookup([name for name in names if name not in cached], list(cached.values()))
+        unknown = [name for name in names if name not in found]
+        if unknown:
+            # skills inserted concurrently are skipped by the insert and picked up by the lookup
+            self.model.objects.bulk_create([self.model(**{self.field: name}) for name in unknown], ignore_conflicts=True)
+            found.update(self._lookup(unknown))
+        ids = {name: found[name] for name in names if name in found}
+        self._remember(ids)
+        return ids
+
+    def set_skills(self, manager, names):
+        """Make the skills of a many-to-many manager exactly the given names
+
+        The manager's current set is diffed against the resolved ids, so only the added and removed
+        through rows are written (and the usual `m2m_changed` signals are sent for those).
+        """
+        manager.set(list(self.resolve(names).values()))
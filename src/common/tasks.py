@@ -1,6 +1,8 @@
 from celery import task
 from django.core.mail import EmailMultiAlternatives
 
+from src.common import counters
+
 
 @task(name='SendEmailTask')
 def send_email_task(subject, to, default_from, email_html_message):
@@ -12,3 +14,8 @@ def send_email_task(subject, to, default_from, email_html_message):
         alternatives=((email_html_message, 'text/html'),),
     )
     msg.send()
+
+
+@task(name='ReconcileCountersTask')
+def reconcile_counters_task():
+    counters.reconcile()
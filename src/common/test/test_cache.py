@@ -0,0 +1,152 @@
+import os
+import time
+import unittest
+from unittest import mock
+
+from django.core.cache import cache, caches
+from nose.tools import eq_, ok_
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from src.common import cache_backends, counters
+from src.common.cache import CacheUnavailable, cache_lock
+from src.common.cache_backends import RedisCache, TieredCache
+from src.job.test.factories import EmployerFactory, JobFactory
+from src.users.test.factories import UserFactory
+
+
+class TestTieredCacheTestCase(APITestCase):
+    """
+    Tests the process-local tier in front of the shared cache.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.tiered = TieredCache(None, {'OPTIONS': {'SHARED': 'default', 'LOCAL_TIMEOUT': 5}})
+
+    def test_reads_are_served_locally(self):
+        self.tiered.set('key', 'value')
+        eq_(cache.get('key'), 'value')
+        cache.delete('key')
+        eq_(self.tiered.get('key'), 'value')
+
+        cache.set('other', 1)
+        eq_(self.tiered.get('other'), 1)
+        eq_(self.tiered.incr('other'), 2)
+        eq_(self.tiered.get('other'), 2)
+
+        self.tiered.delete('key')
+        ok_(self.tiered.get('key') is None)
+        stats = self.tiered.stats.snapshot()
+        eq_((stats['hits'], stats['misses']), ({'local': 1, 'shared': 2}, 1))
+        eq_(stats['operations']['get']['calls'], 4)
+
+
+@unittest.skipUnless(os.environ.get('CACHE_URL'), 'needs a redis at CACHE_URL')
+class TestRedisCacheTestCase(APITestCase):
+    """
+    Tests the Redis cache backend.
+    """
+
+    def setUp(self):
+        self.cache = RedisCache(os.environ['CACHE_URL'], {'KEY_PREFIX': 'test'})
+        self.cache.clear()
+
+    def test_operations(self):
+        ok_(self.cache.add('key', {'a': 1}))
+        ok_(not self.cache.add('key', {'a': 2}))
+        eq_(self.cache.get('key'), {'a': 1})
+        self.cache.set_many({'one': 1, 'two': 2})
+        eq_(self.cache.get_many(['one', 'two', 'three']), {'one': 1, 'two': 2})
+        eq_(self.cache.incr('one', 5), 6)
+        with self.assertRaises(ValueError):
+            self.cache.incr('three')
+        ok_(self.cache.delete('key'))
+        ok_(self.cache.get('key') is None)
+
+
+class TestCachedResponsesTestCase(APITestCase):
+    """
+    Tests that cached responses are dropped when the data behind them changes.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(UserFactory())
+        self.employer = EmployerFactory()
+        counters.reconcile()
+
+    def test_counts_are_cached_until_a_counter_changes(self):
+        response = self.client.get('/job/counts/')
+        eq_((response['X-Cache'], response.data['jobs']), ('miss', 0))
+        with self.assertNumQueries(0):
+            response = self.client.get('/job/counts/')
+        eq_((response['X-Cache'], response.data['jobs']), ('hit', 0))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            JobFactory(employer=self.employer)
+        response = self.client.get('/job/counts/')
+        eq_((response['X-Cache'], response.data['jobs']), ('miss', 1))
+        eq_(self.client.get('/job/no-of-jobs/').data, {'Jobs count': 1})
+
+    def test_employer_and_job_seeker_counts_are_cached(self):
+        eq_(self.client.get('/employer/no-of-employers/').data, {'employers count': 1})
+        eq_(self.client.get('/employer/no-of-employers/')['X-Cache'], 'hit')
+        eq_(self.client.get('/job-seeker/no-of-jobseekers/')['X-Cache'], 'miss')
+        eq_(self.client.get('/job-seeker/no-of-jobseekers/')['X-Cache'], 'hit')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            EmployerFactory()
+        response = self.client.get('/employer/no-of-employers/')
+        eq_((response['X-Cache'], response.data), ('miss', {'employers count': 2}))
+
+    def test_search_and_category_counts_follow_jobs(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = JobFactory(employer=self.employer, name='python developer')
+        eq_(len(self.client.get('/job/search/?search=python').data['results']), 1)
+        eq_(self.client.get('/job/search/?search=python')['X-Cache'], 'hit')
+        eq_(self.client.get('/job/categorywise-jobcount/').data['results'][0]['count'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            JobFactory(employer=self.employer, name='python tester', category=job.category)
+        response = self.client.get('/job/search/?search=python')
+        eq_((response['X-Cache'], len(response.data['results'])), ('miss', 2))
+        eq_(self.client.get('/job/categorywise-jobcount/').data['results'][0]['count'], 2)
+
+    def test_statistics_are_for_staff(self):
+        eq_(self.client.get('/cache/stats/').status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(UserFactory(is_staff=True))
+        caches['tiered'].get('missing')
+        response = self.client.get('/cache/stats/')
+        eq_(response.status_code, status.HTTP_200_OK)
+        ok_(response.data['tiered']['misses'] >= 1)
+
+
+class TestUnavailableRedisCacheTestCase(APITestCase):
+    """
+    Tests that an unreachable Redis is answered like a cache miss.
+    """
+
+    def setUp(self):
+        self.cache = RedisCache('redis://127.0.0.1:1/0', {'OPTIONS': {'socket_timeout': 0.1, 'socket_connect_timeout': 0.1}})
+
+    def tearDown(self):
+        cache_backends._unavailable_until.clear()
+
+    def test_fails_soft(self):
+        eq_(self.cache.get('key', 'default'), 'default')
+        with self.assertRaises(CacheUnavailable):
+            self.cache.add('key', 1)
+        self.cache.set('key', 1)
+        eq_(self.cache.get_many(['key']), {})
+        with self.assertRaises(ValueError):
+            self.cache.incr('key')
+        # only the first call waited on redis
+        eq_(self.cache.stats.errors, 1)
+
+    def test_locks_are_skipped(self):
+        started = time.monotonic()
+        with mock.patch('src.common.cache.cache', self.cache):
+            with cache_lock('lock') as acquired:
+                ok_(acquired)
+        ok_(time.monotonic() - started < 1)
@@ -0,0 +1,52 @@
+from nose.tools import eq_
+from rest_framework.test import APITestCase
+
+from src.common import counters
+from src.job.models import Project
+from src.job.test.factories import EmployerFactory, JobFactory, JobSeekerFactory
+from src.users.test.factories import UserFactory
+
+
+class TestPlatformCountersTestCase(APITestCase):
+    """
+    Tests the incrementally maintained platform counters.
+    """
+
+    def setUp(self):
+        self.client.force_authenticate(UserFactory())
+        self.employer = EmployerFactory()
+        counters.reconcile()
+
+    def counts(self):
+        return self.client.get('/job/counts/').data
+
+    def test_counters_follow_writes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = JobFactory(employer=self.employer)
+            JobFactory(employer=self.employer, is_draft=True)
+            job_seeker = JobSeekerFactory()
+        eq_(self.counts(), {'jobs': 2, 'open_jobs': 1, 'draft_jobs': 1, 'employers': 1, 'job_seekers': 1, 'active_projects': 0})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            project = Project.objects.create(job=job, job_seeker=job_seeker, employer=self.employer)
+        eq_((self.counts()['open_jobs'], self.counts()['active_projects']), (0, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            project.is_finished = True
+            project.save()
+        eq_((self.counts()['open_jobs'], self.counts()['active_projects']), (0, 0))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employer.delete()
+        eq_(self.counts(), {'jobs': 0, 'open_jobs': 0, 'draft_jobs': 0, 'employers': 0, 'job_seekers': 1, 'active_projects': 0})
+
+    def test_count_endpoints_read_the_counters(self):
+        eq_(self.client.get('/job/no-of-jobs/').data, {'Jobs count': 0})
+        eq_(self.client.get('/employer/no-of-employers/').data, {'employers count': 1})
+        eq_(self.client.get('/job-seeker/no-of-jobseekers/').data, {'Job_seekers count': 0})
+
+    def test_reconcile_repairs_drift(self):
+        JobFactory(employer=self.employer)
+        eq_(counters.get_count(counters.JOBS), 0)
+        counters.reconcile()
+        eq_(counters.get_count(counters.JOBS), 1)
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from nose.tools import eq_
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from src.common.roles import EMPLOYER, JOB_SEEKER, get_roles
+from src.job.test.factories import EmployerFactory, JobSeekerFactory
+
+
+class TestRolesTestCase(APITestCase):
+    """
+    Tests the resolution of user roles from tokens, the cache and the database.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.employer = EmployerFactory()
+        self.user = self.employer.user
+
+    def request(self, token=None):
+        self.user.__dict__.pop('_roles', None)
+        return SimpleNamespace(user=self.user, auth=token)
+
+    def token(self):
+        return AccessToken(self.user.get_tokens()['access'])
+
+    def test_token_claims_need_no_query(self):
+        token = self.token()
+        eq_(token['roles'], [EMPLOYER])
+        cache.clear()
+        with self.assertNumQueries(0):
+            eq_(get_roles(self.request(token)), {EMPLOYER})
+
+    def test_roles_are_cached_and_memoized(self):
+        with self.assertNumQueries(1):
+            request = self.request()
+            eq_(get_roles(request), {EMPLOYER})
+            eq_(get_roles(request), {EMPLOYER})
+            eq_(get_roles(self.request()), {EMPLOYER})
+
+    def test_new_profile_makes_older_tokens_stale(self):
+        token = self.token()
+        with self.captureOnCommitCallbacks(execute=True):
+            JobSeekerFactory(user=self.user)
+        eq_(get_roles(self.request(token)), {EMPLOYER, JOB_SEEKER})
+        eq_(self.token()['roles'], [EMPLOYER, JOB_SEEKER])
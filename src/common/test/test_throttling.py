@@ -0,0 +1,58 @@
+import os
+import unittest
+import uuid
+
+from django.core.cache import cache
+from django.test import override_settings
+from nose.tools import eq_, ok_
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from src.common import throttling
+
+
+class TwoPerMinuteThrottle(throttling.AnonRateThrottle):
+    rate = '2/min'
+
+
+class TestSlidingWindowRateThrottleTestCase(APITestCase):
+    """
+    Tests the throttles counting requests in redis.
+    """
+
+    def setUp(self):
+        cache.clear()
+        throttling._unavailable_until = 0
+        # a client of its own, so that runs against the same redis do not share counters
+        self.request = Request(APIRequestFactory().get('/', REMOTE_ADDR=f'test-{uuid.uuid4().hex}'))
+
+    def allowed(self, throttle=None):
+        return (throttle or TwoPerMinuteThrottle()).allow_request(self.request, None)
+
+    @override_settings(THROTTLE_REDIS_URL=None)
+    def test_without_redis_counts_in_the_cache(self):
+        ok_(self.allowed())
+        ok_(self.allowed())
+        throttle = TwoPerMinuteThrottle()
+        ok_(not self.allowed(throttle))
+        ok_(0 < throttle.wait() <= 60)
+
+    @override_settings(THROTTLE_REDIS_URL='redis://127.0.0.1:1/0')
+    def test_fails_open(self):
+        for _ in range(3):
+            ok_(self.allowed())
+        ok_(throttling._unavailable_until > 0)
+
+    @unittest.skipUnless(os.environ.get('THROTTLE_REDIS_URL'), 'needs a redis at THROTTLE_REDIS_URL')
+    def test_sliding_window(self):
+        throttle = TwoPerMinuteThrottle()
+        throttle.timer = lambda: 60 * 1000 + 30
+        ok_(self.allowed(throttle))
+        ok_(self.allowed(throttle))
+        ok_(not self.allowed(throttle))
+        eq_(throttle.wait(), 30)
+
+        # half of the previous window's 2 requests still count
+        throttle.timer = lambda: 60 * 1001 + 30
+        ok_(self.allowed(throttle))
+        ok_(not self.allowed(throttle))
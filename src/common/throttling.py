@@ -0,0 +1,109 @@
+"""Request throttles counting requests in Redis with a sliding window counter.
+
+DRF's `SimpleRateThrottle` keeps the list of request timestamps of each client in the cache and rewrites
+it on every request. Here each client has one counter per fixed window of the rate's duration, and a
+request is allowed while
+
+    requests in the previous window * share of the previous window still covered + requests in this window
+
+is below the rate. The check and the increment are one Lua script, so a request costs a single atomic
+round trip whatever the rate, and the count is shared by every worker and host.
+
+Throttles fail open: when Redis errors or does not answer within `THROTTLE_REDIS_TIMEOUT` seconds the
+request is allowed, and Redis is not asked again for `RETRY_AFTER` seconds. Without a
+`THROTTLE_REDIS_URL` (e.g. in local settings) the throttles fall back to DRF's cache based counting.
+"""
+import logging
+import time
+
+import redis
+from django.conf import settings
+from rest_framework import throttling
+
+from src.common.cache_backends import get_pool
+
+logger = logging.getLogger(__name__)
+
+RETRY_AFTER = 5
+'''int: seconds throttles let requests through without asking Redis after it failed'''
+
+SLIDING_WINDOW_SCRIPT = '''
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+if previous * tonumber(ARGV[1]) + current >= tonumber(ARGV[2]) then
+    return {0, current, previous}
+end
+current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+return {1, current, previous}
+'''
+'''str: KEYS: counters of the current and previous window, ARGV: weight of the previous window, rate, key timeout'''
+
+_scripts = {}
+_unavailable_until = 0
+
+
+def get_script():
+    '''Return the sliding window script bound to the throttle Redis, or None when none is configured'''
+    url = getattr(settings, 'THROTTLE_REDIS_URL', None)
+    if not url:
+        return None
+    if url not in _scripts:
+        timeout = settings.THROTTLE_REDIS_TIMEOUT
+        client = redis.Redis(connection_pool=get_pool(url, socket_timeout=timeout, socket_connect_timeout=timeout))
+        _scripts[url] = client.register_script(SLIDING_WINDOW_SCRIPT)
+    return _scripts[url]
+
+
+class SlidingWindowRateThrottle(throttling.SimpleRateThrottle):
+    """SimpleRateThrottle which counts requests with the sliding window script, see the module docstring"""
+
+    def allow_request(self, request, view):
+        global _unavailable_until
+
+        script = get_script()
+        if script is None:
+            return super().allow_request(request, view)
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        if time.monotonic() < _unavailable_until:
+            return True
+
+        self.now = self.timer()
+        window, self.elapsed = divmod(self.now, self.duration)
+        # the hash tag keeps both counters of a client on the same node of a cluster
+        keys = [f'{{{self.key}}}:{int(window)}', f'{{{self.key}}}:{int(window) - 1}']
+        weight = 1 - self.elapsed / self.duration
+        try:
+            allowed, self.current, self.previous = script(keys=keys, args=[repr(weight), self.num_requests, self.duration * 2])
+        except redis.RedisError:
+            logger.warning('Throttle counters are unavailable, allowing requests for %ss', RETRY_AFTER, exc_info=True)
+            _unavailable_until = time.monotonic() + RETRY_AFTER
+            return True
+        return bool(allowed)
+
+    def wait(self):
+        if not hasattr(self, 'current'):
+            return super().wait()
+        remaining = self.duration - self.elapsed
+        if self.current >= self.num_requests or not self.previous:
+            return remaining
+        # the previous window's share drops below the spare requests of this window
+        return max(self.duration * (1 - (self.num_requests - self.current) / self.previous) - self.elapsed, 0)
+
+
+class AnonRateThrottle(throttling.AnonRateThrottle, SlidingWindowRateThrottle):
+    pass
+
+
+class UserRateThrottle(throttling.UserRateThrottle, SlidingWindowRateThrottle):
+    pass
+
+
+class ScopedRateThrottle(throttling.ScopedRateThrottle, SlidingWindowRateThrottle):
+    pass
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from src.common.serializers import setup_eager_loading
+
+
+class EagerLoadingMixin:
+    """Generic view mixin which loads the relations read by the view's serializer along with the
+    queryset, so that serializing a page of objects costs a fixed number of queries instead of a few
+    queries per object. See `src.common.serializers.get_eager_loading_plan`.
+    """
+
+    def get_queryset(self):
+        return setup_eager_loading(super().get_queryset(), self.get_serializer_class())
+
+
+class CacheStatistics(APIView):
+    """This view returns, for staff, the hit rate and mean latency per operation of each cache of the
+    worker process answering the request (see `src.common.cache_backends.CacheStats`), and the keyspace
+    hits and misses of the Redis server, which cover every process. `?reset=true` restarts the counters
+    of the answering process.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        stats = {}
+        for alias in settings.CACHES:
+            backend = caches[alias]
+            if not hasattr(backend, 'stats'):
+                continue
+            stats[alias] = backend.stats.snapshot()
+            if hasattr(backend, 'get_server_stats'):
+                stats[alias]['server'] = backend.get_server_stats()
+            if request.query_params.get('reset', '').lower() in ('1', 'true', 'yes'):
+                backend.stats.reset()
+        return Response(stats)
@@ -16,6 +16,7 @@ INSTALLED_APPS = (
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'jet',
     'django.contrib.admin',
     # Third party apps
@@ -82,6 +83,31 @@ EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', 'asdf.1234')
 BROKER_URL = os.environ.get('BROKER_URL', 'redis://redis:6379')
 CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'redis://redis:6379')
 
+# Event streams of the live feeds, see src.common.events
+EVENTS_BROKER_URL = os.environ.get('EVENTS_BROKER_URL', 'redis://redis:6379/1')
+
+# Redis is the cache shared by every worker; the 'tiered' cache keeps recently read entries in process
+# memory in front of it, for cached responses. See src.common.cache_backends
+CACHE_URL = os.environ.get('CACHE_URL', 'redis://redis:6379/2')
+CACHES = {
+    'default': {
+        'BACKEND': 'src.common.cache_backends.RedisCache',
+        'LOCATION': CACHE_URL,
+        'KEY_PREFIX': 'jade',
+        # the cache is on the path of every request: answer like a miss rather than wait on a slow redis
+        'OPTIONS': {'socket_timeout': 0.25, 'socket_connect_timeout': 0.25},
+    },
+    'tiered': {
+        'BACKEND': 'src.common.cache_backends.TieredCache',
+        'OPTIONS': {'SHARED': 'default', 'LOCAL_TIMEOUT': 5, 'MAX_ENTRIES': 5000},
+    },
+}
+
+# Request counters of the throttles, which let requests through when redis does not answer within
+# THROTTLE_REDIS_TIMEOUT seconds. See src.common.throttling
+THROTTLE_REDIS_URL = os.environ.get('THROTTLE_REDIS_URL', CACHE_URL)
+THROTTLE_REDIS_TIMEOUT = 0.05
+
 ADMINS = ()
 
 # Sentry
@@ -95,6 +121,28 @@ CELERY_ACCEPT_CONTENT = ['application/json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
+CELERYBEAT_SCHEDULE = {
+    'rebuild-recommendation-index': {
+        'task': 'RebuildRecommendationIndexTask',
+        'schedule': timedelta(hours=1),
+    },
+    'reconcile-counters': {
+        'task': 'ReconcileCountersTask',
+        'schedule': timedelta(hours=1),
+    },
+    'reconcile-rollups': {
+        'task': 'ReconcileRollupsTask',
+        'schedule': timedelta(hours=1),
+    },
+    'expire-jobs': {
+        'task': 'ExpireJobsTask',
+        'schedule': timedelta(hours=1),
+    },
+    'rebuild-reputations': {
+        'task': 'RebuildReputationsTask',
+        'schedule': timedelta(days=1),
+    },
+}
 
 # Postgres
 DATABASES = {
@@ -233,8 +281,8 @@ AUTH_USER_MODEL = 'users.User'
 AUTHENTICATION_BACKENDS = (
     'social_core.backends.facebook.FacebookOAuth2',
     'social_core.backends.twitter.TwitterOAuth',
+    # the only password backend, see its docstring
     'src.users.backends.EmailOrUsernameModelBackend',
-    'django.contrib.auth.backends.ModelBackend',
 )
 for key in ['GOOGLE_OAUTH2_KEY', 'GOOGLE_OAUTH2_SECRET', 'FACEBOOK_KEY', 'FACEBOOK_SECRET', 'TWITTER_KEY', 'TWITTER_SECRET']:
     exec("SOCIAL_AUTH_{key} = os.environ.get('{key}', '')".format(key=key))
@@ -282,8 +330,9 @@ SOCIAL_AUTH_TWITTER_PIPELINE = (
 
 SOCIAL_AUTH_LOGIN_REDIRECT_URL = '/complete/twitter/'
 
+# keyed by app label, easy_thumbnails matches aliases against 'users.User.profile_picture'
 THUMBNAIL_ALIASES = {
-    'src.users': {
+    'users': {
         'thumbnail': {'size': (100, 100), 'crop': True},
         'medium_square_crop': {'size': (400, 400), 'crop': True},
         'small_square_crop': {'size': (50, 50), 'crop': True},
@@ -306,13 +355,14 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': (
+        # bearer tokens first, so API requests which also carry a session cookie skip the session lookup
+        'src.users.authentication.CachedJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
-        'rest_framework.throttling.ScopedRateThrottle',
+        'src.common.throttling.AnonRateThrottle',
+        'src.common.throttling.UserRateThrottle',
+        'src.common.throttling.ScopedRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {'anon': '100/second', 'user': '1000/second', 'subscribe': '60/minute'},
     'TEST_REQUEST_DEFAULT_FORMAT': 'json',
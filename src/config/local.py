@@ -4,3 +4,13 @@ from src.config.common import *  # noqa
 INSTALLED_APPS += ('django_nose',)  # noqa
 TEST_RUNNER = 'django_nose.NoseTestSuiteRunner'
 NOSE_ARGS = ['-s', '--nologcapture', '--with-progressive', '--with-fixture-bundling']
+
+# Serve the live feeds from an in-process broker unless a redis is configured
+EVENTS_BROKER_URL = os.environ.get('EVENTS_BROKER_URL', 'memory://')
+
+# Cache and throttle in process memory unless a redis is configured, without a local tier which
+# cache.clear() would miss
+if 'CACHE_URL' not in os.environ:
+    CACHES['default'] = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    CACHES['tiered']['OPTIONS']['LOCAL_TIMEOUT'] = 0
+    THROTTLE_REDIS_URL = os.environ.get('THROTTLE_REDIS_URL')
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class EmployerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'src.employer'
+
+    def ready(self):
+        # register the signal receivers which drop the cached employer dashboards
+        from src.employer import dashboard  # noqa: F401
@@ -0,0 +1,89 @@
+"""Dashboard totals of an employer: their jobs by status, the bids on them and their projects.
+
+The totals are computed with two queries, a conditional aggregation over the employer's jobs and one
+row of scalar subqueries for the bids and projects, and cached per employer. Writes to the employer's
+jobs, the bids on them and their projects drop the cached totals once they commit.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Func, IntegerField, OuterRef, Q, Subquery
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from src.employer.models import Employer
+from src.job.models import Bid, Job, Project
+from src.job.signals import jobs_bulk_created, jobs_bulk_status_changed
+
+DASHBOARD_KEY = 'dashboard:employer:{}'
+DASHBOARD_TIMEOUT = 60 * 15
+
+
+def count_subquery(queryset):
+    '''Scalar subquery counting the rows of a queryset filtered on an OuterRef'''
+    count = queryset.order_by().annotate(count=Func(F('id'), function='COUNT')).values('count')
+    return Subquery(count, output_field=IntegerField())
+
+
+def build_dashboard(employer_id):
+    statuses = {f'{status}_jobs': Count('id', filter=Q(status=status)) for status in Job.Status.values}
+    jobs = Job.objects.filter(employer_id=employer_id).aggregate(jobs=Count('id'), **statuses)
+    employer_bids = Bid.objects.filter(job__employer_id=OuterRef('pk'))
+    employer_projects = Project.objects.filter(employer_id=OuterRef('pk'))
+    totals = (
+        Employer.objects.filter(pk=employer_id)
+        .annotate(
+            bids=count_subquery(employer_bids),
+            shortlisted_bids=count_subquery(employer_bids.filter(is_shortlisted=True)),
+            active_projects=count_subquery(employer_projects.filter(is_active=True, is_finished=False)),
+            finished_projects=count_subquery(employer_projects.filter(is_finished=True)),
+        )
+        .values('bids', 'shortlisted_bids', 'active_projects', 'finished_projects')
+        .first()
+    )
+    return dict(jobs, **totals)
+
+
+def get_dashboard(employer_id):
+    """Return the cached dashboard totals of an employer, computing them when missing"""
+    key = DASHBOARD_KEY.format(employer_id)
+    dashboard = cache.get(key)
+    if dashboard is None:
+        dashboard = build_dashboard(employer_id)
+        cache.set(key, dashboard, DASHBOARD_TIMEOUT)
+    return dashboard
+
+
+def forget_dashboard(employer_id):
+    if employer_id is not None:
+        transaction.on_commit(lambda: cache.delete(DASHBOARD_KEY.format(employer_id)))
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def forget_employer_dashboard(sender, instance, **kwargs):
+    forget_dashboard(instance.employer_id)
+
+
+@receiver(jobs_bulk_created)
+def forget_bulk_created_jobs_dashboard(sender, jobs, **kwargs):
+    for employer_id in {job.employer_id for job in jobs}:
+        forget_dashboard(employer_id)
+
+
+@receiver(jobs_bulk_status_changed)
+def forget_bulk_status_changed_dashboards(sender, job_ids, **kwargs):
+    for employer_id in set(Job.objects.filter(pk__in=job_ids).values_list('employer_id', flat=True)):
+        forget_dashboard(employer_id)
+
+
+@receiver(post_save, sender=Bid)
+@receiver(post_delete, sender=Bid)
+def forget_bid_dashboard(sender, instance, **kwargs):
+    job_ids = {instance.job_id, instance.get_loaded_value('job_id')} - {None}
+    if Bid.job.is_cached(instance) and job_ids == {instance.job_id}:
+        forget_dashboard(instance.job.employer_id)
+        return
+    for employer_id in Job.objects.filter(pk__in=job_ids).values_list('employer_id', flat=True):
+        forget_dashboard(employer_id)
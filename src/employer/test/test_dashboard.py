@@ -0,0 +1,45 @@
+from django.core.cache import cache
+from nose.tools import eq_
+from rest_framework.test import APITestCase
+
+from src.job.models import Job, Project
+from src.job.test.factories import BidFactory, EmployerFactory, JobFactory, JobSeekerFactory
+
+
+class TestEmployerDashboardTestCase(APITestCase):
+    """
+    Tests the cached /employer/dashboard/ totals.
+    """
+
+    url = '/employer/dashboard/'
+
+    def setUp(self):
+        cache.clear()
+        self.employer = EmployerFactory()
+        self.client.force_authenticate(self.employer.user)
+        self.job = JobFactory(employer=self.employer)
+        JobFactory(employer=self.employer, is_draft=True)
+        BidFactory(job=self.job, is_shortlisted=True)
+        BidFactory(job=self.job)
+        BidFactory(job=JobFactory())
+        Project.objects.create(job=self.job, job_seeker=JobSeekerFactory(), employer=self.employer)
+
+    def test_dashboard_totals(self):
+        # employer roles, employer id, job aggregation, bid and project subqueries
+        with self.assertNumQueries(4):
+            data = self.client.get(self.url).data
+        eq_((data['jobs'], data['draft_jobs'], data['in_progress_jobs']), (2, 1, 1))
+        eq_((data['bids'], data['shortlisted_bids']), (2, 1))
+        eq_((data['active_projects'], data['finished_projects']), (1, 0))
+        # employer id
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+    def test_writes_drop_the_cached_dashboard(self):
+        eq_(self.client.get(self.url).data['bids'], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            BidFactory(job=self.job)
+        eq_(self.client.get(self.url).data['bids'], 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            Job.objects.filter(is_draft=True).get().delete()
+        eq_(self.client.get(self.url).data['draft_jobs'], 0)
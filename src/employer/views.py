@@ -3,7 +3,12 @@ from rest_framework import generics, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from src.common import counters
+from src.common.cache import cache_response
+from src.common.pagination import KeysetPagination
 from src.common.permissions import IsEmployer
+from src.common.views import EagerLoadingMixin
+from src.employer import dashboard
 from src.employer.models import Employer
 from src.employer.serializers import EmployerSerializer
 from src.job.models import Job, Rating
@@ -40,14 +45,15 @@ class EmployerUpdate(generics.RetrieveUpdateDestroyAPIView):
 
 class Number_Of_Employers(APIView):
     """
-    View to list all users in the system.
+    View to return the number of employers in the system.
     """
 
+    @cache_response(counters.COUNTERS_NAMESPACE)
     def get(self, request):
         """
-        Return a list of all users.
+        Return the number of employers, read from the maintained platform counters.
         """
-        no_of_employers = Employer.objects.all().count()
+        no_of_employers = counters.get_count(counters.EMPLOYERS)
         return Response({"employers count": no_of_employers})
 
 
@@ -76,11 +82,32 @@ class RateApi(generics.ListCreateAPIView):
     ]
 
 
-class DraftJob(LoginRequiredMixin, generics.ListAPIView):
+class DraftJob(LoginRequiredMixin, EagerLoadingMixin, generics.ListAPIView):
+    """This view lists the requesting employer's draft jobs, newest first."""
 
-    queryset = Job.objects.filter(is_draft=True)
+    queryset = Job.objects.filter(status=Job.Status.DRAFT)
     serializer_class = JobSerializer
     permission_classes = [IsEmployer]
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        return super().get_queryset().filter(employer__user=self.request.user)
+
+
+class EmployerDashboard(APIView):
+    """This view returns the dashboard totals of the requesting employer in one response: their jobs
+    in each status, the bids and shortlisted bids on their jobs and their active and finished projects.
+
+    The totals are computed by src.employer.dashboard with two queries, a conditional aggregation over
+    the employer's jobs and a row of counting subqueries, and cached per employer until one of their
+    jobs, bids or projects changes.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsEmployer]
+
+    def get(self, request):
+        employer_id = Employer.objects.filter(user=request.user).values_list('id', flat=True).first()
+        return Response(dashboard.get_dashboard(employer_id))
 
 
 class EmployerAddress(APIView):
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class JobConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'src.job'
+
+    def ready(self):
+        # register the signal receivers which keep the derived job data in sync
+        from src.job import batch, facets, feed, ranking, recommendations, rollups  # noqa: F401
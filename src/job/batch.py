@@ -0,0 +1,72 @@
+"""Batch lookup of jobs by id, with the fields computed for job cards (age, bid count).
+
+The stored fields of each job are cached under their own key, so overlapping batches share entries,
+and the jobs missing from the cache are read with a single `IN` query. The bid counts are read from
+the bids per job rollup on every lookup and the age is computed from the creation date, so neither
+goes stale in the cache. Unknown ids are cached too, so repeated lookups of deleted jobs stay off the
+database. A job's entry is dropped when the job is saved, deleted or changes status.
+"""
+import datetime
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from src.job.models import Job, JobBidCount
+from src.job.signals import job_status_changed, jobs_bulk_status_changed
+
+JOB_KEY = 'jobs:batch:{}'
+JOB_TIMEOUT = 60 * 60
+MAX_BATCH_SIZE = 100
+JOB_FIELDS = ('id', 'name', 'status', 'budget', 'duration', 'category_id', 'employer_id', 'created_at')
+MISSING = 'missing'
+
+
+def get_jobs(job_ids, today=None):
+    """Return the jobs with the given ids, in the given order, skipping unknown ids
+
+    Returns:
+        list: dicts of the JOB_FIELDS of each job with its `age` in days and `bid_count`
+    """
+    today = today or datetime.date.today()
+    keys = {job_id: JOB_KEY.format(job_id) for job_id in job_ids}
+    cached = cache.get_many(keys.values())
+    jobs = {job_id: cached[key] for job_id, key in keys.items() if key in cached}
+    missing = [job_id for job_id in job_ids if job_id not in jobs]
+    if missing:
+        loaded = {job['id']: job for job in Job.objects.filter(pk__in=missing).values(*JOB_FIELDS)}
+        cache.set_many({keys[job_id]: loaded.get(job_id, MISSING) for job_id in missing}, JOB_TIMEOUT)
+        jobs.update(loaded)
+    jobs = {job_id: job for job_id, job in jobs.items() if job != MISSING}
+
+    bid_counts = dict(JobBidCount.objects.filter(pk__in=list(jobs)).values_list('job_id', 'count'))
+    results = []
+    for job_id in job_ids:
+        if job_id in jobs:
+            job = dict(jobs[job_id])
+            job['age'] = (today - job['created_at'].date()).days if job['created_at'] else None
+            job['bid_count'] = bid_counts.get(job_id, 0)
+            results.append(job)
+    return results
+
+
+def forget_jobs(job_ids):
+    keys = [JOB_KEY.format(job_id) for job_id in job_ids]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def forget_saved_job(sender, instance, **kwargs):
+    forget_jobs([instance.pk])
+
+
+@receiver(job_status_changed)
+def forget_job_status(sender, job_id, **kwargs):
+    forget_jobs([job_id])
+
+
+@receiver(jobs_bulk_status_changed)
+def forget_bulk_job_status(sender, job_ids, **kwargs):
+    forget_jobs(job_ids)
@@ -0,0 +1,49 @@
+"""Expiry of open jobs whose last date (`Job.duration`) has passed.
+
+`expire_jobs` moves such jobs to the expired status in bounded batches: each batch selects up to
+`EXPIRY_BATCH_SIZE` ids with a range scan of the partial `(duration, id)` index on open jobs, updates
+them with one `UPDATE ... WHERE id IN (...)` in its own short transaction and sends
+`jobs_bulk_status_changed`, so the counters, rollups and caches derived from open jobs are adjusted
+once per batch. Rows locked by a concurrent edit are skipped and picked up by the next run.
+`ExpireJobsTask` runs it from celery beat.
+
+Expired jobs stay in the job table, since bids, projects and ratings reference them; they drop out of
+the listings, which only read open jobs through the partial indexes on `status = 'open'`.
+"""
+import datetime
+
+from django.db import transaction
+
+from src.job.models import Job
+from src.job.signals import jobs_bulk_status_changed
+
+EXPIRY_BATCH_SIZE = 500
+
+
+def expire_batch(today, batch_size):
+    with transaction.atomic():
+        job_ids = list(
+            Job.objects.filter(status=Job.Status.OPEN, duration__lt=today)
+            .order_by('duration', 'id')
+            .select_for_update(skip_locked=True)
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if job_ids:
+            Job.objects.filter(pk__in=job_ids).update(status=Job.Status.EXPIRED)
+            jobs_bulk_status_changed.send(sender=Job, job_ids=job_ids, old_status=Job.Status.OPEN, new_status=Job.Status.EXPIRED)
+    return len(job_ids)
+
+
+def expire_jobs(today=None, batch_size=EXPIRY_BATCH_SIZE):
+    """Expire every open job whose last date is before `today`, batch by batch
+
+    Returns:
+        int: number of expired jobs
+    """
+    today = today or datetime.date.today()
+    expired = 0
+    while True:
+        count = expire_batch(today, batch_size)
+        expired += count
+        if count < batch_size:
+            return expired
@@ -0,0 +1,120 @@
+"""Facet counts for job search results.
+
+All facets of a result set are computed together and cached under the `jobs` cache namespace, whose
+version is bumped whenever a job, its skills or its project changes.
+"""
+import datetime
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from src.common.cache import bump_version, versioned_key
+from src.job.models import Category, Job, Project, Required_Skill
+from src.job.signals import jobs_bulk_created, jobs_bulk_status_changed
+
+JOBS_NAMESPACE = 'jobs'
+FACET_CACHE_TIMEOUT = 60 * 5
+MAX_SKILL_FACETS = 20
+
+BUDGET_BUCKETS = (
+    ('under_100', None, 100),
+    ('100_500', 100, 500),
+    ('500_1000', 500, 1000),
+    ('1000_5000', 1000, 5000),
+    ('5000_plus', 5000, None),
+)
+'''tuple: (label, lower bound inclusive, upper bound exclusive) of each budget facet'''
+
+DURATION_WINDOWS = (
+    ('within_7_days', 7),
+    ('within_30_days', 30),
+    ('within_90_days', 90),
+)
+'''tuple: (label, days) of the windows in which the last date of a job may fall'''
+
+
+def budget_filter(lower, upper):
+    condition = Q()
+    if lower is not None:
+        condition &= Q(budget__gte=lower)
+    if upper is not None:
+        condition &= Q(budget__lt=upper)
+    return condition
+
+
+def compute_facets(queryset, today=None):
+    """Count the jobs of a queryset per category, budget bucket, skill and duration window
+
+    The budget and duration facets come from a single conditional aggregation, categories and
+    skills from one grouped query each.
+
+    Args:
+        queryset (QuerySet): jobs to count, e.g. the filtered search results
+        today (date): reference date of the duration windows, defaults to today
+
+    Returns:
+        dict: facet name -> list of {'value', 'count'} entries
+    """
+    today = today or datetime.date.today()
+    queryset = queryset.order_by()
+
+    aggregates = {f'budget_{label}': Count('id', filter=budget_filter(lower, upper)) for label, lower, upper in BUDGET_BUCKETS}
+    for label, days in DURATION_WINDOWS:
+        window = Q(duration__gte=today, duration__lte=today + datetime.timedelta(days=days))
+        aggregates[f'duration_{label}'] = Count('id', filter=window)
+    aggregates['duration_later'] = Count('id', filter=Q(duration__gt=today + datetime.timedelta(days=DURATION_WINDOWS[-1][1])))
+    aggregates['duration_unspecified'] = Count('id', filter=Q(duration__isnull=True))
+    counts = queryset.aggregate(**aggregates)
+
+    categories = (
+        queryset.filter(category__isnull=False)
+        .values('category_id', 'category__category')
+        .annotate(count=Count('id'))
+        .order_by('-count', 'category__category')
+    )
+    skills = (
+        queryset.filter(skill__isnull=False)
+        .values('skill__skill')
+        .annotate(count=Count('id', distinct=True))
+        .order_by('-count', 'skill__skill')[:MAX_SKILL_FACETS]
+    )
+
+    durations = [label for label, _ in DURATION_WINDOWS] + ['later', 'unspecified']
+    return {
+        'category': [{'id': row['category_id'], 'value': row['category__category'], 'count': row['count']} for row in categories],
+        'budget': [{'value': label, 'count': counts[f'budget_{label}']} for label, _, _ in BUDGET_BUCKETS],
+        'skill': [{'value': row['skill__skill'], 'count': row['count']} for row in skills],
+        'duration': [{'value': label, 'count': counts[f'duration_{label}']} for label in durations],
+    }
+
+
+def get_facets(queryset, query_key):
+    """Return the facets of a search result set, cached until the jobs change
+
+    Args:
+        queryset (QuerySet): filtered jobs the facets are counted over
+        query_key (str): stable key of the search which produced the queryset
+    """
+    key = versioned_key(JOBS_NAMESPACE, 'facets', datetime.date.today().isoformat(), query_key)
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(queryset)
+        cache.set(key, facets, FACET_CACHE_TIMEOUT)
+    return facets
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Required_Skill)
+@receiver(m2m_changed, sender=Job.skill.through)
+@receiver(jobs_bulk_created)
+@receiver(jobs_bulk_status_changed)
+def invalidate_job_facets(sender, **kwargs):
+    if kwargs.get('action', 'post_').startswith('post_'):
+        transaction.on_commit(lambda: bump_version(JOBS_NAMESPACE))
@@ -0,0 +1,66 @@
+"""Live feed of the bids on a job for its employer, so the bid listings need not be fetched again.
+
+Every new bid, change to a bid and shortlist change is published, once the writing transaction commits,
+to the event stream of the job and to the event stream of its employer, see src.common.events. The
+`BidFeed` view serves either stream to polling clients.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from src.common import events
+from src.job.models import Bid, Job
+
+JOB_STREAM = 'feed:job:{}'
+EMPLOYER_STREAM = 'feed:employer:{}'
+
+BID_CREATED = 'bid.created'
+BID_UPDATED = 'bid.updated'
+BID_SHORTLISTED = 'bid.shortlisted'
+
+
+def bid_event(event_type, bid):
+    return {
+        'type': event_type,
+        'bid': {
+            'id': bid.pk,
+            'job': bid.job_id,
+            'job_seeker': bid.job_seeker_id,
+            'proposal': bid.proposal,
+            'amount': bid.amount,
+            'require_days': bid.require_days,
+            'milestone': bid.milestone,
+            'is_shortlisted': bid.is_shortlisted,
+            'created_at': bid.created_at,
+            'updated_at': bid.updated_at,
+        },
+    }
+
+
+def publish_bid_events(employer_id, event_type, bids):
+    """Publish an event for each bid once the current transaction commits"""
+    pending = [(JOB_STREAM.format(bid.job_id), bid_event(event_type, bid)) for bid in bids]
+
+    def publish():
+        for stream, event in pending:
+            events.publish([stream, EMPLOYER_STREAM.format(employer_id)], event)
+
+    transaction.on_commit(publish)
+
+
+def publish_shortlisted(job_id, bid_ids):
+    """Publish the bids of a job shortlisted by a bulk update, which sends no post_save signals"""
+    employer_id = Job.objects.filter(pk=job_id).values_list('employer_id', flat=True).first()
+    publish_bid_events(employer_id, BID_SHORTLISTED, Bid.objects.filter(job_id=job_id, pk__in=bid_ids))
+
+
+@receiver(post_save, sender=Bid)
+def publish_saved_bid(sender, instance, created, **kwargs):
+    if created:
+        event_type = BID_CREATED
+    elif instance.get_loaded_value('is_shortlisted') != instance.is_shortlisted:
+        event_type = BID_SHORTLISTED
+    else:
+        event_type = BID_UPDATED
+    employer_id = Job.objects.filter(pk=instance.job_id).values_list('employer_id', flat=True).first()
+    publish_bid_events(employer_id, event_type, [instance])
@@ -0,0 +1,197 @@
+"""Bulk import of jobs from CSV or NDJSON streams.
+
+Rows are read lazily from the stream and handled in batches: each batch is validated, its categories
+and skills are resolved with a few `IN` queries, and its jobs and skill links are written with
+`bulk_create` in one transaction. Invalid rows are reported with their row number and skipped, the
+other rows of the batch are still imported. A stream which cannot be decoded or parsed stops the import
+with `UnreadableImport`, the batches read before are kept. Receivers of `jobs_bulk_created` update the
+counters, rollups, facets and recommendations once per batch.
+"""
+import csv
+import itertools
+import json
+import logging
+
+from django.db import DatabaseError, transaction
+from rest_framework import serializers
+
+from src.job.models import Category, Job, required_skill_resolver
+from src.job.signals import jobs_bulk_created
+
+logger = logging.getLogger(__name__)
+
+CSV = 'csv'
+NDJSON = 'ndjson'
+FORMATS = (CSV, NDJSON)
+CONTENT_TYPES = {'text/csv': CSV, 'application/x-ndjson': NDJSON, 'application/jsonlines': NDJSON}
+
+BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+CSV_SKILL_SEPARATOR = ';'
+
+
+class JobImportSerializer(serializers.Serializer):
+    """This serializer validates one imported job row. The category is given by name and must exist,
+    the skills are a list of names (a `;` separated string in CSV) which are created when unknown.
+    Imported jobs have no requirement file.
+    """
+
+    name = serializers.CharField(max_length=30)
+    description = serializers.CharField(max_length=250)
+    category = serializers.CharField(required=False, allow_null=True, allow_blank=True)
+    budget = serializers.FloatField(min_value=0)
+    duration = serializers.DateField(required=False, allow_null=True)
+    is_draft = serializers.BooleanField(default=False)
+    skill = serializers.ListField(child=serializers.CharField(max_length=30), required=False, default=list)
+
+
+class InvalidRow(ValueError):
+    '''Placeholder yielded by the parsers for a row which could not be decoded'''
+
+
+class UnreadableImport(ValueError):
+    '''Raised when the stream is not text of the expected encoding or not valid CSV, `report` holds the rows
+    imported before'''
+
+    def __init__(self, message, report):
+        super().__init__(message)
+        self.report = report
+
+
+def parse_csv(lines):
+    """Yield the rows of a CSV stream with a header line as dicts, blank cells as missing values"""
+    for row in csv.DictReader(lines):
+        row = {key: value for key, value in row.items() if key and value not in (None, '')}
+        if isinstance(row.get('skill'), str):
+            row['skill'] = [skill for skill in row['skill'].split(CSV_SKILL_SEPARATOR) if skill.strip()]
+        yield row
+
+
+def parse_ndjson(lines):
+    """Yield the rows of a newline delimited JSON stream, skipping blank lines"""
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            yield InvalidRow(f'Invalid JSON: {error}')
+            continue
+        yield row if isinstance(row, dict) else InvalidRow('Expected a JSON object.')
+
+
+def parse_rows(lines, format):
+    """Parse an iterable of text lines in the given format, see `FORMATS`"""
+    return parse_csv(lines) if format == CSV else parse_ndjson(lines)
+
+
+def build_jobs(entries, employer, categories):
+    jobs = []
+    for _, data in entries:
+        is_draft = data['is_draft']
+        jobs.append(
+            Job(
+                name=data['name'],
+                description=data['description'],
+                category_id=categories.get(data.get('category')),
+                budget=data['budget'],
+                duration=data.get('duration'),
+                requirement='',
+                employer=employer,
+                is_draft=is_draft,
+                status=Job.Status.DRAFT if is_draft else Job.Status.OPEN,
+            )
+        )
+    return jobs
+
+
+def write_jobs(entries, employer, categories):
+    """Insert a batch of validated rows with their skill links in one transaction
+
+    Args:
+        entries (list): (row number, validated data) tuples
+        employer (Employer): owner of the imported jobs
+        categories (dict): category name -> id
+    """
+    skill_ids = required_skill_resolver.resolve(name for _, data in entries for name in data['skill'])
+    jobs = build_jobs(entries, employer, categories)
+    Link = Job.skill.through
+    with transaction.atomic():
+        Job.objects.bulk_create(jobs)
+        Link.objects.bulk_create(
+            Link(job_id=job.pk, required_skill_id=skill_id)
+            for job, (_, data) in zip(jobs, entries)
+            for skill_id in {skill_ids[name.strip()] for name in data['skill'] if name.strip()}
+        )
+        Job.objects.filter(pk__in=[job.pk for job in jobs]).update_search_vector()
+        jobs_bulk_created.send(sender=Job, jobs=jobs)
+    return jobs
+
+
+def add_error(report, row_number, errors):
+    report['failed'] += 1
+    if len(report['errors']) < MAX_REPORTED_ERRORS:
+        report['errors'].append({'row': row_number, 'errors': errors})
+
+
+def import_batch(batch, employer, report):
+    entries = []
+    for row_number, row in batch:
+        if isinstance(row, InvalidRow):
+            add_error(report, row_number, {'non_field_errors': [str(row)]})
+            continue
+        serializer = JobImportSerializer(data=row)
+        if serializer.is_valid():
+            entries.append((row_number, serializer.validated_data))
+        else:
+            add_error(report, row_number, serializer.errors)
+
+    names = {data['category'] for _, data in entries if data.get('category')}
+    categories = dict(Category.objects.filter(category__in=names).values_list('category', 'id')) if names else {}
+    valid = []
+    for row_number, data in entries:
+        if data.get('category') and data['category'] not in categories:
+            add_error(report, row_number, {'category': [f'Unknown category "{data["category"]}".']})
+        else:
+            valid.append((row_number, data))
+    if not valid:
+        return
+
+    try:
+        report['created'] += len(write_jobs(valid, employer, categories))
+    except DatabaseError:
+        # find the offending rows by writing the batch one row at a time
+        for entry in valid:
+            try:
+                report['created'] += len(write_jobs([entry], employer, categories))
+            except DatabaseError:
+                logger.warning('Could not import row %s', entry[0], exc_info=True)
+                add_error(report, entry[0], {'non_field_errors': ['This row could not be saved.']})
+
+
+def import_jobs(rows, employer, batch_size=BATCH_SIZE):
+    """Import jobs for an employer from parsed rows, see `parse_rows`
+
+    Args:
+        rows (iterable): dicts of job fields, consumed lazily
+        employer (Employer): owner of the imported jobs
+        batch_size (int): number of rows validated and written together
+
+    Returns:
+        dict: number of `created` and `failed` rows and the first `errors` by row number
+
+    Raises:
+        UnreadableImport: when the stream cannot be decoded or parsed
+    """
+    report = {'created': 0, 'failed': 0, 'errors': []}
+    numbered = enumerate(rows, start=1)
+    while True:
+        try:
+            batch = list(itertools.islice(numbered, batch_size))
+        except UnicodeDecodeError as error:
+            raise UnreadableImport(f'The file is not valid {error.encoding} text.', report)
+        except csv.Error as error:
+            raise UnreadableImport(f'The file is not valid CSV: {error}.', report)
+        if not batch:
+            return report
+        import_batch(batch, employer, report)
@@ -0,0 +1,41 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from src.employer.models import Employer
+from src.job import imports
+
+
+class Command(BaseCommand):
+    help = 'Import jobs of an employer from a CSV or NDJSON file, see src.job.imports for the row format'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='file to import, - to read standard input')
+        parser.add_argument('--employer', type=int, required=True, help='id of the employer owning the jobs')
+        parser.add_argument('--format', choices=imports.FORMATS, help='row format, guessed from the file extension by default')
+        parser.add_argument('--batch-size', type=int, default=imports.BATCH_SIZE, help='rows written per transaction')
+
+    def handle(self, path, employer, format, batch_size, **options):
+        try:
+            employer = Employer.objects.get(pk=employer)
+        except Employer.DoesNotExist:
+            raise CommandError(f'Employer {employer} does not exist.')
+
+        format = format or (imports.NDJSON if path.endswith(('.ndjson', '.jsonl')) else imports.CSV)
+        stream = sys.stdin if path == '-' else open(path, encoding='utf-8', newline='')
+        started = time.monotonic()
+        try:
+            report = imports.import_jobs(imports.parse_rows(stream, format), employer, batch_size=max(batch_size, 1))
+        except imports.UnreadableImport as error:
+            raise CommandError(f'{error} {error.report["created"]} jobs were imported before.')
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        elapsed = time.monotonic() - started
+
+        for error in report['errors']:
+            self.stderr.write(f'row {error["row"]}: {error["errors"]}')
+        self.stdout.write(
+            self.style.SUCCESS(f'Imported {report["created"]} jobs in {elapsed:.2f}s, {report["failed"]} rows failed.')
+        )
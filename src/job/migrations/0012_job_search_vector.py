@@ -0,0 +1,34 @@
+# Generated by Django 3.2.12 on 2026-10-18 12:41
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+from django.contrib.postgres.search import SearchVector
+
+
+def build_search_vectors(apps, schema_editor):
+    Job = apps.get_model('job', 'Job')
+    Job.objects.update(
+        search_vector=SearchVector('name', weight='A', config='english')
+        + SearchVector('description', weight='B', config='english')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0011_auto_20230215_1133'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='job_search_vector_gin'),
+        ),
+        migrations.RunPython(build_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.2.12 on 2026-10-18 12:43
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce, Now
+
+
+def fill_missing_created_at(apps, schema_editor):
+    # keyset pagination compares (created_at, id) rows, which needs created_at to be set
+    for model_name in ('Job', 'Bid'):
+        model = apps.get_model('job', model_name)
+        model.objects.filter(created_at__isnull=True).update(created_at=Coalesce('updated_at', Now()))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0012_job_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bid',
+            index=models.Index(fields=['created_at', 'id'], name='bid_created_at_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['created_at', 'id'], name='job_created_at_id_idx'),
+        ),
+        migrations.RunPython(fill_missing_created_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 3.2.12 on 2026-10-18 12:45
+
+from django.db import migrations, models
+from django.db.models import Case, Exists, OuterRef, Subquery, Value, When
+
+
+def fill_job_status(apps, schema_editor):
+    Job = apps.get_model('job', 'Job')
+    Project = apps.get_model('job', 'Project')
+
+    Job.objects.filter(is_draft=True).update(status='draft')
+    projects = Project.objects.filter(job=OuterRef('pk'))
+    latest_status = projects.order_by('-created_at', '-id').annotate(
+        job_status=Case(
+            When(is_finished=True, then=Value('finished')),
+            When(is_active=True, then=Value('in_progress')),
+            default=Value('awarded'),
+            output_field=models.CharField(),
+        )
+    )
+    Job.objects.filter(Exists(projects)).update(status=Subquery(latest_status.values('job_status')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0013_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='status',
+            field=models.CharField(choices=[('draft', 'Draft'), ('open', 'Open'), ('awarded', 'Awarded'), ('in_progress', 'In Progress'), ('finished', 'Finished')], default='open', editable=False, max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['created_at', 'id'], name='job_open_created_at_id_idx'),
+        ),
+        migrations.RunPython(fill_job_status, migrations.RunPython.noop),
+    ]
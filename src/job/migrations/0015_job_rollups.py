@@ -0,0 +1,52 @@
+# Generated by Django 3.2.12 on 2026-10-18 12:51
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def fill_rollups(apps, schema_editor):
+    Category = apps.get_model('job', 'Category')
+    Job = apps.get_model('job', 'Job')
+    CategoryJobCount = apps.get_model('job', 'CategoryJobCount')
+    JobBidCount = apps.get_model('job', 'JobBidCount')
+    CategoryJobCount.objects.bulk_create(
+        CategoryJobCount(category_id=category_id, count=count)
+        for category_id, count in Category.objects.annotate(count=Count('job')).values_list('id', 'count')
+    )
+    JobBidCount.objects.bulk_create(
+        JobBidCount(job_id=job_id, count=count) for job_id, count in Job.objects.annotate(count=Count('bid')).values_list('id', 'count')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0014_job_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryJobCount',
+            fields=[
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='job_count', serialize=False, to='job.category')),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='JobBidCount',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='bid_count', serialize=False, to='job.job')),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='jobbidcount',
+            index=models.Index(fields=['count'], name='job_bid_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='categoryjobcount',
+            index=models.Index(fields=['count'], name='category_job_count_idx'),
+        ),
+        migrations.RunPython(fill_rollups, migrations.RunPython.noop),
+    ]
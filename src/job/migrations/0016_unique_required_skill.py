@@ -0,0 +1,39 @@
+# Generated by Django 3.2.12 on 2026-10-18 12:56
+
+from django.db import migrations, models
+
+
+def merge_duplicate_required_skills(apps, schema_editor):
+    """Point the links of duplicate skill names at the oldest skill of that name and delete the duplicates"""
+    Required_Skill = apps.get_model('job', 'Required_Skill')
+    Through = apps.get_model('job', 'Job')._meta.get_field('skill').remote_field.through
+    kept = {}
+    duplicates = {}
+    for pk, name in Required_Skill.objects.order_by('id').values_list('id', 'skill'):
+        if name in kept:
+            duplicates[pk] = kept[name]
+        else:
+            kept[name] = pk
+    for duplicate, original in duplicates.items():
+        owner_ids = Through.objects.filter(required_skill_id=duplicate).values_list('job_id', flat=True)
+        Through.objects.bulk_create(
+            [Through(job_id=owner_id, required_skill_id=original) for owner_id in owner_ids], ignore_conflicts=True
+        )
+    Required_Skill.objects.filter(id__in=list(duplicates)).delete()
+
+
+class Migration(migrations.Migration):
+    # commit the merge before altering the table, postgres refuses to alter it with pending FK checks
+    atomic = False
+
+    dependencies = [
+        ('job', '0015_job_rollups'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_required_skills, migrations.RunPython.noop, atomic=True),
+        migrations.AddConstraint(
+            model_name='required_skill',
+            constraint=models.UniqueConstraint(fields=('skill',), name='unique_required_skill'),
+        ),
+    ]
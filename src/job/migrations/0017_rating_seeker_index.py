@@ -0,0 +1,17 @@
+# Generated by Django 3.2.12 on 2026-10-18 13:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0016_unique_required_skill'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['job_seeker', '-created_at'], name='rating_seeker_created_idx'),
+        ),
+    ]
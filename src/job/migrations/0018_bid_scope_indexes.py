@@ -0,0 +1,34 @@
+# Generated by Django 3.2.12 on 2026-10-18 13:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_seeker', '0008_seeker_reputation'),
+        ('job', '0017_rating_seeker_index'),
+    ]
+
+    operations = [
+        # create the composite indexes before dropping the single column foreign key indexes they replace
+        migrations.AddIndex(
+            model_name='bid',
+            index=models.Index(fields=['job', 'created_at', 'id'], name='bid_job_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bid',
+            index=models.Index(fields=['job_seeker', 'created_at', 'id'], name='bid_seeker_created_idx'),
+        ),
+        migrations.AlterField(
+            model_name='bid',
+            name='job',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='job.job'),
+        ),
+        migrations.AlterField(
+            model_name='bid',
+            name='job_seeker',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='job_seeker.job_seeker'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.12 on 2026-10-18 13:20
+
+from django.contrib.postgres.aggregates import BoolOr
+from django.db import migrations, models
+
+
+def merge_duplicate_bids(apps, schema_editor):
+    """Keep the latest bid of a job seeker on a job, shortlisted if any of their bids was, and delete the others"""
+    Bid = apps.get_model('job', 'Bid')
+    JobBidCount = apps.get_model('job', 'JobBidCount')
+    duplicates = (
+        Bid.objects.values('job_id', 'job_seeker_id')
+        .annotate(latest=models.Max('id'), count=models.Count('id'), shortlisted=BoolOr('is_shortlisted'))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        Bid.objects.filter(pk=duplicate['latest']).update(is_shortlisted=duplicate['shortlisted'])
+        Bid.objects.filter(job_id=duplicate['job_id'], job_seeker_id=duplicate['job_seeker_id']).exclude(
+            pk=duplicate['latest']
+        ).delete()
+        JobBidCount.objects.filter(pk=duplicate['job_id']).update(count=Bid.objects.filter(job_id=duplicate['job_id']).count())
+
+
+class Migration(migrations.Migration):
+    # commit the merge before altering the table, postgres refuses to alter it with pending FK checks
+    atomic = False
+
+    dependencies = [
+        ('job', '0018_bid_scope_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_bids, migrations.RunPython.noop, atomic=True),
+        migrations.AddConstraint(
+            model_name='bid',
+            constraint=models.UniqueConstraint(fields=('job', 'job_seeker'), name='unique_bid_per_job_seeker'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.12 on 2026-10-18 13:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0019_unique_bid_per_job_seeker'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='status',
+            field=models.CharField(
+                choices=[
+                    ('draft', 'Draft'),
+                    ('open', 'Open'),
+                    ('awarded', 'Awarded'),
+                    ('in_progress', 'In Progress'),
+                    ('finished', 'Finished'),
+                    ('expired', 'Expired'),
+                ],
+                default='open',
+                editable=False,
+                max_length=20,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['duration', 'id'], name='job_open_duration_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.12 on 2026-10-18 13:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0020_job_expiry'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='skill',
+            field=models.ManyToManyField(to='job.Required_Skill'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='is_active',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='is_finished',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='job',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_project', to='job.job'),
+        ),
+    ]
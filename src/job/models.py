@@ -1,9 +1,26 @@
-from django.db import models
+import datetime
+import threading
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import models, transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from src.common.models import LoadedValuesMixin
+from src.common.skills import SkillResolver
 from src.employer.models import Employer
+from src.job.signals import job_status_changed
 from src.job_seeker.models import Job_Seeker
 from src.users.models import TimeStampAbstractModel
 
+SEARCH_CONFIG = 'english'
+'''str: postgres text search configuration used for both the job documents and the search queries'''
+SEARCH_INDEXED_FIELDS = {'name', 'description'}
+
+_deleting_jobs = threading.local()
+
 
 # Create your models here.
 class Category(TimeStampAbstractModel):
@@ -16,15 +33,44 @@ class Required_Skill(TimeStampAbstractModel):
     '''This class is for skills set required to fullfill specific project'''
 
     skill = models.CharField(max_length=30)
-    '''CharField: for skill required for project'''
+    '''CharField: for skill required for project, unique so that names can be resolved in bulk'''
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['skill'], name='unique_required_skill')]
 
     def __str__(self) -> str:
         return self.skill
 
 
-class Job(TimeStampAbstractModel):
+required_skill_resolver = SkillResolver(Required_Skill)
+'''SkillResolver: resolves required skill names of jobs to Required_Skill ids'''
+
+
+class JobQuerySet(models.QuerySet):
+    '''QuerySet for jobs which knows how to maintain the full-text search document'''
+
+    def update_search_vector(self):
+        '''Rebuild the weighted search document of every job in the queryset with a single UPDATE.
+        Name matches are weighted A and description matches B, so names rank above descriptions.'''
+        return self.update(
+            search_vector=SearchVector('name', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+        )
+
+
+class Job(LoadedValuesMixin, TimeStampAbstractModel):
     '''This class for add jobs by employer'''
 
+    class Status(models.TextChoices):
+        '''Lifecycle of a job, from draft until the project on it is finished'''
+
+        DRAFT = 'draft'
+        OPEN = 'open'
+        AWARDED = 'awarded'
+        IN_PROGRESS = 'in_progress'
+        FINISHED = 'finished'
+        EXPIRED = 'expired'
+
     name = models.CharField(max_length=30)
     '''CharField: for name of project'''
     description = models.CharField(max_length=250)
@@ -41,13 +87,28 @@ class Job(TimeStampAbstractModel):
     '''ForeginKey: for which employer add the project'''
     is_draft = models.BooleanField(default=False)
     '''BooleanField: for status of project to save as draft'''
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.OPEN, editable=False)
+    '''CharField: denormalized lifecycle status, kept in sync with is_draft and the project on the job'''
     skill = models.ManyToManyField(Required_Skill)
+    search_vector = SearchVectorField(null=True, editable=False)
+    '''SearchVectorField: weighted full-text document of name and description, backed by a GIN index'''
+
+    objects = JobQuerySet.as_manager()
+    tracked_fields = ('status', 'category_id')
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='job_search_vector_gin'),
+            models.Index(fields=['created_at', 'id'], name='job_created_at_id_idx'),
+            models.Index(fields=['created_at', 'id'], name='job_open_created_at_id_idx', condition=Q(status='open')),
+            models.Index(fields=['duration', 'id'], name='job_open_duration_idx', condition=Q(status='open')),
+        ]
 
     def __str__(self) -> str:
         return self.name
 
 
-class Project(TimeStampAbstractModel):
+class Project(LoadedValuesMixin, TimeStampAbstractModel):
     '''This class for Project status'''
 
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='job_project')
@@ -61,18 +122,50 @@ class Project(TimeStampAbstractModel):
     is_finished = models.BooleanField(default=False)
     '''BooleanField: for status of project is finished or not'''
 
+    tracked_fields = ('is_active', 'is_finished')
 
-class Bid(TimeStampAbstractModel):
-    '''This class is for record of job_seekers who wants to do specific job'''
+    @property
+    def is_running(self):
+        '''bool: whether the project is active and not finished yet'''
+        return self.is_active and not self.is_finished
 
-    job = models.ForeignKey(Job, on_delete=models.CASCADE)
-    '''ForeignKey: for specific project'''
+    def get_job_status(self):
+        '''Return the lifecycle status this project puts its job in'''
+        if self.is_finished:
+            return Job.Status.FINISHED
+        if self.is_active:
+            return Job.Status.IN_PROGRESS
+        return Job.Status.AWARDED
+
+
+class BidQuerySet(models.QuerySet):
+    '''QuerySet for bids which knows how to submit a job seeker's single bid on a job'''
+
+    def submit(self, job, job_seeker, **fields):
+        '''Create the bid of a job seeker on a job, or update it when they already bid on that job.
+        The bid row is locked while it is compared and updated, and an unchanged resubmission is not
+        saved at all. Returns a (bid, created) tuple like `get_or_create`.'''
+        with transaction.atomic():
+            bid, created = self.select_for_update().get_or_create(job=job, job_seeker=job_seeker, defaults=fields)
+            changed = [name for name, value in fields.items() if getattr(bid, name) != value]
+            if not created and changed:
+                for name in changed:
+                    setattr(bid, name, fields[name])
+                bid.save(update_fields=changed + ['updated_at'])
+        return bid, created
+
+
+class Bid(LoadedValuesMixin, TimeStampAbstractModel):
+    '''This class is for record of job_seekers who wants to do specific job, a job seeker has one bid per job'''
+
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, db_index=False)
+    '''ForeignKey: for specific project, indexed by the composite bid_job_created_idx'''
     proposal = models.CharField(max_length=150)
     '''CharField: for proposal given by job_seeker to project'''
     amount = models.FloatField()
     '''FloatField: for job_seeker biding amount'''
-    job_seeker = models.ForeignKey(Job_Seeker, on_delete=models.CASCADE)
-    '''ForeignKey: for specify job_seeker'''
+    job_seeker = models.ForeignKey(Job_Seeker, on_delete=models.CASCADE, db_index=False)
+    '''ForeignKey: for specify job_seeker, indexed by the composite bid_seeker_created_idx'''
     require_days = models.IntegerField()
     '''IntegerField: for number of days to complete the project assigned by job seeker'''
     milestone = models.CharField(max_length=300)
@@ -80,8 +173,22 @@ class Bid(TimeStampAbstractModel):
     is_shortlisted = models.BooleanField(default=False)
     '''BooleanField: for status of shortlisted job seeker by employer'''
 
+    tracked_fields = ('job_id', 'is_shortlisted')
+
+    objects = BidQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'job_seeker'], name='unique_bid_per_job_seeker'),
+        ]
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='bid_created_at_id_idx'),
+            models.Index(fields=['job', 'created_at', 'id'], name='bid_job_created_idx'),
+            models.Index(fields=['job_seeker', 'created_at', 'id'], name='bid_seeker_created_idx'),
+        ]
 
-class Rating(TimeStampAbstractModel):
+
+class Rating(LoadedValuesMixin, TimeStampAbstractModel):
     """This is a Django model definition for a Rating model.
     The Rating model inherits from a custom abstract model named TimeStampAbstractModel,
     which presumably adds timestamp fields for created and modified dates to the Rating model.
@@ -101,3 +208,103 @@ class Rating(TimeStampAbstractModel):
     feedback = models.CharField(max_length=250, null=True, blank=True)
     '''feedback: A string field with a maximum length of 250 characters, representing any feedback or comments the
     employer may have provided along with the rating. This field is optional, as it allows null and blank values.'''
+
+    tracked_fields = ('job_seeker_id', 'rating', 'feedback')
+
+    class Meta:
+        indexes = [models.Index(fields=['job_seeker', '-created_at'], name='rating_seeker_created_idx')]
+
+
+class CategoryJobCount(models.Model):
+    '''This class is the rollup of the number of jobs in each category'''
+
+    category = models.OneToOneField(Category, on_delete=models.CASCADE, primary_key=True, related_name='job_count')
+    '''OneToOneField: the counted category'''
+    count = models.IntegerField(default=0)
+    '''IntegerField: number of jobs in the category'''
+
+    class Meta:
+        indexes = [models.Index(fields=['count'], name='category_job_count_idx')]
+
+
+class JobBidCount(models.Model):
+    '''This class is the rollup of the number of bids on each job'''
+
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name='bid_count')
+    '''OneToOneField: the counted job'''
+    count = models.IntegerField(default=0)
+    '''IntegerField: number of bids on the job'''
+
+    class Meta:
+        indexes = [models.Index(fields=['count'], name='job_bid_count_idx')]
+
+
+@receiver(post_save, sender=Job)
+def update_job_search_vector(sender, instance, update_fields=None, **kwargs):
+    """Keep the search document in sync whenever the name or description of a job is written"""
+    if update_fields is not None and not SEARCH_INDEXED_FIELDS.intersection(update_fields):
+        return
+    Job.objects.filter(pk=instance.pk).update_search_vector()
+
+
+@receiver(pre_save, sender=Job)
+def sync_job_draft_status(sender, instance, **kwargs):
+    """Move a job between draft and open with its is_draft flag, as long as nobody was assigned to it.
+    An expired job whose last date was moved to today or later is reopened."""
+    if instance.status == Job.Status.EXPIRED and instance.duration is not None and instance.duration < datetime.date.today():
+        return
+    if instance.status in (Job.Status.DRAFT, Job.Status.OPEN, Job.Status.EXPIRED):
+        instance.status = Job.Status.DRAFT if instance.is_draft else Job.Status.OPEN
+
+
+@receiver(post_save, sender=Job)
+def send_job_status_changed(sender, instance, created, **kwargs):
+    old_status = None if created else instance.get_loaded_value('status')
+    if old_status != instance.status:
+        job_status_changed.send(sender=Job, job_id=instance.pk, old_status=old_status, new_status=instance.status)
+
+
+def set_job_status(job_id, status=None):
+    """Update the status of a job without loading the whole row and send job_status_changed if it
+    changed. Without a status the job goes back to draft or open, following its is_draft flag."""
+    job = Job.objects.filter(pk=job_id).values('status', 'is_draft').first()
+    if job is None:
+        return
+    if status is None:
+        status = Job.Status.DRAFT if job['is_draft'] else Job.Status.OPEN
+    if job['status'] != status:
+        Job.objects.filter(pk=job_id).update(status=status)
+        job_status_changed.send(sender=Job, job_id=job_id, old_status=job['status'], new_status=status)
+
+
+@receiver(post_save, sender=Project)
+def sync_job_status_on_project_save(sender, instance, **kwargs):
+    """Mark the job awarded, in progress or finished as the project on it is created or updated"""
+    set_job_status(instance.job_id, instance.get_job_status())
+
+
+@receiver(pre_delete, sender=Job)
+def mark_job_deleting(sender, instance, **kwargs):
+    if not hasattr(_deleting_jobs, 'ids'):
+        _deleting_jobs.ids = set()
+    _deleting_jobs.ids.add(instance.pk)
+
+
+@receiver(post_delete, sender=Job)
+def unmark_job_deleting(sender, instance, **kwargs):
+    _deleting_jobs.ids.discard(instance.pk)
+
+
+def is_job_deleting(job_id):
+    '''Whether the job is being deleted in this thread, so that the rows deleted along with it can skip their
+    per row bookkeeping'''
+    return job_id in getattr(_deleting_jobs, 'ids', ())
+
+
+@receiver(post_delete, sender=Project)
+def sync_job_status_on_project_delete(sender, instance, **kwargs):
+    """Fall back to the status of the latest remaining project, or reopen the job when none is left"""
+    if is_job_deleting(instance.job_id):
+        return
+    project = Project.objects.filter(job_id=instance.job_id).order_by('-created_at', '-id').first()
+    set_job_status(instance.job_id, project.get_job_status() if project is not None else None)
@@ -0,0 +1,197 @@
+"""Ranking of the bids on a job, to help employers build their shortlist.
+
+Each bid gets a score between 0 and 1 from four components:
+
+* price: the bid amount against the job budget, 1 at or under budget
+* time: the days the seeker needs against the days left until the last date of the job
+* rating: the seeker's average rating (out of `MAX_RATING`) from their reputation, neutral when never rated
+* skills: the share of the job's required skills the seeker has
+
+The features of all bids on a job are loaded with a handful of queries and cached together with the
+ranked (score, bid id) list. A new or changed bid is scored on its own and merged into the cached
+ranking; changes to the job, its skills or a bidder's ratings and skills drop the cached ranking. Deleting
+a job drops its ranking once, instead of rescoring it for every bid deleted along with the job.
+"""
+import bisect
+import datetime
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from src.job.models import Bid, Job, JobBidCount, Rating, is_job_deleting
+from src.job.recommendations import normalize_skill
+from src.job_seeker.models import Job_Seeker, SeekerReputation
+
+RANKING_KEY = 'bids:ranking:{}'
+RANKING_TIMEOUT = 60 * 60 * 24
+
+MAX_RATING = 5.0
+WEIGHTS = {'price': 0.35, 'time': 0.2, 'rating': 0.25, 'skills': 0.2}
+'''dict: weight of each score component, the weights add up to 1'''
+
+
+def get_job_features(job_id):
+    job = Job.objects.filter(pk=job_id).values_list('budget', 'duration').first()
+    if job is None:
+        return None
+    skills = frozenset(
+        normalize_skill(skill)
+        for skill in Job.skill.through.objects.filter(job_id=job_id).values_list('required_skill__skill', flat=True)
+    )
+    return job + (skills,)
+
+
+def get_bid_features(bids, job_skills):
+    """Load the features of bids, given as a Bid queryset, with three queries
+
+    Returns:
+        dict: bid id -> (amount, require_days, job seeker id, average rating or None, skill overlap)
+    """
+    rows = list(bids.values_list('id', 'amount', 'require_days', 'job_seeker_id'))
+    seekers = bids.values('job_seeker_id')
+    ratings = dict(
+        SeekerReputation.objects.filter(job_seeker_id__in=seekers, rating_count__gt=0).values_list('job_seeker_id', 'rating_mean')
+    )
+    overlap = {}
+    if job_skills:
+        links = Job_Seeker.skill.through.objects.filter(job_seeker_id__in=seekers).values_list('job_seeker_id', 'skill__skill')
+        for seeker_id, skill in links:
+            if normalize_skill(skill) in job_skills:
+                overlap[seeker_id] = overlap.get(seeker_id, 0) + 1
+    return {
+        bid_id: (amount, require_days, seeker_id, ratings.get(seeker_id), overlap.get(seeker_id, 0))
+        for bid_id, amount, require_days, seeker_id in rows
+    }
+
+
+def score_bid(features, budget, days_left, skill_count):
+    """Score one bid from its features, see the module docstring
+
+    Returns:
+        tuple: (score, components dict)
+    """
+    amount, require_days, _, rating, overlap = features
+    components = {
+        'price': 1.0 if amount <= budget else (budget / amount if budget > 0 else 0.0),
+        'time': 1.0 if days_left is None or require_days <= days_left else max(days_left, 0) / max(require_days, 1),
+        'rating': 0.5 if rating is None else min(max(rating / MAX_RATING, 0.0), 1.0),
+        'skills': overlap / skill_count if skill_count else 1.0,
+    }
+    return sum(WEIGHTS[name] * value for name, value in components.items()), components
+
+
+def rank(job, features, today):
+    """Score every bid of a job in one pass
+
+    Returns:
+        list: (negated score, bid id) tuples sorted best first
+    """
+    budget, duration, skills = job
+    days_left = (duration - today).days if duration else None
+    return sorted((-score_bid(bid, budget, days_left, len(skills))[0], bid_id) for bid_id, bid in features.items())
+
+
+def build_ranking(job_id, today):
+    job = get_job_features(job_id)
+    if job is None:
+        return None
+    features = get_bid_features(Bid.objects.filter(job_id=job_id), job[2])
+    return {'date': today, 'job': job, 'features': features, 'ranked': rank(job, features, today)}
+
+
+def get_ranking(job_id):
+    """Return the cached ranking of the bids on a job, rebuilding it when missing or out of date
+
+    The ranking is rescored in memory when the day changed, and rebuilt from the database when its
+    number of bids does not match the bids per job rollup (e.g. after two bids raced to update it).
+    """
+    today = datetime.date.today()
+    key = RANKING_KEY.format(job_id)
+    ranking = cache.get(key)
+    bid_count = JobBidCount.objects.filter(pk=job_id).values_list('count', flat=True).first()
+    if ranking is None or (bid_count is not None and bid_count != len(ranking['features'])):
+        ranking = build_ranking(job_id, today)
+    elif ranking['date'] != today:
+        ranking.update(date=today, ranked=rank(ranking['job'], ranking['features'], today))
+    else:
+        return ranking
+    if ranking is not None:
+        cache.set(key, ranking, RANKING_TIMEOUT)
+    return ranking
+
+
+def score_components(ranking, bid_id):
+    budget, duration, skills = ranking['job']
+    days_left = (duration - ranking['date']).days if duration else None
+    return score_bid(ranking['features'][bid_id], budget, days_left, len(skills))
+
+
+def update_ranked_bid(job_id, bid_id):
+    """Rescore a single new, changed or deleted bid in the cached ranking of its job"""
+    key = RANKING_KEY.format(job_id)
+    ranking = cache.get(key)
+    if ranking is None:
+        return
+
+    if bid_id in ranking['features']:
+        ranking['ranked'].remove((-score_components(ranking, bid_id)[0], bid_id))
+        del ranking['features'][bid_id]
+    ranking['features'].update(get_bid_features(Bid.objects.filter(pk=bid_id, job_id=job_id), ranking['job'][2]))
+    if bid_id in ranking['features']:
+        bisect.insort(ranking['ranked'], (-score_components(ranking, bid_id)[0], bid_id))
+    cache.set(key, ranking, RANKING_TIMEOUT)
+
+
+def forget_rankings(job_ids):
+    job_ids = list(job_ids)
+    transaction.on_commit(lambda: cache.delete_many([RANKING_KEY.format(job_id) for job_id in job_ids]))
+
+
+def forget_seeker_rankings(job_seeker_id):
+    forget_rankings(Bid.objects.filter(job_seeker_id=job_seeker_id).values_list('job_id', flat=True).distinct())
+
+
+@receiver(post_save, sender=Bid)
+def rerank_bid(sender, instance, **kwargs):
+    bid_id, job_ids = instance.pk, {instance.job_id, instance.get_loaded_value('job_id')} - {None}
+    transaction.on_commit(lambda: [update_ranked_bid(job_id, bid_id) for job_id in job_ids])
+
+
+@receiver(post_delete, sender=Bid)
+def rerank_deleted_bid(sender, instance, **kwargs):
+    # the ranking of a deleted job is dropped once by forget_deleted_job_ranking
+    if not is_job_deleting(instance.job_id):
+        rerank_bid(sender, instance, **kwargs)
+
+
+@receiver(post_save, sender=Job)
+def forget_job_ranking(sender, instance, created, **kwargs):
+    if not created:
+        forget_rankings([instance.pk])
+
+
+@receiver(post_delete, sender=Job)
+def forget_deleted_job_ranking(sender, instance, **kwargs):
+    forget_rankings([instance.pk])
+
+
+@receiver(m2m_changed, sender=Job.skill.through)
+def forget_job_skills_ranking(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        forget_rankings((pk_set or []) if reverse else [instance.pk])
+
+
+@receiver(post_save, sender=Rating)
+@receiver(post_delete, sender=Rating)
+def forget_rated_seeker_rankings(sender, instance, **kwargs):
+    forget_seeker_rankings(instance.job_seeker_id)
+
+
+@receiver(m2m_changed, sender=Job_Seeker.skill.through)
+def forget_seeker_skills_rankings(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    for job_seeker_id in (pk_set or []) if reverse else [instance.pk]:
+        forget_seeker_rankings(job_seeker_id)
@@ -0,0 +1,321 @@
+"""Skill-match job recommendations for job seekers.
+
+Open jobs are kept in an inverted index in the cache: one posting set of job ids per normalized skill
+name plus a small document per job holding its skill set, creation time and budget. A seeker's top
+jobs are scored from those entries alone, without touching the M2M tables per request. The index is
+updated per job through signals and rebuilt in full by `RebuildRecommendationIndexTask`. Writers of the
+index take a lock in the cache, so that concurrent updates of a shared posting set do not overwrite each
+other, and the keys of the index are listed under `KEYS_KEY` so that a rebuild drops the stale ones.
+
+Requests never build the index: while it is missing, a rebuild is queued (once per `QUEUED_TIMEOUT`) and
+the candidates are read from the database instead, the newest `FALLBACK_CANDIDATES` open jobs sharing a
+skill with the seeker.
+"""
+import contextlib
+import heapq
+import math
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.functions import Lower, Trim
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from src.common.cache import CacheUnavailable, cache_lock
+from src.job.models import Job, Project, Required_Skill
+from src.job.signals import jobs_bulk_created, jobs_bulk_status_changed
+from src.job_seeker.models import Job_Seeker, Skill
+
+SKILL_KEY = 'recommendations:skill:{}'
+JOB_KEY = 'recommendations:job:{}'
+SEEKER_KEY = 'recommendations:seeker:{}'
+READY_KEY = 'recommendations:ready'
+LOCK_KEY = 'recommendations:lock'
+KEYS_KEY = 'recommendations:keys'
+'''str: (skills, job ids) having a posting set or document in the index'''
+QUEUED_KEY = 'recommendations:queued'
+QUEUED_TIMEOUT = 60
+'''int: seconds before a read of the missing index queues another rebuild'''
+FALLBACK_CANDIDATES = 500
+
+SKILL_WEIGHT = 0.7
+RECENCY_WEIGHT = 0.2
+BUDGET_WEIGHT = 0.1
+RECENCY_HALF_LIFE_DAYS = 14
+
+
+def normalize_skill(name):
+    return name.strip().lower()
+
+
+def load_documents(job_ids=None):
+    """Read the index documents of the open jobs (of `job_ids`, all of them by default) with two queries
+
+    Returns:
+        dict: job id -> (skills, created timestamp, budget)
+    """
+    jobs = Job.objects.filter(status=Job.Status.OPEN)
+    if job_ids is not None:
+        jobs = jobs.filter(pk__in=job_ids)
+    documents = {
+        job_id: (set(), created_at.timestamp() if created_at else 0.0, budget)
+        for job_id, created_at, budget in jobs.values_list('id', 'created_at', 'budget')
+    }
+    links = Job.skill.through.objects.filter(job_id__in=jobs.values('id')).values_list('job_id', 'required_skill__skill')
+    for job_id, skill in links:
+        documents[job_id][0].add(normalize_skill(skill))
+    return {job_id: (frozenset(skills), created, budget) for job_id, (skills, created, budget) in documents.items()}
+
+
+@contextlib.contextmanager
+def index_lock():
+    """Serialize the writers of the index, yields whether the lock was acquired
+
+    A writer which cannot get the lock drops the index instead of skipping its change, so that the next
+    read rebuilds it.
+    """
+    with cache_lock(LOCK_KEY) as acquired:
+        if not acquired:
+            cache.delete(READY_KEY)
+        yield acquired
+
+
+def rebuild_index(if_missing=False):
+    """Rebuild the whole index from the database with two queries, dropping the entries of the old one
+
+    Args:
+        if_missing (bool): skip the rebuild if the index was built while waiting for the lock
+    """
+    with index_lock() as acquired:
+        if not acquired or (if_missing and cache.get(READY_KEY)):
+            return
+        documents = load_documents()
+        postings = {}
+        for job_id, (skills, _, _) in documents.items():
+            for skill in skills:
+                postings.setdefault(skill, set()).add(job_id)
+
+        old_skills, old_job_ids = cache.get(KEYS_KEY, (frozenset(), frozenset()))
+        stale = [SKILL_KEY.format(skill) for skill in old_skills - set(postings)]
+        stale += [JOB_KEY.format(job_id) for job_id in old_job_ids - set(documents)]
+        cache.delete_many(stale)
+
+        entries = {SKILL_KEY.format(skill): job_ids for skill, job_ids in postings.items()}
+        entries.update((JOB_KEY.format(job_id), document) for job_id, document in documents.items())
+        entries[KEYS_KEY] = (frozenset(postings), frozenset(documents))
+        entries[READY_KEY] = True
+        cache.set_many(entries, timeout=None)
+        cache.delete(QUEUED_KEY)
+
+
+def queue_rebuild():
+    from src.job.tasks import rebuild_recommendation_index_task
+
+    rebuild_recommendation_index_task.delay(if_missing=True)
+
+
+def ensure_index():
+    """Return whether the index is ready, queueing a rebuild when it is not"""
+    if cache.get(READY_KEY):
+        return True
+    try:
+        queued = cache.add(QUEUED_KEY, True, QUEUED_TIMEOUT)
+    except CacheUnavailable:
+        # the index could not be stored anyway
+        return False
+    if queued:
+        queue_rebuild()
+    return False
+
+
+def update_index(job_ids, documents):
+    """Replace the entries of `job_ids` in the index with `documents` (job id -> document, missing for
+    jobs to remove), the index lock must be held"""
+    job_ids = set(job_ids)
+    old_documents = cache.get_many([JOB_KEY.format(job_id) for job_id in job_ids])
+    skills = {skill for document in old_documents.values() for skill in document[0]}
+    skills |= {skill for document in documents.values() for skill in document[0]}
+    postings = cache.get_many([SKILL_KEY.format(skill) for skill in skills])
+    for skill in skills:
+        postings[SKILL_KEY.format(skill)] = postings.get(SKILL_KEY.format(skill), set()) - job_ids
+    for job_id, (job_skills, _, _) in documents.items():
+        for skill in job_skills:
+            postings[SKILL_KEY.format(skill)].add(job_id)
+
+    old_skills, old_job_ids = cache.get(KEYS_KEY, (frozenset(), frozenset()))
+    empty = {skill for skill in skills if not postings[SKILL_KEY.format(skill)]}
+    keys = ((old_skills | skills) - empty, (old_job_ids - job_ids) | set(documents))
+    cache.delete_many(
+        [SKILL_KEY.format(skill) for skill in empty] + [JOB_KEY.format(job_id) for job_id in job_ids - set(documents)]
+    )
+    entries = {key: ids for key, ids in postings.items() if ids}
+    entries.update((JOB_KEY.format(job_id), document) for job_id, document in documents.items())
+    if keys != (old_skills, old_job_ids):
+        entries[KEYS_KEY] = keys
+    cache.set_many(entries, timeout=None)
+
+
+def index_jobs(job_ids):
+    """Re-index jobs after they were created or their status, budget or skills changed"""
+    if not cache.get(READY_KEY):
+        return
+    with index_lock() as acquired:
+        if acquired:
+            update_index(job_ids, load_documents(job_ids))
+
+
+def unindex_jobs(job_ids):
+    if not cache.get(READY_KEY):
+        return
+    with index_lock() as acquired:
+        if acquired:
+            update_index(job_ids, {})
+
+
+def get_seeker_skills(job_seeker_id):
+    key = SEEKER_KEY.format(job_seeker_id)
+    skills = cache.get(key)
+    if skills is None:
+        skills = frozenset(
+            normalize_skill(skill) for skill in Skill.objects.filter(job_seeker=job_seeker_id).values_list('skill', flat=True)
+        )
+        cache.set(key, skills, timeout=None)
+    return skills
+
+
+def score_jobs(seeker_skills, documents, now):
+    """Score candidate jobs by skill Jaccard similarity, recency and relative budget
+
+    Args:
+        seeker_skills (frozenset): normalized skills of the job seeker
+        documents (dict): job id -> (skills, created timestamp, budget)
+        now (float): current timestamp
+
+    Returns:
+        dict: job id -> score between 0 and 1
+    """
+    max_budget = math.log1p(max((max(budget, 0) for _, _, budget in documents.values()), default=0)) or 1.0
+    scores = {}
+    for job_id, (skills, created, budget) in documents.items():
+        jaccard = len(seeker_skills & skills) / len(seeker_skills | skills)
+        age_days = max(now - created, 0) / 86400
+        recency = 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+        scores[job_id] = (
+            SKILL_WEIGHT * jaccard + RECENCY_WEIGHT * recency + BUDGET_WEIGHT * math.log1p(max(budget, 0)) / max_budget
+        )
+    return scores
+
+
+def load_fallback_documents(seeker_skills):
+    """Read the documents of the newest open jobs sharing a skill with the seeker, while the index is missing"""
+    links = Job.skill.through.objects.annotate(name=Lower(Trim('required_skill__skill'))).filter(name__in=seeker_skills)
+    jobs = Job.objects.filter(status=Job.Status.OPEN, pk__in=links.values('job_id')).order_by('-created_at')
+    return load_documents(list(jobs.values_list('id', flat=True)[:FALLBACK_CANDIDATES]))
+
+
+def recommend_jobs(job_seeker_id, limit):
+    """Return the `limit` best matching open job ids for a job seeker, best first
+
+    Returns:
+        list: (job id, score) tuples
+    """
+    seeker_skills = get_seeker_skills(job_seeker_id)
+    if not seeker_skills:
+        return []
+    if not ensure_index():
+        scores = score_jobs(seeker_skills, load_fallback_documents(seeker_skills), timezone.now().timestamp())
+        return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+
+    candidates = set()
+    for job_ids in cache.get_many([SKILL_KEY.format(skill) for skill in seeker_skills]).values():
+        candidates |= job_ids
+    documents = cache.get_many([JOB_KEY.format(job_id) for job_id in candidates])
+    documents = {int(key.rsplit(':', 1)[1]): document for key, document in documents.items()}
+    # drop the jobs closed since they were indexed before taking the best ones, so none are missing
+    open_jobs = set(Job.objects.filter(pk__in=list(documents), status=Job.Status.OPEN).values_list('id', flat=True))
+    documents = {job_id: document for job_id, document in documents.items() if job_id in open_jobs}
+
+    scores = score_jobs(seeker_skills, documents, timezone.now().timestamp())
+    return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+
+
+def _reindex_on_commit(job_ids):
+    transaction.on_commit(lambda: index_jobs(job_ids))
+
+
+@receiver(post_save, sender=Job)
+def reindex_saved_job(sender, instance, **kwargs):
+    _reindex_on_commit([instance.pk])
+
+
+@receiver(jobs_bulk_created)
+def index_bulk_created_jobs(sender, jobs, **kwargs):
+    job_ids = [job.pk for job in jobs if job.status == Job.Status.OPEN]
+    transaction.on_commit(lambda: index_jobs(job_ids))
+
+
+@receiver(jobs_bulk_status_changed)
+def reindex_bulk_status_changed_jobs(sender, job_ids, new_status, **kwargs):
+    job_ids = list(job_ids)
+    if new_status == Job.Status.OPEN:
+        transaction.on_commit(lambda: index_jobs(job_ids))
+    else:
+        transaction.on_commit(lambda: unindex_jobs(job_ids))
+
+
+@receiver(post_delete, sender=Job)
+def unindex_deleted_job(sender, instance, **kwargs):
+    job_id = instance.pk
+    transaction.on_commit(lambda: unindex_jobs([job_id]))
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def reindex_project_job(sender, instance, **kwargs):
+    _reindex_on_commit([instance.job_id])
+
+
+@receiver(m2m_changed, sender=Job.skill.through)
+def reindex_job_skills(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # post_clear of a skill has no pk_set, remember its jobs while they are still linked
+        instance._cleared_job_ids = list(instance.job_set.values_list('id', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        _reindex_on_commit([instance.pk])
+    elif action == 'post_clear':
+        _reindex_on_commit(instance.__dict__.pop('_cleared_job_ids', []))
+    elif pk_set:
+        _reindex_on_commit(list(pk_set))
+
+
+@receiver(post_save, sender=Required_Skill)
+def reindex_renamed_required_skill(sender, instance, created, **kwargs):
+    if not created:
+        _reindex_on_commit(list(instance.job_set.values_list('id', flat=True)))
+
+
+@receiver(m2m_changed, sender=Job_Seeker.skill.through)
+def forget_seeker_skills(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        instance._cleared_seeker_ids = list(instance.job_seeker_set.values_list('id', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        seeker_ids = [instance.pk]
+    elif action == 'post_clear':
+        seeker_ids = instance.__dict__.pop('_cleared_seeker_ids', [])
+    else:
+        seeker_ids = pk_set
+    cache.delete_many([SEEKER_KEY.format(seeker_id) for seeker_id in seeker_ids])
+
+
+@receiver(post_save, sender=Skill)
+def forget_renamed_skill(sender, instance, created, **kwargs):
+    if not created:
+        seeker_ids = instance.job_seeker_set.values_list('id', flat=True)
+        cache.delete_many([SEEKER_KEY.format(seeker_id) for seeker_id in seeker_ids])
@@ -0,0 +1,89 @@
+"""Rollup tables of jobs per category and bids per job.
+
+A rollup row is created along with its category or job, then adjusted with `UPDATE ... SET count = count + n`
+when jobs and bids are inserted, moved or deleted, once the writing transaction commits.
+`ReconcileRollupsTask` rebuilds both tables from the source tables to correct any drift. Changes to the
+category rollup (and category names) move `CATEGORY_COUNTS_NAMESPACE` to a new version, which drops the
+cached responses of the category counts endpoint.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from src.common.cache import bump_version
+from src.job.models import Bid, Category, CategoryJobCount, Job, JobBidCount
+from src.job.signals import jobs_bulk_created
+
+CATEGORY_COUNTS_NAMESPACE = 'category-counts'
+
+
+def apply_delta(rollup, key, delta):
+    rollup.objects.filter(pk=key).update(count=F('count') + delta)
+    if rollup is CategoryJobCount:
+        bump_version(CATEGORY_COUNTS_NAMESPACE)
+
+
+def adjust(rollup, key, delta):
+    if key is not None and delta:
+        transaction.on_commit(lambda: apply_delta(rollup, key, delta))
+
+
+def move(rollup, old_key, new_key):
+    if old_key != new_key:
+        adjust(rollup, old_key, -1)
+        adjust(rollup, new_key, 1)
+
+
+def reconcile():
+    """Rebuild both rollup tables from the category, job and bid tables"""
+    with transaction.atomic():
+        CategoryJobCount.objects.all().delete()
+        CategoryJobCount.objects.bulk_create(
+            CategoryJobCount(category_id=category_id, count=count)
+            for category_id, count in Category.objects.annotate(count=Count('job')).values_list('id', 'count')
+        )
+        JobBidCount.objects.all().delete()
+        JobBidCount.objects.bulk_create(
+            JobBidCount(job_id=job_id, count=count)
+            for job_id, count in Job.objects.annotate(count=Count('bid')).values_list('id', 'count')
+        )
+    transaction.on_commit(lambda: bump_version(CATEGORY_COUNTS_NAMESPACE))
+
+
+@receiver(post_save, sender=Category)
+def rollup_saved_category(sender, instance, created, **kwargs):
+    if created:
+        CategoryJobCount.objects.create(category=instance)
+    transaction.on_commit(lambda: bump_version(CATEGORY_COUNTS_NAMESPACE))
+
+
+@receiver(post_save, sender=Job)
+def rollup_saved_job(sender, instance, created, **kwargs):
+    if created:
+        JobBidCount.objects.create(job=instance)
+    move(CategoryJobCount, None if created else instance.get_loaded_value('category_id'), instance.category_id)
+
+
+@receiver(jobs_bulk_created)
+def rollup_bulk_created_jobs(sender, jobs, **kwargs):
+    JobBidCount.objects.bulk_create([JobBidCount(job=job) for job in jobs])
+    for category_id, count in Counter(job.category_id for job in jobs).items():
+        adjust(CategoryJobCount, category_id, count)
+
+
+@receiver(post_delete, sender=Job)
+def rollup_deleted_job(sender, instance, **kwargs):
+    adjust(CategoryJobCount, instance.get_loaded_value('category_id'), -1)
+
+
+@receiver(post_save, sender=Bid)
+def rollup_saved_bid(sender, instance, created, **kwargs):
+    move(JobBidCount, None if created else instance.get_loaded_value('job_id'), instance.job_id)
+
+
+@receiver(post_delete, sender=Bid)
+def rollup_deleted_bid(sender, instance, **kwargs):
+    adjust(JobBidCount, instance.get_loaded_value('job_id'), -1)
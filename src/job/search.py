@@ -0,0 +1,52 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from rest_framework import filters
+
+from src.job.models import SEARCH_CONFIG
+
+TOKEN_RE = re.compile(r'[^\W_]+')
+'''Pattern for the words kept from a search term, anything else (tsquery operators included) is dropped'''
+
+
+def get_search_tokens(terms):
+    """Split search terms into the lower-cased words which are matched against the job documents"""
+    return TOKEN_RE.findall(' '.join(terms).lower())
+
+
+def build_prefix_query(terms):
+    """Build a tsquery which matches every word of the search terms as a prefix,
+    so that `dev` finds `developer` and `react nat` finds `React Native`.
+
+    Args:
+        terms (list): search terms given by the client
+
+    Returns:
+        SearchQuery: the prefix query, or None when the terms hold no searchable word
+    """
+    tokens = get_search_tokens(terms)
+    if not tokens:
+        return None
+    return SearchQuery(' & '.join(f'{token}:*' for token in tokens), search_type='raw', config=SEARCH_CONFIG)
+
+
+class JobSearchFilter(filters.SearchFilter):
+    """This is a filter backend for full-text searching of jobs with the `search` query parameter.
+
+    Instead of `ILIKE '%term%'` over the name and description columns it matches the terms against the
+    maintained `Job.search_vector` document, which is served by a GIN index, and orders the hits by
+    relevance. Name matches are weighted above description matches, newer jobs win ties.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = build_prefix_query(self.get_search_terms(request))
+        if query is None:
+            return queryset
+
+        return (
+            queryset.filter(search_vector=query)
+            # ts_rank is a `real`, cast it so the rank round-trips exactly through pagination cursors
+            .annotate(rank=Cast(SearchRank(F('search_vector'), query), FloatField())).order_by('-rank', '-created_at', '-id')
+        )
@@ -1,7 +1,7 @@
 from rest_framework import serializers
 
 from src.employer.serializers import EmployernameSerializer
-from src.job.models import Bid, Category, Job, Project, Rating, Required_Skill
+from src.job.models import Bid, Category, Job, Project, Rating, Required_Skill, required_skill_resolver
 
 
 class RequireskillSerializer(serializers.ModelSerializer):
@@ -21,6 +21,8 @@ class RequireskillSerializer(serializers.ModelSerializer):
     class Meta:
         model = Required_Skill
         fields = ['skill']
+        # names are resolved to existing skills, not created one by one, see SkillResolver
+        extra_kwargs = {'skill': {'validators': []}}
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -60,7 +62,14 @@ class JobSerializer(serializers.ModelSerializer):
 
     is_draft: This is a BooleanField representing whether the job is a draft or not.
 
+    status: This is a read-only CharField representing the lifecycle status of the job
+    (draft, open, awarded, in_progress, finished or expired).
+
     skill: This is a nested serializer RequireskillSerializer that serializes the required skills for the job.
+
+    The nested serializers make up the eager loading plan of the JobSerializer (category and employer with
+    its user joined, skills prefetched), which list views apply to their queryset through the
+    EagerLoadingMixin, see src.common.serializers.get_eager_loading_plan.
     """
 
     skill = RequireskillSerializer(many=True)
@@ -70,18 +79,14 @@ class JobSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         skills = validated_data.pop('skill')
         job = super().create(validated_data)
-        for skill in skills:
-            instance, created = Required_Skill.objects.get_or_create(skill=skill['skill'])
-            job.skill.add(instance)
+        required_skill_resolver.set_skills(job.skill, [skill['skill'] for skill in skills])
         return job
 
     def update(self, instance, validated_data):
-        skills = validated_data.pop('skill')
+        skills = validated_data.pop('skill', None)
         job = super().update(instance, validated_data)
-        job.skill.clear()
-        for skill in skills:
-            instance, created = Required_Skill.objects.get_or_create(skill=skill['skill'])
-            job.skill.add(instance)
+        if skills is not None:
+            required_skill_resolver.set_skills(job.skill, [skill['skill'] for skill in skills])
         return job
 
     class Meta:
@@ -95,10 +100,23 @@ class JobSerializer(serializers.ModelSerializer):
             'requirement',
             'employer_data',
             'is_draft',
+            'status',
             'skill',
         ]
 
 
+class RecommendedJobSerializer(JobSerializer):
+    """This is a read-only serializer for jobs recommended to a job seeker. It adds the job id and the
+    match score (between 0 and 1) computed by the recommendation engine to the JobSerializer fields.
+    """
+
+    id = serializers.IntegerField(read_only=True)
+    score = serializers.FloatField(read_only=True)
+
+    class Meta(JobSerializer.Meta):
+        fields = ['id', 'score'] + JobSerializer.Meta.fields
+
+
 class CategorywiseJobSerializer(serializers.Serializer):
     """This is a Django REST Framework serializer for a model that represents the count of jobs in each category.
     The CategorywiseJobSerializer has two fields:
@@ -119,18 +137,23 @@ class CategorywiseJobSerializer(serializers.Serializer):
     object that has the same structure as the serializer.
     """
 
-    category__category = serializers.CharField()
+    category_id = serializers.IntegerField()
+    category__category = serializers.CharField(source='category.category')
     count = serializers.IntegerField()
 
+    select_related_fields = ('category',)
+
 
 class BidperJobSerializer(serializers.Serializer):
+    """This serializer represents a row of the bids per job rollup. Rows are keyed by the job id,
+    so jobs which share a name are listed separately.
+    """
 
-    job__name = serializers.CharField()
+    job_id = serializers.IntegerField()
+    job__name = serializers.CharField(source='job.name')
     count = serializers.IntegerField()
 
-    # class Meta:
-    #     model = Bid
-    #     fields = ['job', 'count']
+    select_related_fields = ('job',)
 
 
 class RateSerializer(serializers.ModelSerializer):
@@ -165,6 +188,44 @@ class BidSerializer(serializers.ModelSerializer):
         model = Bid
         fields = ['job', 'proposal', 'amount', 'job_seeker', 'require_days', 'milestone']
 
+    def validate(self, attrs):
+        '''New bids are upserted by BidCreateApi, an edited bid must not move onto another bid of its job seeker'''
+        if self.instance is not None:
+            job = attrs.get('job', self.instance.job)
+            job_seeker = attrs.get('job_seeker', self.instance.job_seeker)
+            if Bid.objects.filter(job=job, job_seeker=job_seeker).exclude(pk=self.instance.pk).exists():
+                raise serializers.ValidationError('This job seeker already bid on this job.')
+        return attrs
+
+
+class RankedBidSerializer(BidSerializer):
+    """This is a read-only serializer for the bids of a job ranked by src.job.ranking. It adds the bid id,
+    the shortlist flag, the overall score and the score of each component (price, time, rating and skills)
+    to the BidSerializer fields.
+    """
+
+    id = serializers.IntegerField(read_only=True)
+    score = serializers.FloatField(read_only=True)
+    components = serializers.DictField(child=serializers.FloatField(), read_only=True)
+
+    class Meta(BidSerializer.Meta):
+        fields = ['id', 'score', 'components'] + BidSerializer.Meta.fields + ['is_shortlisted']
+
+
+class BatchJobSerializer(serializers.ModelSerializer):
+    """This is a read-only serializer for the jobs returned by the batch lookup of src.job.batch, which
+    serializes the cached field values of each job along with its age in days and number of bids."""
+
+    category = serializers.IntegerField(source='category_id', read_only=True)
+    employer = serializers.IntegerField(source='employer_id', read_only=True)
+    age = serializers.IntegerField(read_only=True)
+    bid_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Job
+        fields = ['id', 'name', 'status', 'budget', 'duration', 'category', 'employer', 'created_at', 'age', 'bid_count']
+        read_only_fields = fields
+
 
 class JobnameSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,13 @@
+from django.dispatch import Signal
+
+job_status_changed = Signal()
+'''Sent with `job_id`, `old_status` and `new_status` whenever the lifecycle status of a job changes,
+including status updates which bypass Job.save(). `old_status` is None for a new job.'''
+
+jobs_bulk_status_changed = Signal()
+'''Sent with `job_ids`, `old_status` and `new_status` after the status of many jobs is changed with a
+single queryset update (e.g. by the expiry sweeper), instead of one job_status_changed per job.'''
+
+jobs_bulk_created = Signal()
+'''Sent with `jobs`, the list of saved Job instances, after jobs are inserted with `bulk_create`,
+which sends no `post_save`. Receivers update the derived data they would have updated per job.'''
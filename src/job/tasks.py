@@ -0,0 +1,18 @@
+from celery import task
+
+from src.job import expiry, recommendations, rollups
+
+
+@task(name='RebuildRecommendationIndexTask')
+def rebuild_recommendation_index_task(if_missing=False):
+    recommendations.rebuild_index(if_missing=if_missing)
+
+
+@task(name='ReconcileRollupsTask')
+def reconcile_rollups_task():
+    rollups.reconcile()
+
+
+@task(name='ExpireJobsTask')
+def expire_jobs_task():
+    expiry.expire_jobs()
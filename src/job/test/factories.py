@@ -0,0 +1,51 @@
+import factory
+
+from src.users.test.factories import UserFactory
+
+
+class EmployerFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = 'employer.Employer'
+
+    user = factory.SubFactory(UserFactory)
+    description = factory.Faker('sentence')
+
+
+class JobSeekerFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = 'job_seeker.Job_Seeker'
+
+    user = factory.SubFactory(UserFactory)
+    education = factory.Faker('sentence')
+    experience = 2
+
+
+class CategoryFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = 'job.Category'
+
+    category = factory.Sequence(lambda n: f'category{n}')
+
+
+class JobFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = 'job.Job'
+
+    name = factory.Sequence(lambda n: f'job{n}')
+    description = factory.Faker('sentence')
+    category = factory.SubFactory(CategoryFactory)
+    budget = 1000
+    requirement = 'requirements.pdf'
+    employer = factory.SubFactory(EmployerFactory)
+
+
+class BidFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = 'job.Bid'
+
+    job = factory.SubFactory(JobFactory)
+    job_seeker = factory.SubFactory(JobSeekerFactory)
+    proposal = factory.Faker('sentence')
+    amount = 900
+    require_days = 10
+    milestone = factory.Faker('sentence')
@@ -0,0 +1,51 @@
+from django.core.cache import cache
+from nose.tools import eq_
+from rest_framework.test import APITestCase
+
+from src.job import batch, rollups
+from src.job.models import Job
+from src.job.test.factories import BidFactory, EmployerFactory, JobFactory
+
+
+class TestJobBatchTestCase(APITestCase):
+    """
+    Tests the /job/batch/ lookup of several jobs.
+    """
+
+    url = '/job/batch/'
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(EmployerFactory().user)
+        self.jobs = [JobFactory() for _ in range(3)]
+        BidFactory(job=self.jobs[1])
+        rollups.reconcile()
+
+    def get(self, *job_ids):
+        return self.client.get(self.url, {'ids': ','.join(str(job_id) for job_id in job_ids)})
+
+    def test_jobs_are_returned_in_order_with_computed_fields(self):
+        ids = [self.jobs[1].pk, self.jobs[0].pk, 0]
+        # jobs, bid counts
+        with self.assertNumQueries(2):
+            data = self.get(*ids).data
+        eq_([job['id'] for job in data['results']], ids[:2])
+        eq_([(job['age'], job['bid_count'], job['status']) for job in data['results']], [(0, 1, 'open'), (0, 0, 'open')])
+        eq_(data['missing'], [0])
+        # the jobs come from the cache, only the bid counts are read
+        with self.assertNumQueries(1):
+            self.get(*ids)
+
+    def test_saving_a_job_drops_its_entry(self):
+        self.get(self.jobs[0].pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            Job.objects.filter(pk=self.jobs[0].pk).get().save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.jobs[0].is_draft = True
+            self.jobs[0].save()
+        eq_(self.get(self.jobs[0].pk).data['results'][0]['status'], 'draft')
+
+    def test_batch_size_is_capped(self):
+        eq_(self.get(*range(1, batch.MAX_BATCH_SIZE + 2)).status_code, 400)
+        eq_(self.client.get(self.url, {'ids': '1,x'}).status_code, 400)
+        eq_(self.client.get(self.url, {'ids': '1,\u00b2'}).status_code, 400)
@@ -0,0 +1,109 @@
+from unittest import mock
+
+from django.core.cache import cache
+from nose.tools import eq_, ok_
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from src.common import cache_backends
+from src.common.cache_backends import RedisCache
+from src.job import rollups
+from src.job.models import Bid, JobBidCount
+from src.job.test.factories import BidFactory, EmployerFactory, JobFactory, JobSeekerFactory
+
+
+class TestScopedBidListingTestCase(APITestCase):
+    """
+    Tests the scoped /job/bid/ listing and /job/bid-update/<pk>.
+    """
+
+    url = '/job/bid/'
+
+    def setUp(self):
+        self.employer = EmployerFactory()
+        self.job = JobFactory(employer=self.employer)
+        self.job_seeker = JobSeekerFactory()
+        self.bids = [BidFactory(job=self.job) for _ in range(3)]
+        self.own_bid = BidFactory(job=JobFactory(), job_seeker=self.job_seeker)
+        rollups.reconcile()
+
+    def ids(self, response):
+        return [bid['job'] for bid in response.data['results']]
+
+    def test_employer_lists_the_bids_on_their_job(self):
+        self.client.force_authenticate(self.employer.user)
+        response = self.client.get(self.url, {'job': self.job.pk, 'count': 'true', 'page_size': 2})
+        eq_(response.status_code, status.HTTP_200_OK)
+        eq_(response.data['count'], 3)
+        eq_(len(response.data['results']), 2)
+        eq_(len(self.client.get(response.data['next']).data['results']), 1)
+
+    def test_employer_needs_a_job_they_own(self):
+        self.client.force_authenticate(self.employer.user)
+        eq_(self.client.get(self.url).status_code, status.HTTP_400_BAD_REQUEST)
+        eq_(self.client.get(self.url, {'job': self.own_bid.job_id}).status_code, status.HTTP_404_NOT_FOUND)
+        eq_(self.client.get(self.url, {'job': '\u00b2'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_job_seeker_lists_their_bids(self):
+        self.client.force_authenticate(self.job_seeker.user)
+        response = self.client.get(self.url, {'count': 'true'})
+        eq_((response.data['count'], self.ids(response)), (1, [self.own_bid.job_id]))
+
+    def test_job_seeker_updates_only_their_bids(self):
+        self.client.force_authenticate(self.job_seeker.user)
+        eq_(self.client.get(f'/job/bid-update/{self.own_bid.pk}').status_code, status.HTTP_200_OK)
+        eq_(self.client.get(f'/job/bid-update/{self.bids[0].pk}').status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TestBidSubmissionTestCase(APITestCase):
+    """
+    Tests the one bid per job seeker upsert and Idempotency-Key replay of POST /job/bid/.
+    """
+
+    url = '/job/bid/'
+
+    def setUp(self):
+        cache.clear()
+        self.job = JobFactory()
+        self.job_seeker = JobSeekerFactory()
+        self.client.force_authenticate(self.job_seeker.user)
+        rollups.reconcile()
+
+    def submit(self, amount=100, **headers):
+        data = {
+            'job': self.job.pk,
+            'job_seeker': self.job_seeker.pk,
+            'proposal': 'I can do it',
+            'amount': amount,
+            'require_days': 5,
+            'milestone': 'One',
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.url, data, **headers)
+
+    def test_resubmitting_updates_the_single_bid(self):
+        eq_(self.submit().status_code, status.HTTP_201_CREATED)
+        eq_(self.submit().status_code, status.HTTP_200_OK)
+        eq_(self.submit(amount=80).status_code, status.HTTP_200_OK)
+        eq_(list(Bid.objects.filter(job=self.job).values_list('amount', flat=True)), [80])
+        eq_(JobBidCount.objects.get(pk=self.job.pk).count, 1)
+
+    def test_retries_replay_the_original_response(self):
+        first = self.submit(HTTP_IDEMPOTENCY_KEY='abc')
+        retry = self.submit(HTTP_IDEMPOTENCY_KEY='abc')
+        eq_((retry.status_code, retry.data, retry['Idempotent-Replayed']), (first.status_code, first.data, 'true'))
+        eq_(self.submit(amount=50, HTTP_IDEMPOTENCY_KEY='abc').status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        eq_(Bid.objects.get(job=self.job).amount, 100)
+
+    def test_retries_run_the_view_while_the_cache_is_unavailable(self):
+        unavailable = RedisCache('redis://127.0.0.1:1/0', {'OPTIONS': {'socket_timeout': 0.1, 'socket_connect_timeout': 0.1}})
+        self.addCleanup(cache_backends._unavailable_until.clear)
+        with mock.patch('src.common.idempotency.cache', unavailable):
+            eq_(self.submit(HTTP_IDEMPOTENCY_KEY='abc').status_code, status.HTTP_201_CREATED)
+            eq_(self.submit(amount=80, HTTP_IDEMPOTENCY_KEY='abc').status_code, status.HTTP_200_OK)
+        eq_(Bid.objects.get(job=self.job).amount, 80)
+
+    def test_job_seekers_submit_only_their_own_bids(self):
+        self.client.force_authenticate(JobSeekerFactory().user)
+        eq_(self.submit().status_code, status.HTTP_403_FORBIDDEN)
+        ok_(not Bid.objects.exists())
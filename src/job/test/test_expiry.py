@@ -0,0 +1,39 @@
+import datetime
+
+from nose.tools import eq_
+from rest_framework.test import APITestCase
+
+from src.common import counters
+from src.job import expiry
+from src.job.models import Job
+from src.job.test.factories import JobFactory
+
+
+class TestJobExpiryTestCase(APITestCase):
+    """
+    Tests the batched expiry of open jobs past their last date.
+    """
+
+    def setUp(self):
+        today = datetime.date.today()
+        self.yesterday, self.tomorrow = today - datetime.timedelta(days=1), today + datetime.timedelta(days=1)
+        self.expired = [JobFactory(duration=self.yesterday) for _ in range(3)]
+        self.current = JobFactory(duration=self.tomorrow)
+        self.draft = JobFactory(duration=self.yesterday, is_draft=True)
+        counters.reconcile()
+
+    def test_expired_open_jobs_are_closed_in_batches(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            eq_(expiry.expire_jobs(batch_size=2), 3)
+        eq_(set(Job.objects.filter(status=Job.Status.EXPIRED)), set(self.expired))
+        eq_(counters.get_counts([counters.OPEN_JOBS, counters.DRAFT_JOBS]), {'open_jobs': 1, 'draft_jobs': 1})
+        eq_(expiry.expire_jobs(), 0)
+
+    def test_moving_the_last_date_reopens_the_job(self):
+        expiry.expire_jobs()
+        job = Job.objects.get(pk=self.expired[0].pk)
+        job.save()
+        eq_(job.status, Job.Status.EXPIRED)
+        job.duration = self.tomorrow
+        job.save()
+        eq_(job.status, Job.Status.OPEN)
@@ -0,0 +1,43 @@
+import json
+
+from nose.tools import eq_
+from rest_framework.test import APITestCase
+
+from src.job.models import Project
+from src.job.test.factories import EmployerFactory, JobFactory, JobSeekerFactory
+
+
+class TestProjectExportTestCase(APITestCase):
+    """
+    Tests the streaming ?export= mode of /job/project/ and /job-seeker/projects/<id>.
+    """
+
+    def setUp(self):
+        self.employer = EmployerFactory()
+        self.job_seeker = JobSeekerFactory()
+        self.client.force_authenticate(self.employer.user)
+        self.projects = [
+            Project.objects.create(job=JobFactory(employer=self.employer), job_seeker=job_seeker, employer=self.employer)
+            for job_seeker in [self.job_seeker, self.job_seeker, JobSeekerFactory()]
+        ]
+
+    def content(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_list_serializes_the_projects(self):
+        response = self.client.get('/job/project/')
+        eq_([project['job'] for project in response.data], [project.job_id for project in self.projects])
+
+    def test_ndjson_export(self):
+        response = self.client.get('/job/project/', {'export': 'ndjson'})
+        eq_(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.content(response).splitlines()]
+        eq_([row['job'] for row in rows], [project.job_id for project in self.projects])
+        eq_(rows[0]['is_active'], True)
+
+    def test_csv_export_of_a_job_seeker(self):
+        response = self.client.get(f'/job-seeker/projects/{self.job_seeker.pk}', {'export': 'csv'})
+        lines = self.content(response).splitlines()
+        eq_(lines[0], 'job,job_seeker,employer,is_active,is_finished')
+        eq_(len(lines), 3)
+        eq_(self.client.get('/job/project/', {'export': 'xml'}).status_code, 400)
@@ -0,0 +1,54 @@
+import datetime
+
+from django.core.cache import cache
+from nose.tools import eq_, ok_
+from rest_framework.test import APITestCase
+
+from src.job.models import Required_Skill
+from src.job.test.factories import CategoryFactory, JobFactory
+from src.users.test.factories import UserFactory
+
+
+class TestSearchFacetsTestCase(APITestCase):
+    """
+    Tests /job/search/?facets=true facet counts.
+    """
+
+    url = '/job/search/'
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(UserFactory())
+        self.web = CategoryFactory(category='Web')
+        python = Required_Skill.objects.create(skill='python')
+        soon = datetime.date.today() + datetime.timedelta(days=3)
+        JobFactory(name='Python api', category=self.web, budget=50, duration=soon).skill.add(python)
+        JobFactory(name='Python site', category=self.web, budget=700).skill.add(python)
+        JobFactory(name='Logo', budget=7000)
+
+    def facet(self, response, name):
+        return {entry['value']: entry['count'] for entry in response.data['facets'][name]}
+
+    def test_facets_count_the_whole_result_set(self):
+        response = self.client.get(self.url, {'facets': 'true', 'page_size': 1})
+        eq_(len(response.data['results']), 1)
+        eq_(self.facet(response, 'category')['Web'], 2)
+        eq_(self.facet(response, 'skill'), {'python': 2})
+        budget = self.facet(response, 'budget')
+        eq_((budget['under_100'], budget['500_1000'], budget['5000_plus']), (1, 1, 1))
+        duration = self.facet(response, 'duration')
+        eq_((duration['within_7_days'], duration['unspecified']), (1, 2))
+
+    def test_facets_follow_the_search(self):
+        response = self.client.get(self.url, {'facets': 'true', 'search': 'python'})
+        eq_(self.facet(response, 'budget')['5000_plus'], 0)
+
+    def test_cached_facets_are_invalidated_by_job_changes(self):
+        self.client.get(self.url, {'facets': 'true'})
+        with self.captureOnCommitCallbacks(execute=True):
+            JobFactory(name='Another', category=self.web)
+        response = self.client.get(self.url, {'facets': 'true'})
+        eq_(self.facet(response, 'category')['Web'], 3)
+
+    def test_facets_are_only_returned_on_request(self):
+        ok_('facets' not in self.client.get(self.url).data)
@@ -0,0 +1,55 @@
+from django.test import override_settings
+from nose.tools import eq_
+from rest_framework.test import APITestCase
+
+from src.common import events
+from src.job.test.factories import BidFactory, EmployerFactory, JobFactory
+
+
+@override_settings(EVENTS_BROKER_URL='memory://')
+class TestBidFeedTestCase(APITestCase):
+    """
+    Tests the /job/bid-feed/ and /job/<pk>/bid-feed/ live bid feeds.
+    """
+
+    def setUp(self):
+        events.get_broker().clear()
+        self.employer = EmployerFactory()
+        self.client.force_authenticate(self.employer.user)
+        self.job = JobFactory(employer=self.employer)
+        self.url = f'/job/{self.job.pk}/bid-feed/'
+
+    def bid(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return BidFactory(job=self.job, **kwargs)
+
+    def poll(self, url, cursor):
+        return self.client.get(url, {'cursor': cursor}).data
+
+    def test_poll_resumes_from_the_cursor(self):
+        cursor = self.client.get(self.url).data['cursor']
+        employer_cursor = self.client.get('/job/bid-feed/').data['cursor']
+        first = self.bid()
+        data = self.poll(self.url, cursor)
+        eq_([(event['type'], event['bid']['id']) for event in data['events']], [('bid.created', first.pk)])
+
+        second = self.bid()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/job/{self.job.pk}/ranked-bids/', {'count': 1})
+        eq_(response.data['shortlisted'], 1)
+        types = [(event['type'], event['bid']['id']) for event in self.poll('/job/bid-feed/', employer_cursor)['events']]
+        eq_(types[:2], [('bid.created', first.pk), ('bid.created', second.pk)])
+        eq_(types[2][0], 'bid.shortlisted')
+        eq_(self.poll(self.url, self.poll(self.url, data['cursor'])['cursor'])['events'], [])
+
+    @override_settings(EVENTS_BROKER_URL='redis://127.0.0.1:1/0')
+    def test_unavailable_broker_answers_no_events(self):
+        eq_(self.client.get(self.url).data, {'cursor': None, 'events': []})
+        eq_(self.client.get(self.url, {'cursor': '1-0'}).data, {'cursor': '1-0', 'events': []})
+        with self.captureOnCommitCallbacks(execute=True):
+            BidFactory(job=self.job)
+
+    def test_only_the_job_owner_follows_the_job(self):
+        eq_(self.client.get(self.url, {'cursor': 'latest'}).status_code, 400)
+        self.client.force_authenticate(EmployerFactory().user)
+        eq_(self.client.get(self.url).status_code, 404)
@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+import tempfile
+
+from django.core.management import call_command
+from nose.tools import eq_
+from rest_framework.test import APITestCase
+
+from src.common import counters
+from src.job.models import CategoryJobCount, Job, JobBidCount
+from src.job.test.factories import CategoryFactory, EmployerFactory
+
+
+class TestJobImportTestCase(APITestCase):
+    """
+    Tests the bulk job import endpoint and management command.
+    """
+
+    url = '/job/import/'
+
+    def setUp(self):
+        self.employer = EmployerFactory()
+        self.client.force_authenticate(self.employer.user)
+        self.web = CategoryFactory(category='Web')
+        counters.reconcile()
+
+    def post(self, body, content_type, **params):
+        with self.captureOnCommitCallbacks(execute=True):
+            query = ''.join(f'?{key}={value}' for key, value in params.items())
+            return self.client.generic('POST', self.url + query, body, content_type=content_type)
+
+    def test_csv_import(self):
+        body = (
+            'name,description,category,budget,duration,is_draft,skill\n'
+            'React developer,Build a dashboard,Web,500,,,react;javascript\n'
+            'Logo,Design a logo,,50,2030-01-01,true,\n'
+            'Broken,No budget,Web,,,,\n'
+            'Elsewhere,Unknown category,Mobile,10,,,\n'
+        )
+        response = self.post(body, 'text/csv', batch_size=2)
+        eq_(response.status_code, 201)
+        eq_((response.data['created'], response.data['failed']), (2, 2))
+        eq_([error['row'] for error in response.data['errors']], [3, 4])
+        eq_(list(response.data['errors'][1]['errors']), ['category'])
+
+        job = Job.objects.get(name='React developer')
+        eq_(job.status, Job.Status.OPEN)
+        eq_(sorted(job.skill.values_list('skill', flat=True)), ['javascript', 'react'])
+        eq_(Job.objects.get(name='Logo').status, Job.Status.DRAFT)
+        eq_(list(Job.objects.filter(search_vector='dashboard')), [job])
+        eq_(
+            counters.get_counts([counters.JOBS, counters.OPEN_JOBS, counters.DRAFT_JOBS]),
+            {'jobs': 2, 'open_jobs': 1, 'draft_jobs': 1},
+        )
+        eq_(CategoryJobCount.objects.get(pk=self.web.pk).count, 1)
+        eq_(JobBidCount.objects.count(), 2)
+
+    def test_ndjson_import(self):
+        rows = [{'name': f'Job {index}', 'description': 'Imported', 'budget': index, 'skill': ['python']} for index in range(5)]
+        body = '\n'.join(json.dumps(row) for row in rows) + '\nnot json\n'
+        response = self.post(body, 'application/x-ndjson')
+        eq_((response.data['created'], response.data['failed']), (5, 1))
+        eq_(Job.objects.filter(skill__skill='python').count(), 5)
+
+    def test_unsupported_content_type(self):
+        eq_(self.post('{}', 'application/json').status_code, 415)
+
+    def test_management_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.ndjson') as file:
+            file.write(json.dumps({'name': 'Job', 'description': 'Imported', 'budget': 10}) + '\n')
+            file.flush()
+            call_command('import_jobs', file.name, employer=self.employer.pk, stdout=io.StringIO())
+        eq_(Job.objects.filter(employer=self.employer).count(), 1)
+
+    def test_unreadable_body(self):
+        response = self.post('name,description\nCaf\xe9,Latin-1\n'.encode('latin-1'), 'text/csv')
+        eq_(response.status_code, 400)
+        eq_(response.data['created'], 0)
+
+        response = self.post('name,description\nJob,' + 'x' * (csv.field_size_limit() + 1) + '\n', 'text/csv')
+        eq_(response.status_code, 400)
+        eq_(Job.objects.count(), 0)
@@ -0,0 +1,62 @@
+import json
+from base64 import urlsafe_b64encode
+
+from nose.tools import eq_, ok_
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from src.job.test.factories import EmployerFactory, JobFactory
+
+
+class TestJobKeysetPaginationTestCase(APITestCase):
+    """
+    Tests cursor pagination of /job/ listings.
+    """
+
+    url = '/job/'
+
+    def setUp(self):
+        self.employer = EmployerFactory()
+        self.client.force_authenticate(self.employer.user)
+        self.jobs = [JobFactory(employer=self.employer) for _ in range(5)]
+        self.newest_first = [job.name for job in reversed(self.jobs)]
+
+    def names(self, response):
+        return [job['name'] for job in response.data['results']]
+
+    def test_walks_forward_and_back_through_all_pages(self):
+        response = self.client.get(self.url, {'page_size': 2})
+        eq_(response.status_code, status.HTTP_200_OK)
+        eq_(self.names(response), self.newest_first[:2])
+        eq_(response.data['previous'], None)
+
+        second = self.client.get(response.data['next'])
+        eq_(self.names(second), self.newest_first[2:4])
+
+        third = self.client.get(second.data['next'])
+        eq_(self.names(third), self.newest_first[4:])
+        eq_(third.data['next'], None)
+
+        back = self.client.get(third.data['previous'])
+        eq_(self.names(back), self.newest_first[2:4])
+
+        first = self.client.get(back.data['previous'])
+        eq_(self.names(first), self.newest_first[:2])
+        eq_(first.data['previous'], None)
+
+    def test_count_is_only_included_on_request(self):
+        response = self.client.get(self.url)
+        ok_('count' not in response.data)
+
+        response = self.client.get(self.url, {'count': 'true'})
+        eq_(response.data['count'], 5)
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        eq_(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_tampered_search_cursor_is_not_found(self):
+        for position in (['x', '2020-01-01T00:00:00Z', 1], [0.5, 'x', 1], [None, '2020-01-01T00:00:00Z', 1]):
+            cursor = urlsafe_b64encode(json.dumps({'p': position}).encode('ascii')).decode('ascii')
+            response = self.client.get('/job/search/', {'search': self.jobs[0].name, 'cursor': cursor})
+            eq_(response.status_code, status.HTTP_404_NOT_FOUND)
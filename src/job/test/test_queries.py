@@ -0,0 +1,57 @@
+from nose.tools import eq_
+from rest_framework.test import APITestCase
+
+from src.common.roles import get_user_roles
+from src.common.serializers import get_eager_loading_plan
+from src.job import rollups
+from src.job.models import Required_Skill
+from src.job.serializers import JobSerializer
+from src.job.test.factories import BidFactory, CategoryFactory, EmployerFactory, JobFactory
+
+
+class TestJobQueryBudgetTestCase(APITestCase):
+    """
+    Tests that the job endpoints run a fixed number of queries whatever the page size.
+    """
+
+    def setUp(self):
+        self.employer = EmployerFactory()
+        self.client.force_authenticate(self.employer.user)
+        python = Required_Skill.objects.create(skill='python')
+        for index in range(6):
+            job = JobFactory(name=f'Python job {index}', employer=self.employer, category=CategoryFactory())
+            job.skill.add(python)
+            JobFactory(name=f'Draft {index}', employer=self.employer, is_draft=True)
+            BidFactory(job=job)
+        rollups.reconcile()
+        # the roles behind the employer permission are cached after the first request
+        get_user_roles(self.employer.user.pk)
+
+    def assert_query_budget(self, url, budget, **params):
+        for page_size in (1, 6):
+            with self.assertNumQueries(budget):
+                response = self.client.get(url, {'page_size': page_size, 'limit': page_size, **params})
+            eq_(response.status_code, 200)
+            eq_(len(response.data['results']), page_size)
+
+    def test_job_serializer_plan(self):
+        eq_(get_eager_loading_plan(JobSerializer), (['category', 'employer', 'employer__user'], ['skill']))
+
+    def test_job_list_budget(self):
+        # page, skills prefetch
+        self.assert_query_budget('/job/', 2)
+
+    def test_job_search_budget(self):
+        # page, skills prefetch
+        self.assert_query_budget('/job/search/', 2, search='python')
+
+    def test_draft_job_budget(self):
+        # DraftJob checks the django login, so log in with a session: session, user, page, skills prefetch
+        self.client.force_authenticate(None)
+        self.client.force_login(self.employer.user)
+        self.assert_query_budget('/employer/drafed-job/', 4)
+
+    def test_rollup_list_budgets(self):
+        # count, page
+        self.assert_query_budget('/job/categorywise-jobcount/', 2)
+        self.assert_query_budget('/job/bids-per-job/', 2)
@@ -0,0 +1,81 @@
+import datetime
+from unittest import mock
+
+from django.core.cache import cache
+from nose.tools import eq_, ok_
+from rest_framework.test import APITestCase
+
+from src.job import ranking
+from src.job.models import Bid, Rating, Required_Skill
+from src.job.test.factories import BidFactory, EmployerFactory, JobFactory, JobSeekerFactory
+from src.job_seeker.models import Skill
+
+
+class TestRankedBidsTestCase(APITestCase):
+    """
+    Tests /job/<pk>/ranked-bids/ bid ranking and shortlisting.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.employer = EmployerFactory()
+        self.client.force_authenticate(self.employer.user)
+        self.job = JobFactory(employer=self.employer, budget=1000, duration=datetime.date.today() + datetime.timedelta(days=10))
+        self.job.skill.add(Required_Skill.objects.create(skill='python'), Required_Skill.objects.create(skill='django'))
+        self.url = f'/job/{self.job.pk}/ranked-bids/'
+
+    def bid(self, amount, days, skills=(), rating=None):
+        job_seeker = JobSeekerFactory()
+        job_seeker.skill.add(*[Skill.objects.get_or_create(skill=skill)[0] for skill in skills])
+        if rating is not None:
+            Rating.objects.create(employer=self.employer, job_seeker=job_seeker, job=self.job, rating=rating)
+        with self.captureOnCommitCallbacks(execute=True):
+            return BidFactory(job=self.job, job_seeker=job_seeker, amount=amount, require_days=days)
+
+    def ranked_ids(self, **params):
+        return [bid['id'] for bid in self.client.get(self.url, params).data['results']]
+
+    def test_bids_are_ranked_by_score(self):
+        best = self.bid(900, 5, skills=['Python', 'Django'], rating=5)
+        expensive = self.bid(2000, 5, skills=['Python', 'Django'], rating=5)
+        slow = self.bid(900, 30, skills=['Python'], rating=2)
+        eq_(self.ranked_ids(), [best.pk, expensive.pk, slow.pk])
+        response = self.client.get(self.url, {'limit': 1, 'offset': 1})
+        eq_(response.data['count'], 3)
+        eq_(response.data['results'][0]['components'], {'price': 0.5, 'time': 1.0, 'rating': 1.0, 'skills': 1.0})
+
+    def test_new_bids_are_merged_into_the_cached_ranking(self):
+        first = self.bid(1500, 5)
+        eq_(self.ranked_ids(), [first.pk])
+        second = self.bid(500, 5)
+        ok_(cache.get(ranking.RANKING_KEY.format(self.job.pk)) is not None)
+        with self.assertNumQueries(3):
+            # job ownership, bids per job rollup, then the page of bids
+            eq_(self.ranked_ids()[:1], [second.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        eq_(self.ranked_ids(), [first.pk])
+
+    def test_deleting_a_job_drops_its_ranking_at_once(self):
+        for amount in (500, 700, 900):
+            self.bid(amount, 5)
+        self.ranked_ids()
+        key = ranking.RANKING_KEY.format(self.job.pk)
+        ok_(cache.get(key) is not None)
+        with mock.patch.object(ranking, 'update_ranked_bid') as update_ranked_bid:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.job.delete()
+        update_ranked_bid.assert_not_called()
+        ok_(cache.get(key) is None)
+
+    def test_shortlist_the_best_bids(self):
+        best = self.bid(100, 1, skills=['python', 'django'])
+        self.bid(5000, 50)
+        response = self.client.post(self.url, {'count': 1})
+        eq_(response.data['shortlisted'], 1)
+        eq_(list(Bid.objects.filter(is_shortlisted=True).values_list('id', flat=True)), [best.pk])
+
+    def test_only_the_job_owner_sees_the_ranking(self):
+        self.client.force_authenticate(EmployerFactory().user)
+        eq_(self.client.get(self.url).status_code, 404)
@@ -0,0 +1,115 @@
+from unittest import mock
+
+from django.core.cache import cache
+from nose.tools import eq_, ok_
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from src.job import recommendations
+from src.job.models import Job, Required_Skill
+from src.job.test.factories import JobFactory, JobSeekerFactory
+from src.job_seeker.models import Skill
+
+
+class TestRecommendedJobsTestCase(APITestCase):
+    """
+    Tests /job/recommended/ skill-match recommendations.
+    """
+
+    url = '/job/recommended/'
+
+    def setUp(self):
+        cache.clear()
+        # run the queued rebuild at once, like a worker would
+        patcher = mock.patch.object(recommendations, 'queue_rebuild', side_effect=recommendations.rebuild_index)
+        self.queue_rebuild = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.job_seeker = JobSeekerFactory()
+        self.job_seeker.skill.add(*[Skill.objects.create(skill=name) for name in ('Python', 'Django')])
+        self.client.force_authenticate(self.job_seeker.user)
+
+    def create_job(self, name, skills, **kwargs):
+        job = JobFactory(name=name, **kwargs)
+        job.skill.add(*[Required_Skill.objects.get_or_create(skill=skill)[0] for skill in skills])
+        return job
+
+    def names(self, response):
+        return [job['name'] for job in response.data]
+
+    def test_jobs_are_ranked_by_skill_overlap(self):
+        self.create_job('partial', ['python', 'react', 'css'])
+        self.create_job('exact', ['python', 'django'])
+        self.create_job('unrelated', ['photoshop'])
+
+        response = self.client.get(self.url)
+        eq_(response.status_code, status.HTTP_200_OK)
+        eq_(self.names(response), ['exact', 'partial'])
+
+    def test_closed_jobs_are_not_recommended(self):
+        self.create_job('drafted', ['python'], is_draft=True)
+        job = self.create_job('open', ['python'])
+
+        eq_(self.names(self.client.get(self.url)), ['open'])
+
+        Job.objects.filter(pk=job.pk).update(status=Job.Status.FINISHED)
+        eq_(self.names(self.client.get(self.url)), [])
+
+    def test_limit_caps_the_results(self):
+        for index in range(3):
+            self.create_job(f'job{index}', ['django'])
+        eq_(len(self.client.get(self.url, {'limit': 2}).data), 2)
+
+    def test_employers_are_not_allowed(self):
+        job = self.create_job('job', ['python'])
+        self.client.force_authenticate(job.employer.user)
+        eq_(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_index_is_updated_incrementally(self):
+        self.create_job('first', ['python'])
+        eq_(self.names(self.client.get(self.url)), ['first'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_job('second', ['python', 'django'])
+        eq_(self.names(self.client.get(self.url)), ['second', 'first'])
+
+    def test_closed_jobs_do_not_shorten_the_results(self):
+        best = self.create_job('best', ['python', 'django'])
+        self.create_job('second', ['python'])
+        eq_(self.names(self.client.get(self.url, {'limit': 1})), ['best'])
+
+        # closed without signals, so the job stays in the index
+        Job.objects.filter(pk=best.pk).update(status=Job.Status.FINISHED)
+        eq_(self.names(self.client.get(self.url, {'limit': 1})), ['second'])
+
+    def test_missing_index_is_queued_and_served_from_the_database(self):
+        self.queue_rebuild.side_effect = None
+        self.create_job('partial', ['python', 'react'])
+        self.create_job('exact', [' Django', 'PYTHON'])
+        eq_(self.names(self.client.get(self.url)), ['exact', 'partial'])
+        eq_(self.names(self.client.get(self.url)), ['exact', 'partial'])
+        eq_(self.queue_rebuild.call_count, 1)
+        ok_(not cache.get(recommendations.READY_KEY))
+
+    def test_queued_rebuild_is_skipped_once_the_index_exists(self):
+        recommendations.rebuild_index()
+        self.create_job('new', ['python'])
+        recommendations.rebuild_index(if_missing=True)
+        eq_(cache.get(recommendations.SKILL_KEY.format('python')), None)
+
+    def test_clearing_a_skill_reindexes_its_jobs(self):
+        job = self.create_job('first', ['python'])
+        recommendations.rebuild_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            Required_Skill.objects.get(skill='python').job_set.clear()
+        ok_(cache.get(recommendations.SKILL_KEY.format('python')) is None)
+        eq_(cache.get(recommendations.JOB_KEY.format(job.pk))[0], frozenset())
+
+    def test_rebuild_drops_stale_entries(self):
+        job = self.create_job('first', ['python', 'cobol'])
+        recommendations.rebuild_index()
+        ok_(cache.get(recommendations.SKILL_KEY.format('cobol')))
+
+        Job.objects.filter(pk=job.pk).update(status=Job.Status.FINISHED)
+        recommendations.rebuild_index()
+        ok_(cache.get(recommendations.SKILL_KEY.format('cobol')) is None)
+        ok_(cache.get(recommendations.JOB_KEY.format(job.pk)) is None)
@@ -0,0 +1,56 @@
+from nose.tools import eq_
+from rest_framework.test import APITestCase
+
+from src.job import rollups
+from src.job.models import CategoryJobCount, JobBidCount
+from src.job.test.factories import BidFactory, CategoryFactory, JobFactory
+from src.users.test.factories import UserFactory
+
+
+class TestRollupsTestCase(APITestCase):
+    """
+    Tests the category and bids per job rollups and the endpoints reading them.
+    """
+
+    def setUp(self):
+        self.client.force_authenticate(UserFactory())
+        self.web = CategoryFactory(category='Web')
+        self.design = CategoryFactory(category='Design')
+
+    def test_category_rollup_follows_jobs(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = JobFactory(category=self.web)
+            JobFactory(category=self.web)
+            JobFactory(category=self.design)
+            JobFactory(category=None)
+        response = self.client.get('/job/categorywise-jobcount/')
+        eq_([(row['category__category'], row['count']) for row in response.data['results']], [('Web', 2), ('Design', 1)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            job.category = self.design
+            job.save()
+        eq_(CategoryJobCount.objects.get(pk=self.design.pk).count, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            job.delete()
+        response = self.client.get('/job/categorywise-jobcount/', {'ordering': 'count'})
+        eq_([(row['category__category'], row['count']) for row in response.data['results']], [('Web', 1), ('Design', 1)])
+
+    def test_bid_rollup_keeps_jobs_with_the_same_name_apart(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first, second = JobFactory(name='Logo'), JobFactory(name='Logo')
+            BidFactory(job=first)
+            BidFactory(job=first)
+            bid = BidFactory(job=second)
+        response = self.client.get('/job/bids-per-job/')
+        eq_([(row['job_id'], row['count']) for row in response.data['results']], [(first.pk, 2), (second.pk, 1)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bid.delete()
+        eq_(self.client.get('/job/bids-per-job/').data['count'], 1)
+
+    def test_reconcile_rebuilds_the_rollups(self):
+        BidFactory(job=JobFactory(category=self.web))
+        rollups.reconcile()
+        eq_(CategoryJobCount.objects.get(pk=self.web.pk).count, 1)
+        eq_(JobBidCount.objects.get().count, 1)
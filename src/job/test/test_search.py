@@ -0,0 +1,50 @@
+from nose.tools import eq_
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from src.job.test.factories import JobFactory
+from src.users.test.factories import UserFactory
+
+
+class TestSearchJobTestCase(APITestCase):
+    """
+    Tests /job/search/ full-text search.
+    """
+
+    url = '/job/search/'
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_authenticate(self.user)
+        self.in_description = JobFactory(name='Landing page', description='Needs a python developer')
+        self.in_name = JobFactory(name='Python developer', description='Backend work')
+        JobFactory(name='Logo design', description='Vector artwork')
+
+    def names(self, response):
+        return [job['name'] for job in response.data['results']]
+
+    def test_name_matches_rank_above_description_matches(self):
+        response = self.client.get(self.url, {'search': 'python'})
+        eq_(response.status_code, status.HTTP_200_OK)
+        eq_(self.names(response), ['Python developer', 'Landing page'])
+
+    def test_terms_match_as_prefixes(self):
+        response = self.client.get(self.url, {'search': 'pyth dev'})
+        eq_(sorted(self.names(response)), ['Landing page', 'Python developer'])
+
+    def test_search_vector_follows_edits(self):
+        self.in_name.name = 'Graphic designer'
+        self.in_name.save()
+        response = self.client.get(self.url, {'search': 'graphic'})
+        eq_(self.names(response), ['Graphic designer'])
+
+    def test_operators_in_terms_are_ignored(self):
+        response = self.client.get(self.url, {'search': "logo & | ! ('"})
+        eq_(self.names(response), ['Logo design'])
+
+    def test_pages_follow_rank_order(self):
+        response = self.client.get(self.url, {'search': 'python', 'page_size': 1})
+        eq_(self.names(response), ['Python developer'])
+        response = self.client.get(response.data['next'])
+        eq_(self.names(response), ['Landing page'])
+        eq_(response.data['next'], None)
@@ -0,0 +1,57 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from nose.tools import eq_, ok_
+from rest_framework.test import APITestCase
+
+from src.job.models import Required_Skill, required_skill_resolver
+from src.job.test.factories import EmployerFactory, JobFactory, JobSeekerFactory
+from src.job_seeker.models import Skill
+
+
+class TestSkillResolutionTestCase(APITestCase):
+    """
+    Tests the batched skill resolution of job and job seeker writes.
+    """
+
+    def setUp(self):
+        required_skill_resolver.clear()
+        self.employer = EmployerFactory()
+        self.client.force_authenticate(self.employer.user)
+
+    def test_resolve_creates_missing_skills_once(self):
+        existing = Required_Skill.objects.create(skill='python')
+        ids = required_skill_resolver.resolve([' python', 'django', 'django', ''])
+        eq_(list(ids), ['python', 'django'])
+        eq_(ids['python'], existing.pk)
+        eq_(Required_Skill.objects.count(), 2)
+        with self.assertNumQueries(1):
+            eq_(required_skill_resolver.resolve(['django', 'python']), ids)
+
+    def test_skills_deleted_elsewhere_are_resolved_again(self):
+        ids = required_skill_resolver.resolve(['python'])
+        # deleted by another process, whose post_delete does not reach this cache
+        Required_Skill.objects.filter(pk=ids['python'])._raw_delete(Required_Skill.objects.db)
+        ids = required_skill_resolver.resolve(['python'])
+        eq_(list(Required_Skill.objects.values_list('skill', 'pk')), [('python', ids['python'])])
+
+    def test_set_skills_only_writes_the_changed_links(self):
+        job = JobFactory(employer=self.employer)
+        required_skill_resolver.set_skills(job.skill, [f'skill {index}' for index in range(20)])
+        names = [f'skill {index}' for index in range(1, 21)]
+        with CaptureQueriesContext(connection) as queries:
+            required_skill_resolver.set_skills(job.skill, names)
+        eq_(set(job.skill.values_list('skill', flat=True)), set(names))
+        link_writes = [query['sql'] for query in queries if not query['sql'].startswith('SELECT')]
+        # one insert of the new skill, one delete and one insert of links
+        eq_(len(link_writes), 3)
+        ok_(len(queries) <= 7)
+
+    def test_seeker_skills_are_resolved(self):
+        Skill.objects.create(skill='react')
+        job_seeker = JobSeekerFactory()
+        self.client.force_authenticate(job_seeker.user)
+        data = {'user': job_seeker.user.pk, 'education': 'BSc', 'experience': 2, 'phone': '', 'skill': [{'skill': 'react'}]}
+        response = self.client.put(f'/job-seeker/update/{job_seeker.pk}', data, format='json')
+        eq_(response.status_code, 200)
+        eq_(Skill.objects.count(), 1)
+        eq_(list(job_seeker.skill.values_list('skill', flat=True)), ['react'])
@@ -0,0 +1,43 @@
+from nose.tools import eq_
+from rest_framework.test import APITestCase
+
+from src.job.models import Job, Project
+from src.job.test.factories import JobFactory, JobSeekerFactory
+
+
+class TestJobStatusTestCase(APITestCase):
+    """
+    Tests the job lifecycle status follows drafts and projects.
+    """
+
+    def setUp(self):
+        self.job = JobFactory()
+        self.job_seeker = JobSeekerFactory()
+
+    def status(self):
+        self.job.refresh_from_db()
+        return self.job.status
+
+    def test_draft_flag_moves_between_draft_and_open(self):
+        eq_(self.status(), Job.Status.OPEN)
+        self.job.is_draft = True
+        self.job.save()
+        eq_(self.status(), Job.Status.DRAFT)
+
+    def test_project_lifecycle_updates_status(self):
+        project = Project.objects.create(job=self.job, job_seeker=self.job_seeker, employer=self.job.employer)
+        eq_(self.status(), Job.Status.IN_PROGRESS)
+
+        project.is_finished = True
+        project.save()
+        eq_(self.status(), Job.Status.FINISHED)
+
+        project.delete()
+        eq_(self.status(), Job.Status.OPEN)
+
+    def test_open_listing_hides_assigned_jobs(self):
+        Project.objects.create(job=self.job, job_seeker=self.job_seeker, employer=self.job.employer)
+        open_job = JobFactory(employer=self.job.employer)
+        self.client.force_authenticate(self.job.employer.user)
+        response = self.client.get('/job/')
+        eq_([job['name'] for job in response.data['results']], [open_job.name])
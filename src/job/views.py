@@ -1,29 +1,47 @@
+import codecs
 import datetime
+import re
 
-from django.db.models import Count, OuterRef, Subquery
 from django.shortcuts import get_object_or_404
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import filters, generics, permissions, status
-from rest_framework.pagination import PageNumberPagination
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from src.common.permissions import IsEmployer
-from src.job.models import Bid, Job, Project
+from src.common import counters, events, exports
+from src.common.cache import cache_response, digest
+from src.common.filters import StableOrderingFilter
+from src.common.idempotency import idempotent
+from src.common.pagination import KeysetPagination
+from src.common.permissions import IsEmployer, IsJobSeeker
+from src.common.serializers import setup_eager_loading
+from src.common.views import EagerLoadingMixin
+from src.employer import dashboard
+from src.employer.models import Employer
+from src.job import batch, feed, imports, ranking, recommendations
+from src.job.facets import JOBS_NAMESPACE, get_facets
+from src.job.models import Bid, CategoryJobCount, Job, JobBidCount, Project
+from src.job.rollups import CATEGORY_COUNTS_NAMESPACE
+from src.job.search import JobSearchFilter, get_search_tokens
 from src.job.serializers import (
+    BatchJobSerializer,
     BidperJobSerializer,
     BidSerializer,
     CategorywiseJobSerializer,
     JobSerializer,
     ProjectSerializer,
+    RankedBidSerializer,
+    RecommendedJobSerializer,
     ShortlistSerializer,
 )
+from src.job_seeker.models import Job_Seeker
 
 # Create your views here.
 
 
-class JobUpdate(generics.RetrieveUpdateDestroyAPIView):
+class JobUpdate(EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     """This is a Django REST Framework view for handling HTTP requests for updating and deleting
      a single job resource.
 
@@ -50,37 +68,47 @@ class JobUpdate(generics.RetrieveUpdateDestroyAPIView):
 
 class Number_Of_JObs(APIView):
     """
-    View to list all users in the system.
+    View to return the number of jobs in the system.
     """
 
+    @cache_response(counters.COUNTERS_NAMESPACE)
     def get(self, request):
         """
-        Return a list of all users.
+        Return the number of jobs, read from the maintained platform counters.
         """
-        no_of_jobs = Job.objects.all().count()
+        no_of_jobs = counters.get_count(counters.JOBS)
         return Response({"Jobs count": no_of_jobs})
 
 
-class Job_Count_Category(APIView):
-    """This is a Python class that implements an API endpoint for getting the count of job posts in each category.
-    The class is a subclass of APIView from the Django REST framework and defines a single method, get,
-     which implements the endpoint.
+class PlatformCounts(APIView):
+    """This view returns all platform totals (jobs, open jobs, drafts, employers, job seekers and
+    active projects) in one response. The totals are read from the counters maintained in
+    src.common.counters, so no table is scanned, and the response is cached until a counter changes.
     """
 
+    @cache_response(counters.COUNTERS_NAMESPACE)
     def get(self, request):
-        """api get method
+        return Response(counters.get_counts(list(counters.COUNTERS)))
 
-        Args:
-            request (object): used to get data from endpoint
 
-        Returns:
-            data(json): category wise job count
-        """
-        data = Job.objects.values('category__category').annotate(count=Count('id'))
-        serializer = CategorywiseJobSerializer(data=data, many=True)
-        if serializer.is_valid():
-            serializer = serializer
-        return Response(serializer.data)
+class Job_Count_Category(EagerLoadingMixin, generics.ListAPIView):
+    """This is a Python class that implements an API endpoint for getting the count of job posts in each category.
+
+    The counts are read from the `CategoryJobCount` rollup table, which is kept up to date as jobs are
+    created, moved between categories and deleted, instead of grouping the whole job table on every call.
+    The rows are paginated and ordered by count, descending by default; pass `ordering=count` to reverse it.
+    Categories with the same count are ordered by id. Each page is cached until the rollup or a category name changes.
+    """
+
+    queryset = CategoryJobCount.objects.filter(count__gt=0)
+    serializer_class = CategorywiseJobSerializer
+    filter_backends = [StableOrderingFilter]
+    ordering_fields = ['count']
+    ordering = ['-count']
+
+    @cache_response(CATEGORY_COUNTS_NAMESPACE)
+    def get(self, request, *args, **kwargs):
+        return self.list(request, *args, **kwargs)
 
 
 class JobAge(APIView):
@@ -108,18 +136,50 @@ class JobAge(APIView):
         return Response(status=status.HTTP_404_NOT_FOUND)
 
 
-class SearchJob(generics.ListAPIView):
+class JobBatch(APIView):
+    """This view returns several jobs at once, with their age in days and number of bids, so that a page
+    of job cards needs one request instead of one `job-age` request per card.
+
+    The ids are passed as `?ids=1,2,3`, at most `batch.MAX_BATCH_SIZE` of them. Jobs are returned in the
+    order of the ids and unknown ids are listed under `missing`. The jobs are read from per job cache
+    entries and the ones missing from the cache with a single query, see src.job.batch.
+    """
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('ids', openapi.IN_QUERY, "Comma separated job ids", type=openapi.TYPE_STRING, required=True),
+        ],
+        responses={200: BatchJobSerializer(many=True)},
+    )
+    def get(self, request):
+        ids = [job_id.strip() for job_id in request.query_params.get('ids', '').split(',') if job_id.strip()]
+        # str.isdigit() also accepts digits such as '²' which int() rejects
+        if not ids or not all(re.fullmatch(r'[0-9]+', job_id) for job_id in ids):
+            raise ValidationError({'ids': 'A comma separated list of job ids is required.'})
+        job_ids = list(dict.fromkeys(int(job_id) for job_id in ids))
+        if len(job_ids) > batch.MAX_BATCH_SIZE:
+            raise ValidationError({'ids': f'At most {batch.MAX_BATCH_SIZE} jobs can be looked up at once.'})
+
+        jobs = batch.get_jobs(job_ids)
+        found = {job['id'] for job in jobs}
+        return Response(
+            {
+                'results': BatchJobSerializer(jobs, many=True).data,
+                'missing': [job_id for job_id in job_ids if job_id not in found],
+            }
+        )
+
+
+class SearchJob(EagerLoadingMixin, generics.ListAPIView):
     """This is a Django REST Framework view for handling HTTP requests for searching and retrieving
      a list of job resources based on a search query.
 
     The SearchJob class is a subclass of generics.ListAPIView, which is a generic view that provides the
     implementation for the HTTP GET method for listing resources.
 
-    The search_fields attribute specifies the fields that can be searched using the search query. In this
-    case, the name and description fields of the Job model can be searched.
-
     The filter_backends attribute specifies the filter backends that will be used to filter the results
-    based on the search query. In this case, the SearchFilter backend is used.
+    based on the search query. In this case, the JobSearchFilter backend is used, which runs a postgres
+    full-text search over the weighted name and description document of each job and ranks the hits.
 
     The queryset attribute specifies the set of Job objects that this view will handle. In this case,
     it's set to all jobs in the database.
@@ -128,16 +188,42 @@ class SearchJob(generics.ListAPIView):
     deserialize the job data. In this case, it's set to JobSerializer, which is presumably a custom
     serializer class defined elsewhere in the codebase.
 
-    When an HTTP GET request is made to this view, the SearchFilter backend will filter the Job objects
-    based on the search query specified in the query parameter. The filtered objects will be serialized
-    using the JobSerializer and returned in the HTTP response.
+    When an HTTP GET request is made to this view, the JobSearchFilter backend will filter the Job objects
+    based on the search query specified in the query parameter, matching every word as a prefix. The filtered
+    objects will be ordered by relevance, serialized using the JobSerializer and returned in the HTTP response.
+    Responses are cached per URL until a job, project, category or skill changes.
     """
 
-    search_fields = ['name', 'description']
-    filter_backends = (filters.SearchFilter,)
-    subquery = Project.objects.filter(job=OuterRef('pk')).values('job')
-    queryset = Job.objects.annotate(is_in_project=Subquery(subquery)).filter(is_in_project=None, is_draft=False)
+    filter_backends = (JobSearchFilter,)
+    queryset = Job.objects.filter(status=Job.Status.OPEN)
     serializer_class = JobSerializer
+    pagination_class = KeysetPagination
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter(
+                'facets', openapi.IN_QUERY, "Include category, budget, skill and duration counts", type=openapi.TYPE_BOOLEAN
+            ),
+        ],
+    )
+    @cache_response(JOBS_NAMESPACE)
+    def get(self, request, *args, **kwargs):
+        return self.list(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        """List the matching jobs, adding the facet counts of the whole result set when `facets=true`
+        is given. Facets are cached per search until jobs change, see src.job.facets.
+        """
+        response = super().list(request, *args, **kwargs)
+        if request.query_params.get('facets', '').lower() in ('1', 'true', 'yes'):
+            search_filter = JobSearchFilter()
+            tokens = sorted(set(get_search_tokens(search_filter.get_search_terms(request))))
+            facets = get_facets(self.filter_queryset(self.get_queryset()), digest(' '.join(tokens)))
+            if isinstance(response.data, dict):
+                response.data['facets'] = facets
+            else:
+                response.data = {'results': response.data, 'facets': facets}
+        return response
 
 
 class BidCreateApi(generics.ListCreateAPIView):
@@ -146,8 +232,10 @@ class BidCreateApi(generics.ListCreateAPIView):
     The BidCreateApi class is a subclass of generics.ListCreateAPIView, which is a generic view that provides the
     implementation for the HTTP GET and POST methods for listing and creating resources.
 
-    The queryset attribute specifies the set of Bid objects that this view will handle. In this case,
-    it's set to all bids in the database.
+    The listing is always scoped: an employer lists the bids on one of their jobs with `?job=<id>`, a job
+    seeker without that parameter lists their own bids. Both are served newest first with cursor pagination
+    from the composite `(job, created_at, id)` and `(job_seeker, created_at, id)` indexes, and the total
+    asked for with `?count=true` comes from the bids per job rollup or an index-only count.
 
     The serializer_class attribute specifies the serializer class that will be used to serialize and
     deserialize the bid data. In this case, it's set to BidSerializer, which is presumably a custom
@@ -157,24 +245,86 @@ class BidCreateApi(generics.ListCreateAPIView):
     in order to access the view. In this case, it requires that the user be authenticated, meaning that
     only authenticated users can create or list bid resources.
 
-    When an HTTP GET request is made to this view, all Bid objects in the queryset will be serialized
-    using the BidSerializer and returned in the HTTP response.
-
     When an HTTP POST request is made to this view, the posted bid data will be deserialized using the
-    BidSerializer, and a new Bid object will be created in the database with the deserialized data.
-    The created bid object will be serialized using the BidSerializer and returned in the HTTP response."""
+    BidSerializer and submitted as the requesting job seeker's bid on the job: a job seeker has a single
+    bid per job, so posting again updates that bid (200) instead of adding another one (201), and an
+    unchanged resubmission writes nothing. A request sent with an `Idempotency-Key` header is answered
+    once and its response is replayed to retries with the same key, see src.common.idempotency.
+    The submission locks only the seeker's own bid row, never the job, and the bids per job rollup and
+    the cached ranking are only touched when a bid is actually created or changed."""
 
     queryset = Bid.objects.all()
     serializer_class = BidSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    scope_job_id = None
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('job', openapi.IN_QUERY, "Id of one of your jobs, to list its bids", type=openapi.TYPE_INTEGER),
+        ],
+    )
+    def get(self, request, *args, **kwargs):
+        return self.list(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter(
+                'Idempotency-Key',
+                openapi.IN_HEADER,
+                "Unique key of the submission, retries replay the response",
+                type=openapi.TYPE_STRING,
+            ),
+        ],
+    )
+    @idempotent
+    def post(self, request, *args, **kwargs):
+        return self.create(request, *args, **kwargs)
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        fields = dict(serializer.validated_data)
+        job, job_seeker = fields.pop('job'), fields.pop('job_seeker')
+        if str(job_seeker.user_id) != str(request.user.pk):
+            raise PermissionDenied('You can only submit your own bids.')
+        bid, created = Bid.objects.submit(job, job_seeker, **fields)
+        return Response(self.get_serializer(bid).data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+    def get_queryset(self):
+        if self.request.method != 'GET':
+            return super().get_queryset()
+
+        job_id = self.request.query_params.get('job')
+        if job_id is not None:
+            if not re.fullmatch(r'[0-9]+', job_id):
+                raise ValidationError({'job': 'A valid integer is required.'})
+            get_object_or_404(Job.objects.only('id'), pk=job_id, employer__user=self.request.user)
+            self.scope_job_id = int(job_id)
+            return Bid.objects.filter(job_id=self.scope_job_id)
+
+        job_seeker_id = Job_Seeker.objects.filter(user=self.request.user).values_list('id', flat=True).first()
+        if job_seeker_id is None:
+            raise ValidationError({'job': 'Pass the id of one of your jobs to list its bids.'})
+        return Bid.objects.filter(job_seeker_id=job_seeker_id)
+
+    def get_count(self, queryset):
+        if self.scope_job_id is not None:
+            count = JobBidCount.objects.filter(pk=self.scope_job_id).values_list('count', flat=True).first()
+            if count is not None:
+                return count
+        return queryset.count()
 
 
 class BidUpdateApi(generics.RetrieveUpdateDestroyAPIView):
+    """This view retrieves, updates and withdraws one of the requesting job seeker's own bids."""
 
-    queryset = Bid.objects.all()
     serializer_class = BidSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def get_queryset(self):
+        return Bid.objects.filter(job_seeker__user=self.request.user)
+
 
 class ShortlistApi(generics.RetrieveUpdateAPIView):
     queryset = Bid.objects.all()
@@ -182,43 +332,49 @@ class ShortlistApi(generics.RetrieveUpdateAPIView):
     permission_classes = [IsEmployer]
 
 
-class LargeResultsSetPagination(PageNumberPagination):
-    page_size = 2
-    page_size_query_param = 'page_size'
-    max_page_size = 10
-
-
-class JobApi(generics.ListCreateAPIView):
+class JobApi(EagerLoadingMixin, generics.ListCreateAPIView):
 
-    subquery = Project.objects.filter(job=OuterRef('pk')).values('job')
-    queryset = Job.objects.annotate(is_in_project=Subquery(subquery)).filter(is_in_project=None, is_draft=False)
+    queryset = Job.objects.filter(status=Job.Status.OPEN)
     serializer_class = JobSerializer
     permission_classes = [permissions.IsAuthenticated, IsEmployer]
-    pagination_class = LargeResultsSetPagination
+    pagination_class = KeysetPagination
 
 
-class BidsPerJob(APIView):
+class BidsPerJob(EagerLoadingMixin, generics.ListAPIView):
     """This code defines a Django Rest Framework API view named BidsPerJob.
-    The view handles GET requests and returns a serialized representation of the number of bids per job.
+    The view handles GET requests and returns a paginated list of the number of bids per job.
+
+    The counts are read from the `JobBidCount` rollup table, keyed by job id, which is kept up to date
+    as bids are placed and withdrawn. The rows are ordered by count, descending by default; pass
+    `ordering=count` to reverse it. Jobs with the same count are ordered by id.
     """
 
-    def get(self, request):
-        data = Bid.objects.values('job__name').annotate(count=Count('id'))
-        serializer = BidperJobSerializer(data=data, many=True)
-        if serializer.is_valid():
-            pass
-        return Response(serializer.data)
+    queryset = JobBidCount.objects.filter(count__gt=0)
+    serializer_class = BidperJobSerializer
+    filter_backends = [StableOrderingFilter]
+    ordering_fields = ['count']
+    ordering = ['-count']
 
 
 class ProjectApi(APIView):  # (generics.ListCreateAPIView):
     """This code defines a Django Rest Framework API view named ProjectApi with two methods: get() and post().
     The view handles GET and POST requests for a Project model.
+
+    A GET with `?export=ndjson` or `?export=csv` streams the projects as a file instead, reading them
+    with a server-side cursor, see src.common.exports.
     """
 
     permission_classes = [permissions.IsAuthenticated]
     # queryset = Project.objects.all()
     # serializer_class = ProjectSerializer
 
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter(
+                'export', openapi.IN_QUERY, "Stream the projects as a file", type=openapi.TYPE_STRING, enum=['ndjson', 'csv']
+            ),
+        ],
+    )
     def get(self, request):
         """This code defines a GET method for a Django Rest Framework API view that retrieves all
         instances of the Project model from the database, serializes them using the ProjectSerializer,
@@ -230,10 +386,11 @@ class ProjectApi(APIView):  # (generics.ListCreateAPIView):
         Returns:
             projects(json_object): all projects available in project table
         """
-        data = Project.objects.all()
-        serializer = ProjectSerializer(data=data, many=True)
-        if serializer.is_valid():
-            pass
+        projects = Project.objects.order_by('id')
+        export = exports.get_export_format(request)
+        if export:
+            return exports.stream_export(projects, ProjectSerializer, export, 'projects')
+        serializer = ProjectSerializer(projects, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
@@ -261,3 +418,192 @@ class ProjectApi(APIView):  # (generics.ListCreateAPIView):
             serializer.save()
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(status=status.HTTP_400_BAD_REQUEST)
+
+
+class RecommendedJobs(APIView):
+    """This view returns the open jobs which best match the skills of the requesting job seeker.
+
+    Jobs are ranked by the recommendation engine in src.job.recommendations, which scores candidates from
+    an inverted skill index kept in the cache (skill overlap, recency and budget) instead of joining the
+    skill tables on every request. The number of jobs is set with the `limit` query parameter.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsJobSeeker]
+    default_limit = 20
+    max_limit = 100
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('limit', openapi.IN_QUERY, "Number of jobs to return", type=openapi.TYPE_INTEGER),
+        ],
+        responses={200: RecommendedJobSerializer(many=True)},
+    )
+    def get(self, request):
+        try:
+            limit = min(max(int(request.query_params.get('limit', self.default_limit)), 1), self.max_limit)
+        except ValueError:
+            return Response({'limit': 'A valid integer is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        job_seeker = get_object_or_404(Job_Seeker, user=request.user)
+        scores = recommendations.recommend_jobs(job_seeker.id, limit)
+        jobs = setup_eager_loading(Job.objects.filter(status=Job.Status.OPEN), RecommendedJobSerializer).in_bulk(
+            [job_id for job_id, _ in scores]
+        )
+        results = []
+        for job_id, score in scores:
+            if job_id in jobs:
+                jobs[job_id].score = round(score, 4)
+                results.append(jobs[job_id])
+        return Response(RecommendedJobSerializer(results, many=True).data)
+
+
+class JobImport(APIView):
+    """This view imports many jobs of the requesting employer at once, e.g. from an applicant tracking system.
+
+    The request body is a CSV file with a header line (`name,description,category,budget,duration,is_draft,skill`,
+    skills separated by `;`) sent as `text/csv`, or one JSON object per line sent as `application/x-ndjson`.
+    The body is read as a stream and imported in batches, see src.job.imports. Invalid rows are skipped and
+    reported by row number in the response, they do not stop the import of the other rows.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsEmployer]
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('batch_size', openapi.IN_QUERY, "Rows written per transaction", type=openapi.TYPE_INTEGER),
+        ],
+    )
+    def post(self, request):
+        format = imports.CONTENT_TYPES.get(request.content_type.split(';')[0].strip())
+        if format is None:
+            return Response(
+                {'detail': f'Send the jobs as one of {", ".join(imports.CONTENT_TYPES)}.'},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+        try:
+            batch_size = min(max(int(request.query_params.get('batch_size', imports.BATCH_SIZE)), 1), imports.BATCH_SIZE)
+        except ValueError:
+            return Response({'batch_size': 'A valid integer is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        employer = get_object_or_404(Employer, user=request.user)
+        # iterate over the request body line by line instead of loading it whole
+        lines = codecs.iterdecode(request.stream or [], request.encoding or 'utf-8')
+        try:
+            report = imports.import_jobs(imports.parse_rows(lines, format), employer, batch_size=batch_size)
+        except imports.UnreadableImport as error:
+            return Response(dict(error.report, detail=str(error)), status=status.HTTP_400_BAD_REQUEST)
+        if report['created']:
+            return Response(report, status=status.HTTP_201_CREATED)
+        return Response(report, status=status.HTTP_400_BAD_REQUEST if report['failed'] else status.HTTP_200_OK)
+
+
+class RankedBids(APIView):
+    """This view lists the bids on one of the requesting employer's jobs, best first, to help build the shortlist.
+
+    Bids are scored by src.job.ranking on their amount against the budget, the days needed against the
+    last date of the job, the bidder's average rating and the bidder's share of the required skills. The
+    ranking of a job is cached and updated bid by bid, so listing a popular job does not rescore every bid.
+    Pages are selected with the `limit` and `offset` query parameters.
+
+    A POST shortlists the `count` best ranked bids in a single update.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsEmployer]
+    default_limit = 20
+    max_limit = 100
+    max_shortlist = 100
+
+    def get_ranking(self, request, pk):
+        get_object_or_404(Job.objects.only('id'), pk=pk, employer__user=request.user)
+        return ranking.get_ranking(pk)
+
+    def get_int_param(self, data, name, default, maximum, minimum=1):
+        try:
+            return min(max(int(data.get(name, default)), minimum), maximum)
+        except (TypeError, ValueError):
+            return None
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('limit', openapi.IN_QUERY, "Number of bids to return", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('offset', openapi.IN_QUERY, "Number of best bids to skip", type=openapi.TYPE_INTEGER),
+        ],
+        responses={200: RankedBidSerializer(many=True)},
+    )
+    def get(self, request, pk):
+        limit = self.get_int_param(request.query_params, 'limit', self.default_limit, self.max_limit)
+        offset = self.get_int_param(request.query_params, 'offset', 0, 10**9, minimum=0)
+        if limit is None or offset is None:
+            return Response({'detail': 'limit and offset must be integers.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        job_ranking = self.get_ranking(request, pk)
+        page = job_ranking['ranked'][offset : offset + limit]
+        bids = Bid.objects.in_bulk([bid_id for _, bid_id in page])
+        results = []
+        for _, bid_id in page:
+            if bid_id in bids:
+                score, components = ranking.score_components(job_ranking, bid_id)
+                bids[bid_id].score = round(score, 4)
+                bids[bid_id].components = {name: round(value, 4) for name, value in components.items()}
+                results.append(bids[bid_id])
+        return Response({'count': len(job_ranking['ranked']), 'results': RankedBidSerializer(results, many=True).data})
+
+    @swagger_auto_schema(
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={'count': openapi.Schema(type=openapi.TYPE_INTEGER, description="Number of best bids to shortlist")},
+        ),
+    )
+    def post(self, request, pk):
+        count = self.get_int_param(request.data, 'count', None, self.max_shortlist)
+        if count is None:
+            return Response({'count': 'A valid integer is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        bid_ids = [bid_id for _, bid_id in self.get_ranking(request, pk)['ranked'][:count]]
+        shortlisted = Bid.objects.filter(job_id=pk, pk__in=bid_ids).update(is_shortlisted=True)
+        feed.publish_shortlisted(pk, bid_ids)
+        dashboard.forget_dashboard(Job.objects.filter(pk=pk).values_list('employer_id', flat=True).first())
+        return Response({'shortlisted': shortlisted, 'bids': bid_ids})
+
+
+class BidFeed(APIView):
+    """This view serves the bids on the requesting employer's jobs as they come in, so the bid listings
+    do not need to be fetched again. `/job/<pk>/bid-feed/` follows one job and `/job/bid-feed/` all the jobs of
+    the employer. Events are published by src.job.feed when a bid is created, changed or shortlisted.
+
+    The view answers at once with the events after the `cursor` query parameter and the cursor to pass
+    next, so clients poll every few seconds and only the missed events are replayed after a reconnect.
+    Without a cursor only events published from then on are returned. It never waits for events, a
+    waiting request would hold one of the few sync gunicorn workers.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsEmployer]
+
+    def get_stream(self, request, pk):
+        if pk is None:
+            employer_id = Employer.objects.filter(user=request.user).values_list('id', flat=True).first()
+            return feed.EMPLOYER_STREAM.format(employer_id)
+        get_object_or_404(Job.objects.only('id'), pk=pk, employer__user=request.user)
+        return feed.JOB_STREAM.format(pk)
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('cursor', openapi.IN_QUERY, "Id of the last event received", type=openapi.TYPE_STRING),
+        ],
+    )
+    def get(self, request, pk=None):
+        stream = self.get_stream(request, pk)
+        cursor = request.query_params.get('cursor')
+        if cursor is not None and not events.is_event_id(cursor):
+            raise ValidationError({'cursor': 'A valid event id is required.'})
+        broker = events.get_broker()
+        if cursor is None:
+            cursor = broker.get_last_id(stream)
+        # an unavailable broker answers no cursor and no events, the client polls again without a cursor
+        entries = broker.read(stream, cursor) if cursor is not None else []
+        return Response(
+            {
+                'cursor': entries[-1][0] if entries else cursor,
+                'events': [dict(event, id=event_id) for event_id, event in entries],
+            }
+        )
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class JobSeekerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'src.job_seeker'
+
+    def ready(self):
+        # register the signal receivers which keep the rating aggregates in sync
+        from src.job_seeker import reputation  # noqa: F401
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.12 on 2026-10-18 12:56
+
+from django.db import migrations, models
+
+
+def merge_duplicate_skills(apps, schema_editor):
+    """Point the links of duplicate skill names at the oldest skill of that name and delete the duplicates"""
+    Skill = apps.get_model('job_seeker', 'Skill')
+    Through = apps.get_model('job_seeker', 'Job_Seeker')._meta.get_field('skill').remote_field.through
+    kept = {}
+    duplicates = {}
+    for pk, name in Skill.objects.order_by('id').values_list('id', 'skill'):
+        if name in kept:
+            duplicates[pk] = kept[name]
+        else:
+            kept[name] = pk
+    for duplicate, original in duplicates.items():
+        owner_ids = Through.objects.filter(skill_id=duplicate).values_list('job_seeker_id', flat=True)
+        Through.objects.bulk_create(
+            [Through(job_seeker_id=owner_id, skill_id=original) for owner_id in owner_ids], ignore_conflicts=True
+        )
+    Skill.objects.filter(id__in=list(duplicates)).delete()
+
+
+class Migration(migrations.Migration):
+    # commit the merge before altering the table, postgres refuses to alter it with pending FK checks
+    atomic = False
+
+    dependencies = [
+        ('job_seeker', '0006_auto_20230209_1127'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_skills, migrations.RunPython.noop, atomic=True),
+        migrations.AddConstraint(
+            model_name='skill',
+            constraint=models.UniqueConstraint(fields=('skill',), name='unique_seeker_skill'),
+        ),
+    ]
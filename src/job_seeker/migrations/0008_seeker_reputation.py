@@ -0,0 +1,74 @@
+# Generated by Django 3.2.12 on 2026-10-18 13:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+import src.job_seeker.models
+
+RECENT_FEEDBACK_SIZE = 5
+
+
+def fill_reputations(apps, schema_editor):
+    Job_Seeker = apps.get_model('job_seeker', 'Job_Seeker')
+    SeekerReputation = apps.get_model('job_seeker', 'SeekerReputation')
+    Rating = apps.get_model('job', 'Rating')
+    reputations = {
+        pk: SeekerReputation(job_seeker_id=pk, distribution=[0] * 5) for pk in Job_Seeker.objects.values_list('pk', flat=True)
+    }
+    ratings = Rating.objects.order_by('job_seeker_id', '-created_at', '-id').values_list(
+        'id', 'job_seeker_id', 'rating', 'feedback', 'job_id', 'employer_id', 'created_at'
+    )
+    for pk, job_seeker_id, rating, feedback, job_id, employer_id, created_at in ratings.iterator():
+        reputation = reputations[job_seeker_id]
+        reputation.rating_count += 1
+        reputation.rating_sum += rating
+        reputation.distribution[min(max(int(round(rating)), 1), 5) - 1] += 1
+        if feedback and len(reputation.recent_feedback) < RECENT_FEEDBACK_SIZE:
+            reputation.recent_feedback.append(
+                {
+                    'id': pk,
+                    'rating': rating,
+                    'feedback': feedback,
+                    'job': job_id,
+                    'employer': employer_id,
+                    'created_at': created_at.isoformat() if created_at else None,
+                }
+            )
+    for reputation in reputations.values():
+        reputation.rating_mean = reputation.rating_sum / reputation.rating_count if reputation.rating_count else 0.0
+    SeekerReputation.objects.bulk_create(reputations.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_seeker', '0007_unique_seeker_skill'),
+        ('job', '0017_rating_seeker_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeekerReputation',
+            fields=[
+                (
+                    'job_seeker',
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name='reputation',
+                        serialize=False,
+                        to='job_seeker.job_seeker',
+                    ),
+                ),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.FloatField(default=0)),
+                ('rating_mean', models.FloatField(default=0)),
+                ('distribution', models.JSONField(default=src.job_seeker.models.empty_distribution)),
+                ('recent_feedback', models.JSONField(default=list)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='seekerreputation',
+            index=models.Index(fields=['-rating_mean', '-rating_count'], name='seeker_reputation_rank_idx'),
+        ),
+        migrations.RunPython(fill_reputations, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from phone_field import PhoneField
 
+from src.common.skills import SkillResolver
 from src.users.models import TimeStampAbstractModel, User
 
 
@@ -19,10 +20,17 @@ class Skill(TimeStampAbstractModel):
 
     skill = models.CharField(max_length=50)
 
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['skill'], name='unique_seeker_skill')]
+
     def __str__(self) -> str:
         return self.skill
 
 
+skill_resolver = SkillResolver(Skill)
+'''SkillResolver: resolves skill names of job seekers to Skill ids'''
+
+
 class Job_Seeker(TimeStampAbstractModel):
     """This model represents job seekers, and the fields correspond to information that is typically
     associated with job seekers, such as their education, experience, phone number, and skills.
@@ -45,3 +53,31 @@ class Job_Seeker(TimeStampAbstractModel):
 
     def __str__(self) -> str:
         return self.user.username
+
+
+def empty_distribution():
+    return [0] * 5
+
+
+class SeekerReputation(models.Model):
+    """This model holds the rating aggregates of a job seeker. It is kept up to date incrementally whenever
+    a rating of the job seeker is created, changed or deleted (see src.job_seeker.reputation), so showing
+    or sorting by the average rating of job seekers never aggregates the ratings table.
+    """
+
+    job_seeker = models.OneToOneField(Job_Seeker, on_delete=models.CASCADE, primary_key=True, related_name='reputation')
+    '''a one-to-one field to the rated job seeker, also the primary key.'''
+    rating_count = models.PositiveIntegerField(default=0)
+    '''a positive integer field holding the number of ratings of the job seeker.'''
+    rating_sum = models.FloatField(default=0)
+    '''a float field holding the sum of the ratings, from which the mean is updated.'''
+    rating_mean = models.FloatField(default=0)
+    '''a float field holding the average rating, 0 for a job seeker who was never rated.'''
+    distribution = models.JSONField(default=empty_distribution)
+    '''a JSON list with the number of ratings rounded to 1, 2, 3, 4 and 5 stars.'''
+    recent_feedback = models.JSONField(default=list)
+    '''a JSON list of the latest ratings with feedback, newest first, each with its id, rating, feedback,
+    job, employer and creation time.'''
+
+    class Meta:
+        indexes = [models.Index(fields=['-rating_mean', '-rating_count'], name='seeker_reputation_rank_idx')]
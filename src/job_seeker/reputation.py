@@ -0,0 +1,152 @@
+"""Running rating aggregates of job seekers.
+
+Every write of a `Rating` adjusts the `SeekerReputation` row of the rated job seeker in the same
+transaction: the count, sum and mean, the star distribution and the list of recent feedback. The row
+is locked while it is adjusted, so concurrent ratings of one job seeker are applied one after the
+other. `rebuild` recomputes rows from the ratings table, a batch of job seekers at a time.
+"""
+import itertools
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from src.job.models import Rating
+from src.job_seeker.models import Job_Seeker, SeekerReputation, empty_distribution
+
+RECENT_FEEDBACK_SIZE = 5
+REBUILD_BATCH_SIZE = 500
+'''int: job seekers whose reputation `rebuild` recomputes per transaction'''
+
+
+def get_star(rating):
+    '''Index of a rating in the distribution, ratings are rounded to 1 to 5 stars'''
+    return min(max(int(round(rating)), 1), 5) - 1
+
+
+def feedback_entry(rating):
+    return {
+        'id': rating.pk,
+        'rating': rating.rating,
+        'feedback': rating.feedback,
+        'job': rating.job_id,
+        'employer': rating.employer_id,
+        'created_at': rating.created_at.isoformat() if rating.created_at else None,
+    }
+
+
+def get_recent_feedback(job_seeker_id):
+    ratings = Rating.objects.filter(job_seeker_id=job_seeker_id).exclude(feedback__isnull=True).exclude(feedback='')
+    return [feedback_entry(rating) for rating in ratings.order_by('-created_at', '-id')[:RECENT_FEEDBACK_SIZE]]
+
+
+def add_rating(reputation, value, sign):
+    reputation.rating_count += sign
+    reputation.rating_sum = reputation.rating_sum + sign * value if reputation.rating_count else 0.0
+    reputation.rating_mean = reputation.rating_sum / reputation.rating_count if reputation.rating_count else 0.0
+    reputation.distribution[get_star(value)] += sign
+
+
+def update_reputation(job_seeker_id, added=None, removed=None, rating=None, created=False):
+    """Apply a rating change to the reputation of a job seeker
+
+    Args:
+        job_seeker_id (int): rated job seeker
+        added (float): rating value to add, if any
+        removed (float): rating value to remove, if any
+        rating (Rating): the written rating, whose feedback may enter the recent feedback list
+        created (bool): whether the rating is new, and so the newest one of the job seeker
+    """
+    with transaction.atomic():
+        reputation, _ = SeekerReputation.objects.select_for_update().get_or_create(job_seeker_id=job_seeker_id)
+        if removed is not None:
+            add_rating(reputation, removed, -1)
+        if added is not None:
+            add_rating(reputation, added, 1)
+
+        recent_ids = {entry['id'] for entry in reputation.recent_feedback}
+        if created and rating.feedback:
+            reputation.recent_feedback = [feedback_entry(rating)] + reputation.recent_feedback[: RECENT_FEEDBACK_SIZE - 1]
+        elif rating is not None and (rating.pk in recent_ids or rating.feedback):
+            reputation.recent_feedback = get_recent_feedback(job_seeker_id)
+        reputation.save()
+
+
+def rebuild_batch(job_seeker_ids):
+    """Recompute the reputation of a batch of job seekers with a few queries, whatever the batch size
+
+    The existing rows are locked first, so ratings written meanwhile wait for the rebuilt rows instead of
+    being overwritten by them.
+    """
+    with transaction.atomic():
+        existing = set(
+            SeekerReputation.objects.select_for_update()
+            .filter(job_seeker_id__in=job_seeker_ids)
+            .order_by('pk')
+            .values_list('pk', flat=True)
+        )
+        reputations = {
+            job_seeker_id: SeekerReputation(job_seeker_id=job_seeker_id, distribution=empty_distribution(), recent_feedback=[])
+            for job_seeker_id in job_seeker_ids
+        }
+
+        counts = Rating.objects.filter(job_seeker_id__in=job_seeker_ids).values_list('job_seeker_id', 'rating')
+        for job_seeker_id, value, count in counts.annotate(count=Count('id')).order_by():
+            reputation = reputations[job_seeker_id]
+            reputation.rating_count += count
+            reputation.rating_sum += value * count
+            reputation.distribution[get_star(value)] += count
+        for reputation in reputations.values():
+            reputation.rating_mean = reputation.rating_sum / reputation.rating_count if reputation.rating_count else 0.0
+
+        feedback = Rating.objects.filter(job_seeker_id__in=job_seeker_ids).exclude(feedback__isnull=True).exclude(feedback='')
+        for rating in feedback.order_by('job_seeker_id', '-created_at', '-id').iterator():
+            recent_feedback = reputations[rating.job_seeker_id].recent_feedback
+            if len(recent_feedback) < RECENT_FEEDBACK_SIZE:
+                recent_feedback.append(feedback_entry(rating))
+
+        fields = ['rating_count', 'rating_sum', 'rating_mean', 'distribution', 'recent_feedback']
+        SeekerReputation.objects.bulk_update([reputations[pk] for pk in existing], fields)
+        SeekerReputation.objects.bulk_create(
+            [reputation for pk, reputation in reputations.items() if pk not in existing], ignore_conflicts=True
+        )
+
+
+def rebuild(job_seeker_ids=None):
+    """Recompute the reputation of the given job seekers (all of them by default) from their ratings"""
+    job_seekers = Job_Seeker.objects.all() if job_seeker_ids is None else Job_Seeker.objects.filter(pk__in=job_seeker_ids)
+    pks = job_seekers.order_by('pk').values_list('pk', flat=True).iterator()
+    while True:
+        batch = list(itertools.islice(pks, REBUILD_BATCH_SIZE))
+        if not batch:
+            return
+        rebuild_batch(batch)
+
+
+@receiver(post_save, sender=Job_Seeker)
+def create_reputation(sender, instance, created, **kwargs):
+    if created:
+        SeekerReputation.objects.get_or_create(job_seeker=instance)
+
+
+@receiver(post_save, sender=Rating)
+def record_rating(sender, instance, created, **kwargs):
+    if created:
+        update_reputation(instance.job_seeker_id, added=instance.rating, rating=instance, created=True)
+        return
+
+    old_job_seeker_id = instance.get_loaded_value('job_seeker_id')
+    old_rating = instance.get_loaded_value('rating')
+    if old_job_seeker_id != instance.job_seeker_id:
+        update_reputation(old_job_seeker_id, removed=old_rating, rating=instance)
+        update_reputation(instance.job_seeker_id, added=instance.rating, rating=instance)
+    elif old_rating != instance.rating or instance.get_loaded_value('feedback') != instance.feedback:
+        update_reputation(instance.job_seeker_id, added=instance.rating, removed=old_rating, rating=instance)
+
+
+@receiver(post_delete, sender=Rating)
+def forget_rating(sender, instance, **kwargs):
+    job_seeker_id = instance.get_loaded_value('job_seeker_id')
+    if SeekerReputation.objects.filter(job_seeker_id=job_seeker_id).exists():
+        update_reputation(job_seeker_id, removed=instance.get_loaded_value('rating'), rating=instance)
@@ -1,6 +1,7 @@
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
 
-from src.job_seeker.models import Job_Seeker, Skill
+from src.job_seeker.models import Job_Seeker, SeekerReputation, Skill, skill_resolver
 
 
 class SeekerSkillSerializer(serializers.ModelSerializer):
@@ -14,6 +15,33 @@ class SeekerSkillSerializer(serializers.ModelSerializer):
     class Meta:
         model = Skill
         fields = ['skill']
+        # nested skill names are resolved to existing skills, see SkillResolver
+        extra_kwargs = {'skill': {'validators': []}}
+
+
+class UniqueSeekerSkillSerializer(SeekerSkillSerializer):
+    """This serializer is the SeekerSkillSerializer for creating and renaming a single Skill,
+    where a name which is already taken is rejected instead of being resolved to the existing skill.
+    """
+
+    class Meta(SeekerSkillSerializer.Meta):
+        extra_kwargs = {'skill': {'validators': [UniqueValidator(queryset=Skill.objects.all())]}}
+
+
+class SeekerReputationSerializer(serializers.ModelSerializer):
+    """This is a read-only serializer for the rating aggregates of a job seeker: the number of ratings,
+    the average rating, the distribution of the ratings over 1 to 5 stars and the latest feedback.
+    """
+
+    distribution = serializers.SerializerMethodField()
+
+    def get_distribution(self, reputation):
+        return {str(stars): count for stars, count in enumerate(reputation.distribution, start=1)}
+
+    class Meta:
+        model = SeekerReputation
+        fields = ['rating_count', 'rating_mean', 'distribution', 'recent_feedback']
+        read_only_fields = fields
 
 
 class Job_SeekerSerializer(serializers.ModelSerializer):
@@ -24,28 +52,27 @@ class Job_SeekerSerializer(serializers.ModelSerializer):
 
     The many=True argument in the skill field indicates that this field is a many-to-many relationship,
     meaning a Job_Seeker instance can have multiple Skill instances associated with it.
+
+    The read-only reputation field holds the rating aggregates of the job seeker, see SeekerReputationSerializer.
     """
 
     skill = SeekerSkillSerializer(many=True)
+    reputation = SeekerReputationSerializer(read_only=True)
 
     def create(self, validated_data):
         skills = validated_data.pop('skill')
         job_seeker = super().create(validated_data)
-        for skill in skills:
-            instance, created = Skill.objects.get_or_create(skill=skill['skill'])
-            job_seeker.skill.add(instance)
+        skill_resolver.set_skills(job_seeker.skill, [skill['skill'] for skill in skills])
         return job_seeker
 
     def update(self, instance, validated_data):
-        skills = validated_data.pop('skill')
+        skills = validated_data.pop('skill', None)
         job_seeker = super().update(instance, validated_data)
-        job_seeker.skill.clear()
-        for skill in skills:
-            instance, created = Skill.objects.get_or_create(skill=skill['skill'])
-            job_seeker.skill.add(instance)
+        if skills is not None:
+            skill_resolver.set_skills(job_seeker.skill, [skill['skill'] for skill in skills])
         return job_seeker
 
     class Meta:
         model = Job_Seeker
         # depth = 1
-        fields = ['user', 'education', 'experience', 'phone', 'skill']
+        fields = ['user', 'education', 'experience', 'phone', 'skill', 'reputation']
@@ -0,0 +1,8 @@
+from celery import task
+
+from src.job_seeker import reputation
+
+
+@task(name='RebuildReputationsTask')
+def rebuild_reputations_task():
+    reputation.rebuild()
@@ -0,0 +1,87 @@
+from nose.tools import eq_
+from rest_framework.test import APITestCase
+
+from src.job.models import Rating
+from src.job.test.factories import EmployerFactory, JobFactory, JobSeekerFactory
+from src.job_seeker import reputation
+from src.job_seeker.models import SeekerReputation
+
+
+class TestSeekerReputationTestCase(APITestCase):
+    """
+    Tests the rating aggregates of job seekers and their exposure on the seeker endpoints.
+    """
+
+    def setUp(self):
+        self.employer = EmployerFactory()
+        self.job = JobFactory(employer=self.employer)
+        self.job_seeker = JobSeekerFactory()
+
+    def rate(self, rating, feedback=None, job_seeker=None):
+        return Rating.objects.create(
+            employer=self.employer, job_seeker=job_seeker or self.job_seeker, job=self.job, rating=rating, feedback=feedback
+        )
+
+    def reputation(self):
+        return SeekerReputation.objects.get(pk=self.job_seeker.pk)
+
+    def test_aggregates_follow_rating_writes(self):
+        first = self.rate(4, 'Good work')
+        second = self.rate(2)
+        self.rate(5, 'Excellent')
+        eq_((self.reputation().rating_count, round(self.reputation().rating_mean, 4)), (3, 3.6667))
+        eq_(self.reputation().distribution, [0, 1, 0, 1, 1])
+        eq_([entry['feedback'] for entry in self.reputation().recent_feedback], ['Excellent', 'Good work'])
+
+        second.rating = 5
+        second.save()
+        eq_((self.reputation().rating_mean, self.reputation().distribution), (14 / 3, [0, 0, 0, 1, 2]))
+
+        first.delete()
+        eq_((self.reputation().rating_count, self.reputation().rating_mean), (2, 5.0))
+        eq_([entry['feedback'] for entry in self.reputation().recent_feedback], ['Excellent'])
+
+    def test_rebuild_matches_the_incremental_aggregates(self):
+        self.rate(3, 'Fine')
+        self.rate(4)
+        incremental = self.reputation()
+        SeekerReputation.objects.all().delete()
+        reputation.rebuild()
+        rebuilt = self.reputation()
+        eq_(
+            (rebuilt.rating_count, rebuilt.rating_mean, rebuilt.distribution, rebuilt.recent_feedback),
+            (incremental.rating_count, incremental.rating_mean, incremental.distribution, incremental.recent_feedback),
+        )
+
+    def test_rebuild_costs_the_same_queries_for_any_number_of_seekers(self):
+        others = [JobSeekerFactory() for _ in range(3)]
+        for index, other in enumerate(others):
+            self.rate(index + 1, f'Feedback {index}', job_seeker=other)
+        SeekerReputation.objects.filter(pk=others[0].pk).delete()
+        SeekerReputation.objects.filter(pk=others[1].pk).update(rating_count=7, rating_mean=1.5)
+        # select the seekers, then lock, count, read feedback, bulk update and bulk insert in a savepoint
+        with self.assertNumQueries(8):
+            reputation.rebuild()
+        eq_(
+            [
+                (row.rating_count, row.rating_mean, row.recent_feedback[0]['feedback'])
+                for row in SeekerReputation.objects.filter(pk__in=[other.pk for other in others]).order_by('rating_mean')
+            ],
+            [(1, 1.0, 'Feedback 0'), (1, 2.0, 'Feedback 1'), (1, 3.0, 'Feedback 2')],
+        )
+
+    def test_seekers_are_sortable_by_rating(self):
+        other = JobSeekerFactory()
+        self.rate(2)
+        self.rate(5, job_seeker=other)
+        response = self.client.get('/job-seeker/', {'ordering': '-reputation__rating_mean'})
+        results = response.data['results']
+        eq_([str(seeker['user']) for seeker in results[:2]], [str(other.user_id), str(self.job_seeker.user_id)])
+        eq_(results[0]['reputation']['distribution'], {'1': 0, '2': 0, '3': 0, '4': 0, '5': 1})
+
+    def test_equal_ratings_are_ordered_by_id(self):
+        others = [JobSeekerFactory() for _ in range(3)]
+        for other in others:
+            self.rate(4, job_seeker=other)
+        response = self.client.get('/job-seeker/', {'ordering': '-reputation__rating_mean', 'limit': 3})
+        eq_([str(seeker['user']) for seeker in response.data['results']], [str(other.user_id) for other in others])
@@ -2,10 +2,14 @@ from rest_framework import filters, generics, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from src.common import counters, exports
+from src.common.cache import cache_response
+from src.common.filters import StableOrderingFilter
+from src.common.views import EagerLoadingMixin
 from src.job.models import Project
 from src.job.serializers import ProjectSerializer
 from src.job_seeker.models import Job_Seeker, Skill
-from src.job_seeker.serializers import Job_SeekerSerializer, SeekerSkillSerializer
+from src.job_seeker.serializers import Job_SeekerSerializer, UniqueSeekerSkillSerializer
 from src.users.models import Address
 from src.users.serializers import AddressSerializer
 
@@ -14,7 +18,7 @@ from src.users.serializers import AddressSerializer
 # Create your views here.
 
 
-class Seekers(generics.ListCreateAPIView):
+class Seekers(EagerLoadingMixin, generics.ListCreateAPIView):
     """This is a Django class-based view for handling the creation and retrieval of "Job Seeker" objects.
      The view is using Django Rest Framework's generics.ListCreateAPIView class, which provides the ability
       to list and create instances of a model.
@@ -27,14 +31,21 @@ class Seekers(generics.ListCreateAPIView):
 
     The permission_classes attribute specifies the permission classes that should be applied to the view.
     It is set to [permissions.AllowAny], meaning that the view is accessible to anyone, including
-    unauthenticated users."""
+    unauthenticated users.
+
+    The job seekers can be sorted by their rating aggregates, e.g. `ordering=-reputation__rating_mean` lists
+    the top rated job seekers first, which reads the reputation index instead of averaging the ratings.
+    Job seekers with the same rating are ordered by id."""
 
     queryset = Job_Seeker.objects.all()
     serializer_class = Job_SeekerSerializer
     permission_classes = [permissions.AllowAny]
+    filter_backends = [StableOrderingFilter]
+    ordering_fields = ['reputation__rating_mean', 'reputation__rating_count', 'experience']
+    ordering = ['id']
 
 
-class SeekerUpdate(generics.RetrieveUpdateDestroyAPIView):
+class SeekerUpdate(EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     """This is a class-based view in Django Rest Framework (DRF) using the RetrieveUpdateDestroyAPIView
      class from the generics module. It defines a view for updating a Job_Seeker instance.
 
@@ -66,11 +77,11 @@ class SeekerSkillUpdate(generics.RetrieveUpdateDestroyAPIView):
     set to Skill.objects.all(), meaning that it will operate on all objects of the Skill model.
 
     The serializer_class attribute specifies the serializer class that should be used to serialize
-    the data for the view. It is set to SeekerSkillSerializer. This means that the view is using a
+    the data for the view. It is set to UniqueSeekerSkillSerializer. This means that the view is using a
     custom serializer class for the Skill model specifically for seekers."""
 
     queryset = Skill.objects.all()
-    serializer_class = SeekerSkillSerializer
+    serializer_class = UniqueSeekerSkillSerializer
 
 
 class SeekerSkill(generics.ListCreateAPIView):
@@ -82,33 +93,38 @@ class SeekerSkill(generics.ListCreateAPIView):
     Skill.objects.all(), meaning that it will operate on all objects of the Skill model.
 
     The serializer_class attribute specifies the serializer class that should be used to serialize the data
-    for the view. It is set to SeekerSkillSerializer. This means that the view is using a custom serializer
+    for the view. It is set to UniqueSeekerSkillSerializer. This means that the view is using a custom serializer
     class for the Skill model specifically for seekers.
     """
 
     queryset = Skill.objects.all()
-    serializer_class = SeekerSkillSerializer
+    serializer_class = UniqueSeekerSkillSerializer
 
 
 class Number_Of_Job_seekers(APIView):
     """
-    View to list all users in the system.
+    View to return the number of job seekers in the system.
     """
 
+    @cache_response(counters.COUNTERS_NAMESPACE)
     def get(self, request):
         """
-        Return a list of all users.
+        Return the number of job seekers, read from the maintained platform counters.
         """
-        no_of_job_seekers = Job_Seeker.objects.all().count()
+        no_of_job_seekers = counters.get_count(counters.JOB_SEEKERS)
         return Response({"Job_seekers count": no_of_job_seekers})
 
 
 class ProjectsApi(APIView):
+    """This view lists the projects of a job seeker. With `?export=ndjson` or `?export=csv` they are
+    streamed as a file instead, reading them with a server-side cursor, see src.common.exports."""
+
     def get(self, request, id):
-        data = Project.objects.filter(job_seeker=id)
-        serializer = ProjectSerializer(data=data, many=True)
-        if serializer.is_valid():
-            pass
+        projects = Project.objects.filter(job_seeker=id).order_by('id')
+        export = exports.get_export_format(request)
+        if export:
+            return exports.stream_export(projects, ProjectSerializer, export, f'projects-{id}')
+        serializer = ProjectSerializer(projects, many=True)
         return Response(serializer.data)
 
 
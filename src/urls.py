@@ -10,8 +10,10 @@ from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import (TokenObtainPairView,
                                             TokenRefreshView)
 
+from src.common.views import CacheStatistics
 from src.files.urls import files_router
 from src.social.views import complete_twitter_login, exchange_token
+from src.users.serializers import RoleTokenObtainPairSerializer
 from src.users.urls import users_router
 
 schema_view = get_schema_view(
@@ -39,7 +41,7 @@ urlpatterns = [
     url(r'^api/v1/password_reset/', include('django_rest_passwordreset.urls', namespace='password_reset')),
     # auth
     path('api-auth/', include('rest_framework.urls', namespace='rest_framework')),
-    path('api/v1/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('api/v1/token/', TokenObtainPairView.as_view(serializer_class=RoleTokenObtainPairSerializer), name='token_obtain_pair'),
     path('api/v1/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     # social login
     url('', include('social_django.urls', namespace='social')),
@@ -50,6 +52,7 @@ urlpatterns = [
     url(r'^swagger/$', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     url(r'^redoc/$', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
     url(r'^health/', include('health_check.urls')),
+    path('cache/stats/', CacheStatistics.as_view()),
     # the 'api-root' from django rest-frameworks default router
     re_path(r'^$', RedirectView.as_view(url=reverse_lazy('api-root'), permanent=False)),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -4,6 +4,11 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     name = 'src.users'
 
+    def ready(self):
+        # register the receivers which drop the cached users of the JWT authentication and render the
+        # thumbnails of profile pictures
+        from src.users import authentication, thumbnails  # noqa: F401
+
     # actstream register model
     # def ready(self):
     #     from actstream import registry
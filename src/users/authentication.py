@@ -0,0 +1,83 @@
+"""JWT authentication which resolves the token's user from a cache instead of the users table.
+
+The user of a validated access token is looked up in two tiers keyed by user id and token `jti`: a
+small process-local LRU with a timeout of a few seconds, then the shared cache with a short timeout,
+and only then the database. Saving a user (which covers deactivation) moves the user's shared entries
+to a new version and drops the local entries of the saving process; other processes notice within
+`LOCAL_TIMEOUT` seconds.
+
+Only the `CACHED_FIELDS` which authentication and permissions read are cached, as a plain dict (no
+password hash leaves the database). Each request builds its own user from them, the other fields are
+deferred and loaded from the database if something reads them, and nothing memoized on `request.user`
+leaks into other requests.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from src.common.cache import LocalCache, bump_version, versioned_key
+from src.users.models import User
+
+USER_NAMESPACE = 'auth:user:{}'
+SHARED_TIMEOUT = 60
+LOCAL_TIMEOUT = 5
+LOCAL_SIZE = 10000
+CACHED_FIELDS = ('id', 'email', 'username', 'is_active', 'is_staff', 'is_superuser')
+'''tuple: attribute names of the User fields kept in the caches'''
+
+local_users = LocalCache(max_size=LOCAL_SIZE, timeout=LOCAL_TIMEOUT)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication whose user lookup is served from the local and shared caches"""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = str(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+
+        data = local_users.get((user_id, jti))
+        if data is None:
+            key = versioned_key(USER_NAMESPACE.format(user_id), jti)
+            data = cache.get(key)
+            if data is None:
+                user = super().get_user(validated_token)
+                data = {field: getattr(user, field) for field in CACHED_FIELDS}
+                cache.set(key, data, SHARED_TIMEOUT)
+            local_users.set((user_id, jti), data)
+
+        user = build_user(data)
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        return user
+
+
+def build_user(data):
+    '''Return a User holding the cached fields, with every other field deferred'''
+    fields = [field.attname for field in User._meta.concrete_fields if field.attname in data]
+    return User.from_db(None, fields, [data[field] for field in fields])
+
+
+def forget_user(user_id):
+    user_id = str(user_id)
+    bump_version(USER_NAMESPACE.format(user_id))
+    local_users.delete_matching(lambda key: key[0] == user_id)
+
+
+def forget_user_on_commit(user_id):
+    # forget now, and again once committed in case a concurrent request cached the old row meanwhile
+    forget_user(user_id)
+    transaction.on_commit(lambda: forget_user(user_id))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_saved_user(sender, instance, **kwargs):
+    forget_user_on_commit(instance.pk)
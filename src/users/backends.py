@@ -4,29 +4,33 @@ from django.contrib.auth.backends import ModelBackend
 
 from src.users.models import User
 
+EMAIL_RE = re.compile(r'[^@\s]+@[^@\s]+\.[^@\s]+')
+
 
 class EmailOrUsernameModelBackend(ModelBackend):
-    def authenticate(self, request, **kwargs):
-        username = kwargs['username']
-        password = kwargs['password']
-
-        if username and re.search(r'[^@\s]+@[^@\s]+\.[^@\s]+', username):
-            kwargs = {'email': username}
-        else:
-            kwargs = {'username': username}
-
-        try:
-            user = User.objects.get(**kwargs)
-        except User.DoesNotExist:
+    """Authenticates with an email address or a username, case-insensitively
+
+    This is the only password backend, so a login costs one indexed lookup (on `UPPER(email)` or
+    `UPPER(username)`) and exactly one password hash: an unknown user is hashed against a dummy
+    password, which keeps failed and successful logins at the same cost and does not reveal which
+    accounts exist.
+    """
+
+    def get_login_user(self, login):
+        field = 'email' if EMAIL_RE.search(login) else 'username'
+        users = list(User.objects.filter(**{f'{field}__iexact': login})[:2])
+        # prefer the exact spelling if two accounts only differ by case
+        return next((user for user in users if getattr(user, field) == login), users[0] if len(users) == 1 else None)
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        login = username if username is not None else kwargs.get(User.USERNAME_FIELD)
+        if login is None or password is None:
             return None
-        else:
-            if user.is_active and user.check_password(password):
-                return user
-
-        return None
 
-    def get_user(self, user_id):
-        try:
-            return User.objects.get(pk=user_id)
-        except User.DoesNotExist:
+        user = self.get_login_user(login)
+        if user is None:
+            User().set_password(password)
             return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,46 @@
+import time
+import uuid
+
+from django.contrib.auth import authenticate
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from src.users.models import User
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Measure the login throughput of the authentication backends for valid, wrong-password and unknown-user logins'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=50, help='logins timed per case')
+
+    def time_logins(self, logins, **credentials):
+        started = time.monotonic()
+        for _ in range(logins):
+            authenticate(None, **credentials)
+        return time.monotonic() - started
+
+    def handle(self, logins, **options):
+        logins = max(logins, 1)
+        password = uuid.uuid4().hex
+        # the benchmark user only exists inside this transaction
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    username=f'benchmark-{password[:8]}', email=f'benchmark-{password[:8]}@example.com', password=password
+                )
+                cases = {
+                    'valid login': {'email': user.email.upper(), 'password': password},
+                    'wrong password': {'email': user.email, 'password': 'wrong'},
+                    'unknown user': {'email': f'unknown-{password[:8]}@example.com', 'password': password},
+                }
+                for case, credentials in cases.items():
+                    elapsed = self.time_logins(logins, **credentials)
+                    self.stdout.write(f'{case:>15}: {logins / elapsed:8.1f} logins/s, {elapsed / logins * 1000:7.2f} ms/login')
+                raise Rollback
+        except Rollback:
+            pass
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.12 on 2026-10-18 13:24
+
+from django.db import migrations, models
+
+
+def check_unique_emails(apps, schema_editor):
+    """Refuse to migrate while emails are shared, accounts cannot be merged without knowing which one to keep"""
+    User = apps.get_model('users', 'User')
+    duplicates = list(
+        User.objects.values_list('email', flat=True).annotate(count=models.Count('id')).filter(count__gt=1).order_by('email')
+    )
+    if duplicates:
+        raise RuntimeError(
+            f'{len(duplicates)} emails belong to more than one user, give each account its own email before '
+            f'migrating: {", ".join(duplicates[:20])}'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_login_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_unique_emails, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='user',
+            name='email',
+            field=models.EmailField(max_length=255, unique=True, verbose_name='Email address'),
+        ),
+    ]
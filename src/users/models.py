@@ -2,15 +2,15 @@ import uuid
 
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Upper
 from django.dispatch import receiver
 from django.urls import reverse
 from django_rest_passwordreset.signals import reset_password_token_created
 from easy_thumbnails.fields import ThumbnailerImageField
-from easy_thumbnails.signal_handlers import generate_aliases_global
-from easy_thumbnails.signals import saved_file
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from src.common.helpers import build_absolute_uri
+from src.common.roles import add_role_claims
 from src.notifications.services import ACTIVITY_USER_RESETS_PASS, notify
 
 
@@ -41,8 +41,16 @@ class User(AbstractUser):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
 
+    class Meta(AbstractUser.Meta):
+        swappable = 'AUTH_USER_MODEL'
+        # serve the case-insensitive login lookups of EmailOrUsernameModelBackend
+        indexes = [
+            models.Index(Upper('email'), name='user_email_upper_idx'),
+            models.Index(Upper('username'), name='user_username_upper_idx'),
+        ]
+
     def get_tokens(self):
-        refresh = RefreshToken.for_user(self)
+        refresh = add_role_claims(RefreshToken.for_user(self), self)
 
         return {
             'refresh': str(refresh),
@@ -53,9 +61,6 @@ class User(AbstractUser):
         return self.username
 
 
-saved_file.connect(generate_aliases_global)
-
-
 class TimeStampAbstractModel(models.Model):
     """Inherit from this class to add timestamp fields in the model class"""
 
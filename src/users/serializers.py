@@ -1,5 +1,8 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from src.common.roles import add_role_claims
+from src.common.serializers import ThumbnailerJSONSerializer
 from src.users.models import Address, User
 
 
@@ -10,6 +13,8 @@ class UsernameSerializer(serializers.ModelSerializer):
 
 
 class UserSerializer(serializers.ModelSerializer):
+    profile_picture_sizes = ThumbnailerJSONSerializer('users', source='profile_picture', read_only=True)
+
     class Meta:
         model = User
         fields = (
@@ -19,6 +24,7 @@ class UserSerializer(serializers.ModelSerializer):
             'first_name',
             'last_name',
             'profile_picture',
+            'profile_picture_sizes',
         )
         read_only_fields = ('username',)
 
@@ -61,3 +67,12 @@ class Address_Serializer(serializers.ModelSerializer):
     class Meta:
         model = Address
         fields = ['country', 'city', 'street']
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Issues token pairs carrying the roles of the user, so permission checks can read them from the
+    access token, see src.common.roles."""
+
+    @classmethod
+    def get_token(cls, user):
+        return add_role_claims(super().get_token(user), user)
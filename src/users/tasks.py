@@ -0,0 +1,8 @@
+from celery import task
+
+from src.users import thumbnails
+
+
+@task(name='GenerateProfilePictureAliasesTask')
+def generate_profile_picture_aliases_task(user_id, name):
+    thumbnails.generate_aliases(user_id, name)
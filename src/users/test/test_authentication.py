@@ -0,0 +1,48 @@
+from django.core.cache import cache
+from nose.tools import eq_
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from src.common.cache import versioned_key
+from src.job.test.factories import JobFactory
+from src.users.authentication import CACHED_FIELDS, USER_NAMESPACE, local_users
+from src.users.test.factories import UserFactory
+
+
+class TestCachedJWTAuthenticationTestCase(APITestCase):
+    """
+    Tests that JWT requests resolve their user from the cache.
+    """
+
+    def setUp(self):
+        cache.clear()
+        local_users.clear()
+        self.url = f'/job/job-age/{JobFactory().pk}'
+        self.user = UserFactory()
+        self.access = self.user.get_tokens()['access']
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+
+    def test_user_is_loaded_once(self):
+        # user, job
+        with self.assertNumQueries(2):
+            eq_(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+        local_users.clear()
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        eq_(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_only_the_needed_fields_are_cached(self):
+        self.client.get(self.url)
+        data = cache.get(versioned_key(USER_NAMESPACE.format(self.user.pk), AccessToken(self.access)['jti']))
+        eq_(set(data), set(CACHED_FIELDS))
+        response = self.client.get('/api/v1/users/me/')
+        eq_((response.status_code, response.data['email']), (status.HTTP_200_OK, self.user.email))
@@ -0,0 +1,50 @@
+from unittest import mock
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import get_hasher
+from nose.tools import eq_, ok_
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from src.users.test.factories import UserFactory
+
+
+class TestEmailOrUsernameModelBackendTestCase(APITestCase):
+    """
+    Tests the case-insensitive email or username login.
+    """
+
+    def setUp(self):
+        self.user = UserFactory(email='Jane.Doe@Example.com', username='JaneDoe')
+
+    def test_login_with_email_or_username(self):
+        for login in ('jane.doe@example.com', 'JANE.DOE@EXAMPLE.COM', 'janedoe', 'JaneDoe'):
+            eq_(str(authenticate(None, email=login, password='asdf').pk), self.user.id)
+        eq_(str(authenticate(None, username='janedoe', password='asdf').pk), self.user.id)
+
+    def test_failed_login_hashes_once(self):
+        hasher = type(get_hasher())
+        for login, password in (('jane.doe@example.com', 'wrong'), ('nobody@example.com', 'asdf')):
+            with mock.patch.object(hasher, 'encode', autospec=True, side_effect=hasher.encode) as encode:
+                with self.assertNumQueries(1):
+                    ok_(authenticate(None, email=login, password=password) is None)
+            eq_(encode.call_count, 1)
+
+    def test_inactive_user_cannot_login(self):
+        self.user.is_active = False
+        self.user.save()
+        ok_(authenticate(None, email='jane.doe@example.com', password='asdf') is None)
+
+    def test_exact_case_wins(self):
+        other = UserFactory(email='jane.doe@example.com', username='janedoe')
+        eq_(str(authenticate(None, email='jane.doe@example.com', password='asdf').pk), other.id)
+        eq_(str(authenticate(None, email='Jane.Doe@Example.com', password='asdf').pk), self.user.id)
+        ok_(authenticate(None, email='JANE.DOE@EXAMPLE.COM', password='asdf') is None)
+
+    def test_token_endpoint(self):
+        response = self.client.post('/api/v1/token/', {'email': 'JANE.DOE@example.com', 'password': 'asdf'})
+        eq_(response.status_code, status.HTTP_200_OK)
+        eq_(AccessToken(response.data['access'])['roles'], [])
+        response = self.client.post('/api/v1/token/', {'email': 'jane.doe@example.com', 'password': 'wrong'})
+        eq_(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,74 @@
+import io
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from nose.tools import eq_, ok_
+from PIL import Image
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from src.users import thumbnails
+from src.users.serializers import UserSerializer
+from src.users.test.factories import UserFactory
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def image_file():
+    content = io.BytesIO()
+    Image.new('RGB', (600, 600), 'red').save(content, 'PNG')
+    return ContentFile(content.getvalue())
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, THUMBNAIL_MEDIA_ROOT=MEDIA_ROOT)
+class TestProfilePictureThumbnailsTestCase(APITestCase):
+    """
+    Tests that profile picture thumbnails are left to the worker.
+    """
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.user = UserFactory()
+
+    def sizes(self):
+        request = APIRequestFactory().get('/')
+        return UserSerializer(self.user, context={'request': request}).data['profile_picture_sizes']
+
+    def upload(self):
+        picture = SimpleUploadedFile('picture.png', image_file().read(), content_type='image/png')
+        serializer = UserSerializer(self.user, data={'profile_picture': picture}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+    @mock.patch('src.users.tasks.generate_profile_picture_aliases_task.delay')
+    def test_upload_schedules_the_aliases_after_commit(self, delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.upload()
+            delay.assert_not_called()
+        delay.assert_called_once_with(str(self.user.pk), self.user.profile_picture.name)
+
+    @mock.patch('src.users.tasks.generate_profile_picture_aliases_task.delay')
+    def test_original_is_served_until_aliases_are_rendered(self, delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.upload()
+        delay.assert_called_once_with(str(self.user.pk), self.user.profile_picture.name)
+
+        sizes = self.sizes()
+        eq_(set(sizes), {'original', 'thumbnail', 'medium_square_crop', 'small_square_crop'})
+        ok_(all(url == sizes['original'] for url in sizes.values()))
+
+    def test_replaced_pictures_are_skipped(self):
+        self.user.profile_picture.save('picture.png', image_file())
+        name = self.user.profile_picture.name
+        self.user.profile_picture.save('other.png', image_file())
+        ok_(not thumbnails.generate_aliases(self.user.pk, name))
+
+    def test_users_without_a_picture(self):
+        eq_(self.sizes(), None)
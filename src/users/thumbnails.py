@@ -0,0 +1,32 @@
+"""Thumbnail aliases of profile pictures, rendered by a Celery worker instead of the upload request.
+
+Uploading a profile picture only writes the original. Once the user row is committed,
+`GenerateProfilePictureAliasesTask` renders every alias of `THUMBNAIL_ALIASES['users']` (and stores them,
+on S3 in production) in the worker's process pool. Until an alias exists, `ThumbnailerJSONSerializer`
+serves the original picture in its place.
+"""
+from django.db import transaction
+from django.dispatch import receiver
+from easy_thumbnails.files import generate_all_aliases
+from easy_thumbnails.signals import saved_file
+
+from src.users.models import User
+
+
+def generate_aliases(user_id, name):
+    """Render the aliases of a user's profile picture, unless the picture was replaced since `name`"""
+    user = User.objects.filter(pk=user_id).first()
+    if user is None or not user.profile_picture or user.profile_picture.name != name:
+        return False
+    generate_all_aliases(user.profile_picture, include_global=True)
+    return True
+
+
+@receiver(saved_file, sender=User)
+def schedule_profile_picture_aliases(sender, fieldfile, **kwargs):
+    # sent from post_save for the file fields which were written by that save
+    if fieldfile.field.name == 'profile_picture':
+        from src.users.tasks import generate_profile_picture_aliases_task
+
+        user_id, name = str(fieldfile.instance.pk), fieldfile.name
+        transaction.on_commit(lambda: generate_profile_picture_aliases_task.delay(user_id, name))